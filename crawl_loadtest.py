@@ -0,0 +1,242 @@
+# coding=utf-8
+"""
+爬取压测脚本
+
+在本地启动 newsnow 模拟服务（trendradar.stub_server），分别用 main.py 的
+DataFetcher.crawl_websites 和 MCP Server 的 trigger_crawl 对其爬取，
+按不同并发线程数报告吞吐量和尾延迟，用于在无网络环境下评估爬取并发相关的改动。
+
+所有状态（配置、熔断、遥测）写入临时目录，不影响项目的 output 目录。
+
+示例：
+    python crawl_loadtest.py --latency 200 --jitter 300 --error-rate 0.05 --workers 1,4,8
+    python crawl_loadtest.py --platforms 40 --runs 5 --mode fetcher
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from trendradar.stub_server import add_server_arguments, server_from_args
+
+PROJECT_ROOT = Path(__file__).parent
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """最近秩百分位数"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def build_config(
+    base_config: Dict, api_url: str, platforms: List[Dict], workers: int, args: argparse.Namespace
+) -> Dict:
+    """基于项目配置生成压测配置：指向模拟服务，关闭熔断、缓存和请求合并，避免干扰测量"""
+    config = json.loads(json.dumps(base_config))
+    crawler = config.setdefault("crawler", {})
+    crawler.update({
+        "api_url": api_url,
+        "request_interval": args.request_interval,
+        "concurrent_crawl": workers > 1,
+        "max_workers": workers,
+        "host_max_concurrency": args.host_concurrency or workers,
+        "host_min_interval": args.host_min_interval,
+        "crawl_deadline": args.deadline,
+        "reuse_unchanged": False,
+        "coalesce_window": 0,
+        "use_proxy": False,
+        "telemetry": {"enabled": True, "prometheus_textfile": ""},
+        "circuit_breaker": {"enabled": False},
+    })
+    config["platforms"] = platforms
+    return config
+
+
+def run_fetcher(config: Dict, project_dir: Path, runs: int) -> Dict:
+    """用 DataFetcher.crawl_websites 爬取"""
+    from main import DataFetcher
+
+    crawler = config["crawler"]
+    ids = [(p["id"], p["name"]) for p in config["platforms"]]
+    fetcher = DataFetcher(
+        None,
+        max_workers=crawler["max_workers"] if crawler["concurrent_crawl"] else 1,
+        host_max_concurrency=crawler["host_max_concurrency"],
+        host_min_interval=crawler["host_min_interval"],
+        request_interval=crawler["request_interval"],
+        api_url=crawler["api_url"],
+        crawl_deadline=crawler["crawl_deadline"],
+    )
+    durations = []
+    platform_metrics = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fetcher.crawl_websites(ids, crawler["request_interval"])
+        durations.append(time.perf_counter() - start)
+        platform_metrics.extend(fetcher.platform_metrics.values())
+    return {"durations": durations, "platforms": platform_metrics}
+
+
+def run_mcp(config: Dict, project_dir: Path, runs: int) -> Dict:
+    """用 MCP Server 的后台爬取任务（trigger_crawl）爬取并等待结束，平台指标从遥测文件读取"""
+    from mcp_server.tools.system import SystemManagementTools
+
+    tools = SystemManagementTools(str(project_dir))
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = tools.start_crawl_task()
+        if not result.get("success"):
+            raise RuntimeError(f"trigger_crawl 失败: {result.get('error')}")
+        task = tools.task_service.get(result["task_id"])
+        while not task.is_finished:
+            time.sleep(0.01)
+        durations.append(time.perf_counter() - start)
+        if task.status != "completed":
+            raise RuntimeError(f"爬取任务 {task.task_id} 未完成: {task.error or task.status}")
+
+    platform_metrics = []
+    for file_path in (project_dir / "output" / ".telemetry").glob("*.jsonl"):
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["type"] == "platform":
+                    platform_metrics.append(record)
+    return {"durations": durations, "platforms": platform_metrics}
+
+
+def summarize(mode: str, workers: int, outcome: Dict, upstream_requests: int) -> Dict:
+    durations = outcome["durations"]
+    platforms = outcome["platforms"]
+    total_time = sum(durations)
+    succeeded = [p for p in platforms if p["status"] in ("fresh", "cache")]
+    latencies = [p["total_ms"] for p in platforms if p["total_ms"] is not None]
+    return {
+        "mode": mode,
+        "workers": workers,
+        "runs": len(durations),
+        "avg_run_s": total_time / len(durations),
+        "platforms_per_s": len(platforms) / total_time if total_time else 0,
+        "requests_per_s": upstream_requests / total_time if total_time else 0,
+        "success_rate": len(succeeded) / len(platforms) if platforms else 0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies) if latencies else None,
+    }
+
+
+def print_report(rows: List[Dict]) -> None:
+    print("模式 | 线程 | 轮次 | 平均耗时(s) | 平台/秒 | 请求/秒 | 成功率 | P50(ms) | P95(ms) | P99(ms) | 最大(ms)")
+
+    def fmt(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.1f}"
+
+    for row in rows:
+        print(" | ".join([
+            row["mode"],
+            str(row["workers"]),
+            str(row["runs"]),
+            f"{row['avg_run_s']:.2f}",
+            f"{row['platforms_per_s']:.1f}",
+            f"{row['requests_per_s']:.1f}",
+            f"{row['success_rate']:.1%}",
+            fmt(row["p50_ms"]),
+            fmt(row["p95_ms"]),
+            fmt(row["p99_ms"]),
+            fmt(row["max_ms"]),
+        ]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TrendRadar 爬取压测（使用本地 newsnow 模拟服务）")
+    parser.add_argument("--mode", default="fetcher,mcp", help="压测对象：fetcher（main.py）、mcp（trigger_crawl），逗号分隔")
+    parser.add_argument("--workers", default="1,4,8", help="并发线程数列表，逗号分隔，1 为串行")
+    parser.add_argument("--runs", type=int, default=3, help="每种组合的爬取轮数")
+    parser.add_argument("--platforms", type=int, default=0, help="模拟平台数，0 表示使用 config.yaml 中的平台")
+    parser.add_argument("--request-interval", type=int, default=0, help="串行模式的请求间隔(毫秒)")
+    parser.add_argument("--host-concurrency", type=int, default=0, help="同一主机并发上限，0 表示与线程数相同")
+    parser.add_argument("--host-min-interval", type=int, default=0, help="同一主机请求最小间隔(毫秒)")
+    parser.add_argument("--deadline", type=float, default=0, help="整体爬取截止时间(秒)，0 表示不限制")
+    parser.add_argument("--api-url", default="", help="使用已启动的模拟服务或其他接口，而不是在本进程内启动")
+    parser.add_argument("--verbose", action="store_true", help="显示爬取过程日志")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.mode.split(",") if m.strip()]
+    unknown = set(modes) - {"fetcher", "mcp"}
+    if unknown:
+        parser.error(f"未知的压测对象: {', '.join(sorted(unknown))}")
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+
+    with open(PROJECT_ROOT / "config" / "config.yaml", "r", encoding="utf-8") as f:
+        base_config = yaml.safe_load(f)
+    if args.platforms > 0:
+        platforms = [
+            {"id": f"stub-{index:02d}", "name": f"模拟平台{index:02d}"}
+            for index in range(1, args.platforms + 1)
+        ]
+    else:
+        platforms = [
+            {"id": p["id"], "name": p.get("name", p["id"])}
+            for p in base_config.get("platforms", [])
+        ]
+
+    work_dir = Path(tempfile.mkdtemp(prefix="trendradar-loadtest-"))
+    server = None
+    if not args.api_url:
+        server = server_from_args(args).start()
+    api_url = args.api_url or server.api_url
+
+    # main.py 在导入时读取配置，需要在导入前指向压测配置
+    os.environ["CONFIG_PATH"] = str(work_dir / "config" / "config.yaml")
+    os.environ.pop("CRAWLER_API_URL", None)
+    (work_dir / "config").mkdir(parents=True)
+    shutil.copy(PROJECT_ROOT / "config" / "frequency_words.txt", work_dir / "config")
+
+    print(f"模拟服务: {api_url}，平台数: {len(platforms)}，工作目录: {work_dir}")
+    rows = []
+    try:
+        for workers in worker_counts:
+            config = build_config(base_config, api_url, platforms, workers, args)
+            with open(work_dir / "config" / "config.yaml", "w", encoding="utf-8") as f:
+                yaml.safe_dump(config, f, allow_unicode=True)
+
+            for mode in modes:
+                shutil.rmtree(work_dir / "output", ignore_errors=True)
+                requests_before = server.stats["requests"] if server else 0
+                runner = run_fetcher if mode == "fetcher" else run_mcp
+                log = io.StringIO()
+                with contextlib.redirect_stdout(sys.stdout if args.verbose else log):
+                    outcome = runner(config, work_dir, args.runs)
+                upstream_requests = (
+                    server.stats["requests"] - requests_before
+                    if server
+                    else sum(p["retries"] + 1 for p in outcome["platforms"])
+                )
+                rows.append(summarize(mode, workers, outcome, upstream_requests))
+                print(f"完成: {mode} 线程数 {workers}")
+    finally:
+        if server is not None:
+            server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print()
+    print_report(rows)
+
+
+if __name__ == "__main__":
+    main()
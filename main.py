@@ -2,8 +2,6 @@
 
 import json
 import os
-import random
-import re
 import time
 import webbrowser
 import smtplib
@@ -11,7 +9,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
 from email.utils import formataddr, formatdate, make_msgid
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
 
@@ -19,6 +17,30 @@ import pytz
 import requests
 import yaml
 
+from trendradar.archive import ResponseArchive
+from trendradar.binary_snapshot import BinarySnapshotStore
+from trendradar.circuit_breaker import CircuitBreaker
+from trendradar.crawler import (
+    DEFAULT_API_URL,
+    DEFAULT_REQUEST_INTERVAL,
+    CrawlEngine,
+    CrawlFingerprintCache,
+)
+from trendradar.day_archive import compact_cold_days
+from trendradar.day_manifest import DayManifest
+from trendradar.daylog import DayLogStore
+from trendradar.http_client import configure_http_client, get_http_client
+from trendradar.month_pack import pack_cold_months
+from trendradar.proxy_pool import ProxyPool
+from trendradar.rollup import DailyRollup, results_from_title_info
+from trendradar.scheduler import AdaptivePollingScheduler
+from trendradar.seen_titles import SeenTitleIndex, parse_horizon
+from trendradar.snapshot import parse_titles, write_titles_file
+from trendradar.snapshot_delta import SnapshotDeltas, diff_snapshot, replay_deltas
+from trendradar.sqlite_store import SQLiteNewsStore
+from trendradar.telemetry import CrawlTelemetry
+from trendradar.utils import clean_title, ensure_directory_exists, get_beijing_time
+
 
 VERSION = "3.0.5"
 
@@ -68,12 +90,83 @@ def load_config():
     config = {
         "VERSION_CHECK_URL": config_data["app"]["version_check_url"],
         "SHOW_VERSION_UPDATE": config_data["app"]["show_version_update"],
-        "REQUEST_INTERVAL": config_data["crawler"]["request_interval"],
+        "REQUEST_INTERVAL": config_data["crawler"].get(
+            "request_interval", DEFAULT_REQUEST_INTERVAL
+        ),
+        "API_URL": os.environ.get("CRAWLER_API_URL", "").strip()
+        or config_data["crawler"].get("api_url", "")
+        or DEFAULT_API_URL,
+        "CONCURRENT_CRAWL": config_data["crawler"].get("concurrent_crawl", False),
+        "MAX_WORKERS": config_data["crawler"].get("max_workers", 4),
+        "HOST_MAX_CONCURRENCY": config_data["crawler"].get("host_max_concurrency", 4),
+        "HOST_MIN_INTERVAL": config_data["crawler"].get("host_min_interval", 100),
+        "HTTP_POOL_CONNECTIONS": config_data["crawler"].get("http_pool_connections", 10),
+        "HTTP_POOL_MAXSIZE": config_data["crawler"].get("http_pool_maxsize", 10),
+        "ENABLE_HTTP2": config_data["crawler"].get("enable_http2", False),
+        "HTTP_HOST_POOL_MAXSIZE": config_data["crawler"].get("http_host_pool_maxsize") or {},
+        "REUSE_UNCHANGED": config_data["crawler"].get("reuse_unchanged", True),
+        "CRAWL_DEADLINE": config_data["crawler"].get("crawl_deadline", 0),
+        "CIRCUIT_BREAKER": {
+            "ENABLED": config_data["crawler"]
+            .get("circuit_breaker", {})
+            .get("enabled", False),
+            "FAILURE_THRESHOLD": config_data["crawler"]
+            .get("circuit_breaker", {})
+            .get("failure_threshold", 3),
+            "COOLDOWN": config_data["crawler"]
+            .get("circuit_breaker", {})
+            .get("cooldown", 1800),
+        },
+        "ARCHIVE_RAW_RESPONSES": config_data["crawler"].get(
+            "archive_raw_responses", False
+        ),
+        "REPLAY_RUN": os.environ.get("REPLAY_RUN", "").strip()
+        or config_data["crawler"].get("replay_run", "")
+        or "",
+        "TELEMETRY": {
+            "ENABLED": config_data["crawler"].get("telemetry", {}).get("enabled", False),
+            "PROMETHEUS_TEXTFILE": config_data["crawler"]
+            .get("telemetry", {})
+            .get("prometheus_textfile", ""),
+            "RETENTION_MONTHS": config_data["crawler"]
+            .get("telemetry", {})
+            .get("retention_months", 3),
+        },
+        "ADAPTIVE_POLLING": {
+            "ENABLED": config_data["crawler"]
+            .get("adaptive_polling", {})
+            .get("enabled", False),
+            "MIN_INTERVAL": config_data["crawler"]
+            .get("adaptive_polling", {})
+            .get("min_interval", 0),
+            "MAX_INTERVAL": config_data["crawler"]
+            .get("adaptive_polling", {})
+            .get("max_interval", 120),
+            "TARGET_CHURN": config_data["crawler"]
+            .get("adaptive_polling", {})
+            .get("target_churn", 0.2),
+        },
+        "SKIP_UNCHANGED_RUN": os.environ.get("SKIP_UNCHANGED_RUN", "").strip().lower()
+        in ("true", "1")
+        if os.environ.get("SKIP_UNCHANGED_RUN", "").strip()
+        else config_data["crawler"].get("skip_unchanged_run", False),
         "REPORT_MODE": os.environ.get("REPORT_MODE", "").strip()
         or config_data["report"]["mode"],
         "RANK_THRESHOLD": config_data["report"]["rank_threshold"],
+        "NEW_TITLE_HORIZON": os.environ.get("NEW_TITLE_HORIZON", "").strip()
+        or str(config_data["report"].get("new_title_horizon", "today")),
         "USE_PROXY": config_data["crawler"]["use_proxy"],
         "DEFAULT_PROXY": config_data["crawler"]["default_proxy"],
+        "PROXY_POOL": {
+            "PROXIES": config_data["crawler"].get("proxy_pool", {}).get("proxies")
+            or [],
+            "MAX_ERROR_RATE": config_data["crawler"]
+            .get("proxy_pool", {})
+            .get("max_error_rate", 0.5),
+            "EVICTION_COOLDOWN": config_data["crawler"]
+            .get("proxy_pool", {})
+            .get("eviction_cooldown", 300),
+        },
         "ENABLE_CRAWLER": os.environ.get("ENABLE_CRAWLER", "").strip().lower()
         in ("true", "1")
         if os.environ.get("ENABLE_CRAWLER", "").strip()
@@ -129,8 +222,28 @@ def load_config():
             "HOTNESS_WEIGHT": config_data["weight"]["hotness_weight"],
         },
         "PLATFORMS": config_data["platforms"],
+        "STORAGE": {
+            "BACKEND": os.environ.get("STORAGE_BACKEND", "").strip()
+            or config_data.get("storage", {}).get("backend", "txt"),
+            "SQLITE_PATH": config_data.get("storage", {}).get(
+                "sqlite_path", "output/news.db"
+            ),
+            "EXPORT_TXT": config_data.get("storage", {}).get("export_txt", True),
+            "COMPRESS_AFTER_DAYS": config_data.get("storage", {}).get(
+                "compress_after_days", 0
+            ),
+            "COMPRESSION": config_data.get("storage", {}).get("compression", "gzip"),
+            "PACK_MONTHLY": config_data.get("storage", {}).get("pack_monthly", False),
+        },
     }
 
+    # 新增标题时间范围无效时提示并按 today 处理
+    try:
+        parse_horizon(config["NEW_TITLE_HORIZON"])
+    except ValueError as e:
+        print(f"⚠️ report.new_title_horizon 配置错误：{e}，已按 today 处理")
+        config["NEW_TITLE_HORIZON"] = "today"
+
     # 通知渠道配置（环境变量优先）
     notification = config_data.get("notification", {})
     webhooks = notification.get("webhooks", {})
@@ -217,13 +330,77 @@ CONFIG = load_config()
 print(f"TrendRadar v{VERSION} 配置加载完成")
 print(f"监控平台数量: {len(CONFIG['PLATFORMS'])}")
 
+configure_http_client(
+    pool_connections=CONFIG["HTTP_POOL_CONNECTIONS"],
+    pool_maxsize=CONFIG["HTTP_POOL_MAXSIZE"],
+    enable_http2=CONFIG["ENABLE_HTTP2"],
+    host_pool_maxsize=CONFIG["HTTP_HOST_POOL_MAXSIZE"],
+)
 
-# === 工具函数 ===
-def get_beijing_time():
-    """获取北京时间"""
-    return datetime.now(pytz.timezone("Asia/Shanghai"))
+# 输出目录，离线回放时通过 isolate_output 重定向到独立目录
+OUTPUT_DIR = Path("output")
+# 当日汇总同时写入的根目录 index.html（GitHub Pages 使用）
+INDEX_FILE = Path("index.html")
+
+
+def create_news_store(
+    output_dir: Path, sqlite_path: str
+) -> Optional[Union[SQLiteNewsStore, DayLogStore, BinarySnapshotStore]]:
+    """按 storage.backend 创建快照存储，txt 后端返回 None"""
+    if CONFIG["STORAGE"]["BACKEND"] == "sqlite":
+        return SQLiteNewsStore(sqlite_path)
+    if CONFIG["STORAGE"]["BACKEND"] == "log":
+        return DayLogStore(output_dir)
+    if CONFIG["STORAGE"]["BACKEND"] == "binary":
+        return BinarySnapshotStore(output_dir)
+    return None
+
+
+# storage.backend 为 sqlite / log / binary 时快照写入对应存储，读取优先使用该存储
+NEWS_STORE = create_news_store(OUTPUT_DIR, CONFIG["STORAGE"]["SQLITE_PATH"])
+
+# 每日 txt 快照清单，保存快照时更新，列出快照时不再扫描目录
+DAY_MANIFEST = DayManifest()
 
+# 当日汇总增量维护，每次运行只合并新增的快照
+DAILY_ROLLUP = DailyRollup()
 
+# 已出现标题索引，新增标题检测按 report.new_title_horizon 的时间范围判断，首次使用时创建
+SEEN_TITLES: Optional[SeenTitleIndex] = None
+
+# 快照增量记录，每保存一个快照计算一次新增、消失和排名变化的标题
+SNAPSHOT_DELTAS = SnapshotDeltas()
+
+
+def isolate_output(output_dir: Path) -> None:
+    """
+    将快照、报告和各类状态文件重定向到独立目录（离线回放使用）
+
+    回放结果不写入正式的 output 目录和根目录 index.html，也不读取正式数据，
+    当日汇总、新增标题检测都只基于该目录中的回放快照
+    """
+    global OUTPUT_DIR, INDEX_FILE, NEWS_STORE, DAY_MANIFEST, DAILY_ROLLUP
+    global SEEN_TITLES, SNAPSHOT_DELTAS
+    OUTPUT_DIR = Path(output_dir)
+    INDEX_FILE = OUTPUT_DIR / "index.html"
+    NEWS_STORE = create_news_store(OUTPUT_DIR, str(OUTPUT_DIR / "news.db"))
+    DAY_MANIFEST = DayManifest(OUTPUT_DIR)
+    DAILY_ROLLUP = DailyRollup(OUTPUT_DIR)
+    SEEN_TITLES = None
+    SNAPSHOT_DELTAS = SnapshotDeltas(OUTPUT_DIR)
+
+
+def get_seen_titles() -> SeenTitleIndex:
+    """获取已出现标题索引，首次调用时读取 output/.crawl_cache/seen_titles.json"""
+    global SEEN_TITLES
+    if SEEN_TITLES is None:
+        SEEN_TITLES = SeenTitleIndex(
+            horizon=CONFIG["NEW_TITLE_HORIZON"], state_dir=OUTPUT_DIR / ".crawl_cache"
+        )
+    return SEEN_TITLES
+
+
+# === 工具函数 ===
 def format_date_folder():
     """格式化日期文件夹"""
     return get_beijing_time().strftime("%Y年%m月%d日")
@@ -234,25 +411,10 @@ def format_time_filename():
     return get_beijing_time().strftime("%H时%M分")
 
 
-def clean_title(title: str) -> str:
-    """清理标题中的特殊字符"""
-    if not isinstance(title, str):
-        title = str(title)
-    cleaned_title = title.replace("\n", " ").replace("\r", " ")
-    cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-    cleaned_title = cleaned_title.strip()
-    return cleaned_title
-
-
-def ensure_directory_exists(directory: str):
-    """确保目录存在"""
-    Path(directory).mkdir(parents=True, exist_ok=True)
-
-
 def get_output_path(subfolder: str, filename: str) -> str:
     """获取输出路径"""
     date_folder = format_date_folder()
-    output_dir = Path("output") / date_folder / subfolder
+    output_dir = OUTPUT_DIR / date_folder / subfolder
     ensure_directory_exists(str(output_dir))
     return str(output_dir / filename)
 
@@ -262,18 +424,14 @@ def check_version_update(
 ) -> Tuple[bool, Optional[str]]:
     """检查版本更新"""
     try:
-        proxies = None
-        if proxy_url:
-            proxies = {"http": proxy_url, "https": proxy_url}
-
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             "Accept": "text/plain, */*",
             "Cache-Control": "no-cache",
         }
 
-        response = requests.get(
-            version_url, proxies=proxies, headers=headers, timeout=10
+        response = get_http_client().get(
+            version_url, proxy_url=proxy_url, headers=headers, timeout=10
         )
         response.raise_for_status()
 
@@ -304,13 +462,7 @@ def check_version_update(
 def is_first_crawl_today() -> bool:
     """检测是否是当天第一次爬取"""
     date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
-
-    if not txt_dir.exists():
-        return True
-
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    return len(files) <= 1
+    return len(list_today_snapshots(date_folder)) <= 1
 
 
 def html_escape(text: str) -> str:
@@ -332,7 +484,7 @@ class PushRecordManager:
     """推送记录管理器"""
 
     def __init__(self):
-        self.record_dir = Path("output") / ".push_records"
+        self.record_dir = OUTPUT_DIR / ".push_records"
         self.ensure_record_dir()
         self.cleanup_old_records()
 
@@ -431,176 +583,103 @@ class PushRecordManager:
 
 
 # === 数据获取 ===
-class DataFetcher:
+class DataFetcher(CrawlEngine):
     """数据获取器"""
 
-    def __init__(self, proxy_url: Optional[str] = None):
-        self.proxy_url = proxy_url
-
-    def fetch_data(
-        self,
-        id_info: Union[str, Tuple[str, str]],
-        max_retries: int = 2,
-        min_retry_wait: int = 3,
-        max_retry_wait: int = 5,
-    ) -> Tuple[Optional[str], str, str]:
-        """获取指定ID数据，支持重试"""
-        if isinstance(id_info, tuple):
-            id_value, alias = id_info
-        else:
-            id_value = id_info
-            alias = id_value
-
-        url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
-
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Connection": "keep-alive",
-            "Cache-Control": "no-cache",
-        }
-
-        retries = 0
-        while retries <= max_retries:
-            try:
-                response = requests.get(
-                    url, proxies=proxies, headers=headers, timeout=10
-                )
-                response.raise_for_status()
-
-                data_text = response.text
-                data_json = json.loads(data_text)
-
-                status = data_json.get("status", "未知")
-                if status not in ["success", "cache"]:
-                    raise ValueError(f"响应状态异常: {status}")
-
-                status_info = "最新数据" if status == "success" else "缓存数据"
-                print(f"获取 {id_value} 成功（{status_info}）")
-                return data_text, id_value, alias
-
-            except Exception as e:
-                retries += 1
-                if retries <= max_retries:
-                    base_wait = random.uniform(min_retry_wait, max_retry_wait)
-                    additional_wait = (retries - 1) * random.uniform(1, 2)
-                    wait_time = base_wait + additional_wait
-                    print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"请求 {id_value} 失败: {e}")
-                    return None, id_value, alias
-        return None, id_value, alias
-
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
         request_interval: int = CONFIG["REQUEST_INTERVAL"],
     ) -> Tuple[Dict, Dict, List]:
         """爬取多个网站数据"""
-        results = {}
-        id_to_name = {}
-        failed_ids = []
-
-        for i, id_info in enumerate(ids_list):
-            if isinstance(id_info, tuple):
-                id_value, name = id_info
-            else:
-                id_value = id_info
-                name = id_value
-
-            id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
-
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item["title"]
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
-            else:
-                failed_ids.append(id_value)
-
-            if i < len(ids_list) - 1:
-                actual_interval = request_interval + random.randint(-10, 20)
-                actual_interval = max(50, actual_interval)
-                time.sleep(actual_interval / 1000)
-
-        print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
-        return results, id_to_name, failed_ids
+        return self.crawl(ids_list, request_interval)
 
 
 # === 数据处理 ===
-def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-    """保存标题到文件"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        for id_value, title_data in results.items():
-            # id | name 或 id
-            name = id_to_name.get(id_value)
-            if name and name != id_value:
-                f.write(f"{id_value} | {name}\n")
-            else:
-                f.write(f"{id_value}\n")
-
-            # 按排名排序标题
-            sorted_titles = []
-            for title, info in title_data.items():
-                cleaned_title = clean_title(title)
-                if isinstance(info, dict):
-                    ranks = info.get("ranks", [])
-                    url = info.get("url", "")
-                    mobile_url = info.get("mobileUrl", "")
-                else:
-                    ranks = info if isinstance(info, list) else []
-                    url = ""
-                    mobile_url = ""
-
-                rank = ranks[0] if ranks else 1
-                sorted_titles.append((rank, cleaned_title, url, mobile_url))
-
-            sorted_titles.sort(key=lambda x: x[0])
-
-            for rank, cleaned_title, url, mobile_url in sorted_titles:
-                line = f"{rank}. {cleaned_title}"
+def save_titles_to_file(
+    results: Dict,
+    id_to_name: Dict,
+    failed_ids: List,
+    time_info: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    保存标题快照并更新已出现标题索引和快照增量
 
-                if url:
-                    line += f" [URL:{url}]"
-                if mobile_url:
-                    line += f" [MOBILE:{mobile_url}]"
-                f.write(line + "\n")
+    每次爬取只保存一次，后续流程使用返回的快照时间，不再重新生成
 
-            f.write("\n")
+    Returns:
+        (保存位置, 快照时间)
+    """
+    if time_info is None:
+        time_info = format_time_filename()
+    location = _write_snapshot(results, id_to_name, failed_ids, time_info)
+    sync_seen_titles()
+    sync_snapshot_deltas()
+    return location, time_info
 
-        if failed_ids:
-            f.write("==== 以下ID请求失败 ====\n")
-            for id_value in failed_ids:
-                f.write(f"{id_value}\n")
 
-    return file_path
+def _write_snapshot(
+    results: Dict, id_to_name: Dict, failed_ids: List, time_info: str
+) -> str:
+    """写入标题快照，sqlite / log / binary 存储时写入对应存储并按配置导出 txt"""
+    date_folder = format_date_folder()
+    if NEWS_STORE is None:
+        file_path = get_output_path("txt", f"{time_info}.txt")
+        write_titles_file(file_path, results, id_to_name, failed_ids)
+        DAY_MANIFEST.record(date_folder, time_info, results)
+        return file_path
+
+    saved_path = NEWS_STORE.save_snapshot(date_folder, time_info, results, id_to_name, failed_ids)
+    if CONFIG["STORAGE"]["EXPORT_TXT"]:
+        file_path = get_output_path("txt", f"{time_info}.txt")
+        write_titles_file(file_path, results, id_to_name, failed_ids)
+        DAY_MANIFEST.record(date_folder, time_info, results)
+        return file_path
+    if isinstance(NEWS_STORE, SQLiteNewsStore):
+        return f"{NEWS_STORE.db_path}（{date_folder} {time_info}）"
+    if isinstance(NEWS_STORE, BinarySnapshotStore):
+        return str(saved_path)
+    return str(OUTPUT_DIR / date_folder / "snapshots.log") + f"（{time_info}）"
+
+
+def list_today_snapshots(date_folder: Optional[str] = None) -> List[Tuple[str, float]]:
+    """按时间顺序列出当天（或指定日期）的快照 [(time_info, 写入时刻)]"""
+    date_folder = date_folder or format_date_folder()
+    if NEWS_STORE is not None and NEWS_STORE.has_date(date_folder):
+        return NEWS_STORE.list_snapshots(date_folder)
+    return DAY_MANIFEST.list_snapshots(date_folder)
+
+
+def load_today_snapshots(
+    current_platform_ids: Optional[List[str]] = None,
+    times: Optional[List[str]] = None,
+    date_folder: Optional[str] = None,
+) -> List[Tuple[str, Dict, Dict]]:
+    """按时间顺序读取当天（或指定日期）的快照 [(time_info, titles_by_id, id_to_name)]，支持按平台和时间过滤"""
+    date_folder = date_folder or format_date_folder()
+    if NEWS_STORE is not None and NEWS_STORE.has_date(date_folder):
+        return NEWS_STORE.load_day(date_folder, current_platform_ids, times)
+
+    txt_dir = OUTPUT_DIR / date_folder / "txt"
+    snapshots = []
+    for time_info, _ in DAY_MANIFEST.list_snapshots(date_folder):
+        if times is not None and time_info not in times:
+            continue
+        with open(txt_dir / f"{time_info}.txt", "r", encoding="utf-8") as f:
+            titles_by_id, id_to_name, _ = parse_titles(f.read())
+        if current_platform_ids is not None:
+            titles_by_id = {
+                source_id: title_data
+                for source_id, title_data in titles_by_id.items()
+                if source_id in current_platform_ids
+            }
+            id_to_name = {
+                source_id: name
+                for source_id, name in id_to_name.items()
+                if source_id in titles_by_id
+            }
+        snapshots.append((time_info, titles_by_id, id_to_name))
+    return snapshots
 
 
 def load_frequency_words(
@@ -657,116 +736,50 @@ def load_frequency_words(
     return processed_groups, filter_words
 
 
-def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
-    """解析单个txt文件的标题数据，返回(titles_by_id, id_to_name)"""
-    titles_by_id = {}
-    id_to_name = {}
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-        sections = content.split("\n\n")
-
-        for section in sections:
-            if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                continue
-
-            lines = section.strip().split("\n")
-            if len(lines) < 2:
-                continue
-
-            # id | name 或 id
-            header_line = lines[0].strip()
-            if " | " in header_line:
-                parts = header_line.split(" | ", 1)
-                source_id = parts[0].strip()
-                name = parts[1].strip()
-                id_to_name[source_id] = name
-            else:
-                source_id = header_line
-                id_to_name[source_id] = source_id
-
-            titles_by_id[source_id] = {}
-
-            for line in lines[1:]:
-                if line.strip():
-                    try:
-                        title_part = line.strip()
-                        rank = None
-
-                        # 提取排名
-                        if ". " in title_part and title_part.split(". ")[0].isdigit():
-                            rank_str, title_part = title_part.split(". ", 1)
-                            rank = int(rank_str)
-
-                        # 提取 MOBILE URL
-                        mobile_url = ""
-                        if " [MOBILE:" in title_part:
-                            title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                            if mobile_part.endswith("]"):
-                                mobile_url = mobile_part[:-1]
-
-                        # 提取 URL
-                        url = ""
-                        if " [URL:" in title_part:
-                            title_part, url_part = title_part.rsplit(" [URL:", 1)
-                            if url_part.endswith("]"):
-                                url = url_part[:-1]
-
-                        title = clean_title(title_part.strip())
-                        ranks = [rank] if rank is not None else [1]
-
-                        titles_by_id[source_id][title] = {
-                            "ranks": ranks,
-                            "url": url,
-                            "mobileUrl": mobile_url,
-                        }
-
-                    except Exception as e:
-                        print(f"解析标题行出错: {line}, 错误: {e}")
-
-    return titles_by_id, id_to_name
-
-
 def read_all_today_titles(
     current_platform_ids: Optional[List[str]] = None,
 ) -> Tuple[Dict, Dict, Dict]:
-    """读取当天所有标题文件，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
-
-    if not txt_dir.exists():
-        return {}, {}, {}
-
-    all_results = {}
-    final_id_to_name = {}
-    title_info = {}
-
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-
-    for file_path in files:
-        time_info = file_path.stem
-
-        titles_by_id, file_id_to_name = parse_file_titles(file_path)
+    """
+    读取当天所有标题快照，支持按当前监控平台过滤
 
-        if current_platform_ids is not None:
-            filtered_titles_by_id = {}
-            filtered_id_to_name = {}
+    合并结果持久化为当日汇总（output/<日期>/rollup.json），只解析上次运行之后新增的快照
+    """
+    date_folder = format_date_folder()
+    snapshots = list_today_snapshots()
+    rollup, pending_times = DAILY_ROLLUP.load(date_folder, snapshots)
+    all_results = results_from_title_info(rollup["title_info"])
+    final_id_to_name = rollup["id_to_name"]
+    title_info = rollup["title_info"]
+
+    if pending_times:
+        for time_info, titles_by_id, file_id_to_name in load_today_snapshots(
+            times=pending_times
+        ):
+            final_id_to_name.update(file_id_to_name)
 
             for source_id, title_data in titles_by_id.items():
-                if source_id in current_platform_ids:
-                    filtered_titles_by_id[source_id] = title_data
-                    if source_id in file_id_to_name:
-                        filtered_id_to_name[source_id] = file_id_to_name[source_id]
-
-            titles_by_id = filtered_titles_by_id
-            file_id_to_name = filtered_id_to_name
-
-        final_id_to_name.update(file_id_to_name)
+                process_source_data(
+                    source_id, title_data, time_info, all_results, title_info
+                )
+        rollup["snapshots"] = [[time_info, stamp] for time_info, stamp in snapshots]
+        DAILY_ROLLUP.save(date_folder, rollup)
 
-        for source_id, title_data in titles_by_id.items():
-            process_source_data(
-                source_id, title_data, time_info, all_results, title_info
-            )
+    if current_platform_ids is not None:
+        all_results = {
+            source_id: titles
+            for source_id, titles in all_results.items()
+            if source_id in current_platform_ids
+        }
+        title_info = {
+            source_id: titles
+            for source_id, titles in title_info.items()
+            if source_id in current_platform_ids
+        }
+        final_id_to_name = {
+            source_id: name
+            for source_id, name in final_id_to_name.items()
+            if source_id in current_platform_ids
+        }
 
     return all_results, final_id_to_name, title_info
 
@@ -844,63 +857,82 @@ def process_source_data(
                     title_info[source_id][title]["mobileUrl"] = mobile_url
 
 
-def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
-    """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+def sync_seen_titles() -> None:
+    """将时间范围内尚未记录的快照写入已出现标题索引（通常只有刚保存的一个）"""
+    seen_titles = get_seen_titles()
+    latest = None
+    updated = False
+    for date_folder in seen_titles.horizon_dates(format_date_folder()):
+        snapshots = list_today_snapshots(date_folder)
+        pending = {
+            time_info: stamp
+            for time_info, stamp in snapshots
+            if not seen_titles.is_recorded(date_folder, time_info, stamp)
+        }
+        if pending:
+            for time_info, titles_by_id, _ in load_today_snapshots(
+                times=list(pending), date_folder=date_folder
+            ):
+                seen_titles.record(date_folder, time_info, pending[time_info], titles_by_id)
+            updated = True
+        if snapshots:
+            latest = (date_folder, snapshots[-1][0])
 
-    if not txt_dir.exists():
-        return {}
+    if updated:
+        seen_titles.prune(*latest)
+        seen_titles.save()
 
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    if len(files) < 2:
-        return {}
 
-    # 解析最新文件
-    latest_file = files[-1]
-    latest_titles, _ = parse_file_titles(latest_file)
-
-    # 如果指定了当前平台列表，过滤最新文件数据
-    if current_platform_ids is not None:
-        filtered_latest_titles = {}
-        for source_id, title_data in latest_titles.items():
-            if source_id in current_platform_ids:
-                filtered_latest_titles[source_id] = title_data
-        latest_titles = filtered_latest_titles
-
-    # 汇总历史标题（按平台过滤）
-    historical_titles = {}
-    for file_path in files[:-1]:
-        historical_data, _ = parse_file_titles(file_path)
-
-        # 过滤历史数据
-        if current_platform_ids is not None:
-            filtered_historical_data = {}
-            for source_id, title_data in historical_data.items():
-                if source_id in current_platform_ids:
-                    filtered_historical_data[source_id] = title_data
-            historical_data = filtered_historical_data
-
-        for source_id, titles_data in historical_data.items():
-            if source_id not in historical_titles:
-                historical_titles[source_id] = set()
-            for title in titles_data.keys():
-                historical_titles[source_id].add(title)
+def sync_snapshot_deltas() -> Dict:
+    """为当天尚未计算增量的快照生成增量记录（通常只有刚保存的一个），返回当天的增量记录"""
+    date_folder = format_date_folder()
+    snapshots = list_today_snapshots()
+    deltas, pending_times = SNAPSHOT_DELTAS.load(date_folder, snapshots)
+    if pending_times:
+        state = replay_deltas(deltas["records"])
+        stamps = dict(snapshots)
+        for time_info, titles_by_id, _ in load_today_snapshots(times=pending_times):
+            deltas["records"].append(
+                diff_snapshot(state, time_info, stamps[time_info], titles_by_id)
+            )
+        SNAPSHOT_DELTAS.save(date_folder, deltas)
+    return deltas
 
-    # 找出新增标题
-    new_titles = {}
-    for source_id, latest_source_titles in latest_titles.items():
-        historical_set = historical_titles.get(source_id, set())
-        source_new_titles = {}
 
-        for title, title_data in latest_source_titles.items():
-            if title not in historical_set:
-                source_new_titles[title] = title_data
+def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
+    """
+    检测当日最新批次的新增标题（时间范围内首次出现），支持按当前监控平台过滤
 
-        if source_new_titles:
-            new_titles[source_id] = source_new_titles
+    上一个快照在时间范围内时，新增标题一定是最新快照相对上一个快照新增的标题，
+    只需检查最新的增量记录；否则读取整个最新快照
+    """
+    sync_seen_titles()
+    records = sync_snapshot_deltas()["records"]
+    if not records:
+        return {}
 
-    return new_titles
+    date_folder = format_date_folder()
+    latest = records[-1]
+    seen_titles = get_seen_titles()
+    if len(records) > 1 and not seen_titles.within_horizon(
+        date_folder, records[-2]["time"], latest["time"]
+    ):
+        snapshots = load_today_snapshots(current_platform_ids, times=[latest["time"]])
+        if not snapshots:
+            return {}
+        _, latest_titles, _ = snapshots[0]
+        return seen_titles.new_titles(date_folder, latest["time"], latest_titles)
+
+    candidates = {
+        source_id: {
+            title: {"ranks": [rank], "url": url, "mobileUrl": mobile_url}
+            for title, rank, url, mobile_url in delta.get("added", ())
+        }
+        for source_id, delta in latest["platforms"].items()
+        if "added" in delta
+        and (current_platform_ids is None or source_id in current_platform_ids)
+    }
+    return seen_titles.new_titles(date_folder, latest["time"], candidates)
 
 
 # === 统计和分析 ===
@@ -948,11 +980,18 @@ def matches_word_groups(
     if not word_groups:
         return True
 
+    return find_matching_group(title, word_groups, filter_words) is not None
+
+
+def find_matching_group(
+    title: str, word_groups: List[Dict], filter_words: List[str]
+) -> Optional[str]:
+    """返回标题匹配的第一个词组的 group_key，被过滤或未匹配时返回 None"""
     title_lower = title.lower()
 
     # 过滤词检查
     if any(filter_word.lower() in title_lower for filter_word in filter_words):
-        return False
+        return None
 
     # 词组匹配检查
     for group in word_groups:
@@ -975,9 +1014,9 @@ def matches_word_groups(
             if not any_normal_present:
                 continue
 
-        return True
+        return group["group_key"]
 
-    return False
+    return None
 
 
 def format_time_display(first_time: str, last_time: str) -> str:
@@ -1129,12 +1168,9 @@ def count_word_frequency(
             if title in processed_titles.get(source_id, {}):
                 continue
 
-            # 使用统一的匹配逻辑
-            matches_frequency_words = matches_word_groups(
-                title, word_groups, filter_words
-            )
-
-            if not matches_frequency_words:
+            # 使用统一的匹配逻辑，找到第一个匹配的词组
+            group_key = find_matching_group(title, word_groups, filter_words)
+            if group_key is None:
                 continue
 
             # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
@@ -1147,115 +1183,82 @@ def count_word_frequency(
             source_url = title_data.get("url", "")
             source_mobile_url = title_data.get("mobileUrl", "")
 
-            # 找到匹配的词组
-            title_lower = title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-
-                # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-                else:
-                    # 原有的匹配逻辑
-                    if required_words:
-                        all_required_present = all(
-                            req_word.lower() in title_lower
-                            for req_word in required_words
-                        )
-                        if not all_required_present:
-                            continue
-
-                    if normal_words:
-                        any_normal_present = any(
-                            normal_word.lower() in title_lower
-                            for normal_word in normal_words
-                        )
-                        if not any_normal_present:
-                            continue
-
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-
-                first_time = ""
-                last_time = ""
-                count_info = 1
-                ranks = source_ranks if source_ranks else []
-                url = source_url
-                mobile_url = source_mobile_url
-
-                # 对于 current 模式，从历史统计信息中获取完整数据
-                if (
-                    mode == "current"
-                    and title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-                elif (
-                    title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-
-                if not ranks:
-                    ranks = [99]
-
-                time_display = format_time_display(first_time, last_time)
-
-                source_name = id_to_name.get(source_id, source_id)
+            word_stats[group_key]["count"] += 1
+            if source_id not in word_stats[group_key]["titles"]:
+                word_stats[group_key]["titles"][source_id] = []
 
-                # 判断是否为新增
-                is_new = False
-                if all_news_are_new:
-                    # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
-                    is_new = True
-                elif new_titles and source_id in new_titles:
-                    # 检查是否在新增列表中
-                    new_titles_for_source = new_titles[source_id]
-                    is_new = title in new_titles_for_source
-
-                word_stats[group_key]["titles"][source_id].append(
-                    {
-                        "title": title,
-                        "source_name": source_name,
-                        "first_time": first_time,
-                        "last_time": last_time,
-                        "time_display": time_display,
-                        "count": count_info,
-                        "ranks": ranks,
-                        "rank_threshold": rank_threshold,
-                        "url": url,
-                        "mobileUrl": mobile_url,
-                        "is_new": is_new,
-                    }
-                )
+            first_time = ""
+            last_time = ""
+            count_info = 1
+            ranks = source_ranks if source_ranks else []
+            url = source_url
+            mobile_url = source_mobile_url
 
-                if source_id not in processed_titles:
-                    processed_titles[source_id] = {}
-                processed_titles[source_id][title] = True
+            # 对于 current 模式，从历史统计信息中获取完整数据
+            if (
+                mode == "current"
+                and title_info
+                and source_id in title_info
+                and title in title_info[source_id]
+            ):
+                info = title_info[source_id][title]
+                first_time = info.get("first_time", "")
+                last_time = info.get("last_time", "")
+                count_info = info.get("count", 1)
+                if "ranks" in info and info["ranks"]:
+                    ranks = info["ranks"]
+                url = info.get("url", source_url)
+                mobile_url = info.get("mobileUrl", source_mobile_url)
+            elif (
+                title_info
+                and source_id in title_info
+                and title in title_info[source_id]
+            ):
+                info = title_info[source_id][title]
+                first_time = info.get("first_time", "")
+                last_time = info.get("last_time", "")
+                count_info = info.get("count", 1)
+                if "ranks" in info and info["ranks"]:
+                    ranks = info["ranks"]
+                url = info.get("url", source_url)
+                mobile_url = info.get("mobileUrl", source_mobile_url)
+
+            if not ranks:
+                ranks = [99]
+
+            time_display = format_time_display(first_time, last_time)
+
+            source_name = id_to_name.get(source_id, source_id)
+
+            # 判断是否为新增
+            is_new = False
+            if all_news_are_new:
+                # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
+                is_new = True
+            elif new_titles and source_id in new_titles:
+                # 检查是否在新增列表中
+                new_titles_for_source = new_titles[source_id]
+                is_new = title in new_titles_for_source
+
+            word_stats[group_key]["titles"][source_id].append(
+                {
+                    "title": title,
+                    "source_name": source_name,
+                    "first_time": first_time,
+                    "last_time": last_time,
+                    "time_display": time_display,
+                    "count": count_info,
+                    "ranks": ranks,
+                    "rank_threshold": rank_threshold,
+                    "url": url,
+                    "mobileUrl": mobile_url,
+                    "is_new": is_new,
+                }
+            )
 
-                break
+            if source_id not in processed_titles:
+                processed_titles[source_id] = {}
+            processed_titles[source_id][title] = True
 
     # 最后统一打印汇总信息
     if mode == "incremental":
@@ -1628,8 +1631,7 @@ def generate_html_report(
         f.write(html_content)
 
     if is_daily_summary:
-        root_file_path = Path("index.html")
-        with open(root_file_path, "w", encoding="utf-8") as f:
+        with open(INDEX_FILE, "w", encoding="utf-8") as f:
             f.write(html_content)
 
     return file_path
@@ -3422,9 +3424,6 @@ def send_to_feishu(
 ) -> bool:
     """发送到飞书（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
 
     # 获取分批内容，使用飞书专用的批次大小
     batches = split_content_into_batches(
@@ -3472,8 +3471,12 @@ def send_to_feishu(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                webhook_url,
+                proxy_url=proxy_url,
+                headers=headers,
+                json=payload,
+                timeout=30,
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3512,9 +3515,6 @@ def send_to_dingtalk(
 ) -> bool:
     """发送到钉钉（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
 
     # 获取分批内容，使用钉钉专用的批次大小
     batches = split_content_into_batches(
@@ -3555,8 +3555,12 @@ def send_to_dingtalk(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                webhook_url,
+                proxy_url=proxy_url,
+                headers=headers,
+                json=payload,
+                timeout=30,
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3593,9 +3597,6 @@ def send_to_wework(
 ) -> bool:
     """发送到企业微信（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
 
     # 获取分批内容
     batches = split_content_into_batches(report_data, "wework", update_info, mode=mode)
@@ -3617,8 +3618,12 @@ def send_to_wework(
         payload = {"msgtype": "markdown", "markdown": {"content": batch_content}}
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                webhook_url,
+                proxy_url=proxy_url,
+                headers=headers,
+                json=payload,
+                timeout=30,
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3658,10 +3663,6 @@ def send_to_telegram(
     headers = {"Content-Type": "application/json"}
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 获取分批内容
     batches = split_content_into_batches(
         report_data, "telegram", update_info, mode=mode
@@ -3689,8 +3690,8 @@ def send_to_telegram(
         }
 
         try:
-            response = requests.post(
-                url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = get_http_client().post(
+                url, proxy_url=proxy_url, headers=headers, json=payload, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3895,10 +3896,6 @@ def send_to_ntfy(
         base_url = f"https://{base_url}"
     url = f"{base_url}/{topic}"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
-
     # 获取分批内容，使用ntfy专用的4KB限制
     batches = split_content_into_batches(
         report_data, "ntfy", update_info, max_bytes=3800, mode=mode
@@ -3938,11 +3935,11 @@ def send_to_ntfy(
             )
 
         try:
-            response = requests.post(
+            response = get_http_client().post(
                 url,
+                proxy_url=proxy_url,
                 headers=current_headers,
                 data=batch_content.encode("utf-8"),
-                proxies=proxies,
                 timeout=30,
             )
 
@@ -3959,11 +3956,11 @@ def send_to_ntfy(
                 )
                 time.sleep(10)  # 等待10秒后重试
                 # 重试一次
-                retry_response = requests.post(
+                retry_response = get_http_client().post(
                     url,
+                    proxy_url=proxy_url,
                     headers=current_headers,
                     data=batch_content.encode("utf-8"),
-                    proxies=proxies,
                     timeout=30,
                 )
                 if retry_response.status_code == 200:
@@ -4050,10 +4047,72 @@ class NewsAnalyzer:
         self.is_docker_container = self._detect_docker_environment()
         self.update_info = None
         self.proxy_url = None
+        self.proxy_pool: Optional[ProxyPool] = None
         self._setup_proxy()
-        self.data_fetcher = DataFetcher(self.proxy_url)
+        replay_run = None
+        if CONFIG["REPLAY_RUN"]:
+            replay_run = ResponseArchive().load_run(CONFIG["REPLAY_RUN"])
+            # 回放结果与正式数据隔离：不推送，快照、报告和状态写入独立目录
+            CONFIG["ENABLE_NOTIFICATION"] = False
+            self.proxy_pool = None
+            isolate_output(OUTPUT_DIR / ".replay" / replay_run.run_key)
+            print(
+                f"离线回放模式：使用归档 {replay_run.run_key}，不请求平台接口，"
+                f"不推送通知，结果写入 {OUTPUT_DIR}"
+            )
+        self.replay_run = replay_run
+        # 已出现标题索引在确定输出目录（回放时为隔离目录）之后创建
+        get_seen_titles()
+        self.data_fetcher = DataFetcher(
+            self.proxy_url,
+            max_workers=CONFIG["MAX_WORKERS"] if CONFIG["CONCURRENT_CRAWL"] else 1,
+            host_max_concurrency=CONFIG["HOST_MAX_CONCURRENCY"],
+            host_min_interval=CONFIG["HOST_MIN_INTERVAL"],
+            request_interval=self.request_interval,
+            api_url=CONFIG["API_URL"],
+            fingerprint_cache=(
+                CrawlFingerprintCache()
+                if CONFIG["REUSE_UNCHANGED"] and replay_run is None
+                else None
+            ),
+            circuit_breaker=(
+                CircuitBreaker(
+                    failure_threshold=CONFIG["CIRCUIT_BREAKER"]["FAILURE_THRESHOLD"],
+                    cooldown=CONFIG["CIRCUIT_BREAKER"]["COOLDOWN"],
+                )
+                if CONFIG["CIRCUIT_BREAKER"]["ENABLED"] and replay_run is None
+                else None
+            ),
+            crawl_deadline=CONFIG["CRAWL_DEADLINE"],
+            response_archive=(
+                ResponseArchive()
+                if CONFIG["ARCHIVE_RAW_RESPONSES"] and replay_run is None
+                else None
+            ),
+            replay_run=replay_run,
+            telemetry=(
+                CrawlTelemetry(
+                    prometheus_file=CONFIG["TELEMETRY"]["PROMETHEUS_TEXTFILE"] or None,
+                    retention_months=CONFIG["TELEMETRY"]["RETENTION_MONTHS"],
+                )
+                if CONFIG["TELEMETRY"]["ENABLED"] and replay_run is None
+                else None
+            ),
+            proxy_pool=self.proxy_pool,
+        )
+        self.polling_scheduler = None
+        self.deferred_ids = []
+        if CONFIG["ADAPTIVE_POLLING"]["ENABLED"] and replay_run is None:
+            if self.data_fetcher.fingerprint_cache is None:
+                print("自适应轮询需要开启 reuse_unchanged 以沿用未轮询平台的结果，已忽略")
+            else:
+                self.polling_scheduler = AdaptivePollingScheduler(
+                    min_interval=CONFIG["ADAPTIVE_POLLING"]["MIN_INTERVAL"],
+                    max_interval=CONFIG["ADAPTIVE_POLLING"]["MAX_INTERVAL"],
+                    target_churn=CONFIG["ADAPTIVE_POLLING"]["TARGET_CHURN"],
+                )
 
-        if self.is_github_actions:
+        if self.is_github_actions and replay_run is None:
             self._check_version_update()
 
     def _detect_docker_environment(self) -> bool:
@@ -4077,7 +4136,15 @@ class NewsAnalyzer:
         """设置代理配置"""
         if not self.is_github_actions and CONFIG["USE_PROXY"]:
             self.proxy_url = CONFIG["DEFAULT_PROXY"]
-            print("本地环境，使用代理")
+            if CONFIG["PROXY_POOL"]["PROXIES"]:
+                self.proxy_pool = ProxyPool(
+                    CONFIG["PROXY_POOL"]["PROXIES"],
+                    max_error_rate=CONFIG["PROXY_POOL"]["MAX_ERROR_RATE"],
+                    eviction_cooldown=CONFIG["PROXY_POOL"]["EVICTION_COOLDOWN"],
+                )
+                print(f"本地环境，使用代理池（{len(self.proxy_pool.proxies)} 个代理）")
+            else:
+                print("本地环境，使用代理")
         elif not self.is_github_actions and not CONFIG["USE_PROXY"]:
             print("本地环境，未启用代理")
         else:
@@ -4379,8 +4446,8 @@ class NewsAnalyzer:
         print(f"报告模式: {self.report_mode}")
         print(f"运行模式: {mode_strategy['description']}")
 
-    def _crawl_data(self) -> Tuple[Dict, Dict, List]:
-        """执行数据爬取"""
+    def _crawl_data(self) -> Optional[Tuple[Dict, Dict, List, str]]:
+        """执行数据爬取并保存快照，返回 (results, id_to_name, failed_ids, 快照时间)，所有平台内容均未变化且允许跳过时返回 None"""
         ids = []
         for platform in CONFIG["PLATFORMS"]:
             if "name" in platform:
@@ -4391,27 +4458,100 @@ class NewsAnalyzer:
         print(
             f"配置的监控平台: {[p.get('name', p['id']) for p in CONFIG['PLATFORMS']]}"
         )
-        print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
-        ensure_directory_exists("output")
+        if self.data_fetcher.max_workers > 1:
+            print(
+                f"开始并发爬取数据，线程数 {self.data_fetcher.max_workers}，"
+                f"单主机并发上限 {CONFIG['HOST_MAX_CONCURRENCY']}，"
+                f"请求间隔 {CONFIG['HOST_MIN_INTERVAL']} 毫秒"
+            )
+        else:
+            print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
+        ensure_directory_exists(str(OUTPUT_DIR))
 
+        due_ids, deferred_results = self._schedule_platforms(ids)
         results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
-            ids, self.request_interval
+            due_ids, self.request_interval
         )
+        if self.polling_scheduler is not None:
+            results, id_to_name = self._merge_deferred_results(
+                ids, results, id_to_name, deferred_results
+            )
+
+        if self._is_crawl_unchanged(results):
+            print("所有平台内容与上次爬取一致，跳过本次保存、分析和推送")
+            return None
 
-        title_file = save_titles_to_file(results, id_to_name, failed_ids)
+        title_file, time_info = save_titles_to_file(results, id_to_name, failed_ids)
         print(f"标题已保存到: {title_file}")
 
-        return results, id_to_name, failed_ids
+        return results, id_to_name, failed_ids, time_info
+
+    def _schedule_platforms(self, ids: List) -> Tuple[List, Dict]:
+        """按自适应轮询间隔挑选本次需要爬取的平台，返回 (待爬取列表, 推迟平台的上次结果)"""
+        self.deferred_ids = []
+        if self.polling_scheduler is None:
+            return ids, {}
+
+        due_ids, deferred = self.polling_scheduler.split(ids)
+        deferred_results = {}
+        for id_info in deferred:
+            id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+            latest = self.data_fetcher.fingerprint_cache.get_latest(id_value)
+            if latest:
+                deferred_results[id_info] = latest
+                self.deferred_ids.append(id_value)
+            else:
+                due_ids.append(id_info)
+
+        if self.deferred_ids:
+            intervals = [
+                f"{id_value}({self.polling_scheduler.get_interval(id_value):.0f}分钟)"
+                for id_value in self.deferred_ids
+            ]
+            print(f"自适应轮询：未到轮询时间，沿用上次结果: {', '.join(intervals)}")
+        return due_ids, deferred_results
+
+    def _merge_deferred_results(
+        self, ids: List, results: Dict, id_to_name: Dict, deferred_results: Dict
+    ) -> Tuple[Dict, Dict]:
+        """记录本次爬取平台的标题变化，并按配置顺序合并推迟平台的上次结果"""
+        # 内容未变化的平台同样是一次有效观测，变化率按零计入
+        for id_value, title_data in results.items():
+            self.polling_scheduler.observe(id_value, title_data.keys())
+        self.polling_scheduler.save()
+
+        merged_results = {}
+        for id_info in ids:
+            id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+            if id_info in deferred_results:
+                merged_results[id_value] = deferred_results[id_info]
+                id_to_name[id_value] = (
+                    id_info[1] if isinstance(id_info, tuple) else id_value
+                )
+            elif id_value in results:
+                merged_results[id_value] = results[id_value]
+        return merged_results, id_to_name
+
+    def _is_crawl_unchanged(self, results: Dict) -> bool:
+        """判断本次爬取是否没有任何平台发生变化（失败的平台不视为变化）"""
+        if not CONFIG["SKIP_UNCHANGED_RUN"] or not results:
+            return False
+        unchanged_ids = set(self.data_fetcher.unchanged_ids) | set(self.deferred_ids)
+        return all(id_value in unchanged_ids for id_value in results)
 
     def _execute_mode_strategy(
-        self, mode_strategy: Dict, results: Dict, id_to_name: Dict, failed_ids: List
+        self,
+        mode_strategy: Dict,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        time_info: str,
     ) -> Optional[str]:
-        """执行模式特定逻辑"""
+        """执行模式特定逻辑，time_info 为 _crawl_data 保存的快照时间"""
         # 获取当前监控平台ID列表
         current_platform_ids = [platform["id"] for platform in CONFIG["PLATFORMS"]]
 
         new_titles = detect_latest_new_titles(current_platform_ids)
-        time_info = Path(save_titles_to_file(results, id_to_name, failed_ids)).stem
         word_groups, filter_words = load_frequency_words()
 
         # current模式下，实时推送需要使用完整的历史数据来保证统计信息的完整性
@@ -4526,14 +4666,66 @@ class NewsAnalyzer:
 
             mode_strategy = self._get_mode_strategy()
 
-            results, id_to_name, failed_ids = self._crawl_data()
+            crawl_result = self._crawl_data()
 
-            self._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids)
+            if crawl_result:
+                results, id_to_name, failed_ids, time_info = crawl_result
+                self._execute_mode_strategy(
+                    mode_strategy, results, id_to_name, failed_ids, time_info
+                )
+
+            self._report_http_stats()
+
+            # 本次运行的快照和报告都已写完，此时再压缩冷数据、按月打包，避免与读写同时进行；
+            # 两者都在 main.py 退出前完成，GitHub Actions 随后提交的是处理后的 output
+            cold_days = self._cold_data_days()
+            if cold_days:
+                today = get_beijing_time().replace(tzinfo=None)
+                self._compact_cold_days(cold_days, today)
+                self._pack_cold_months(cold_days, today)
 
         except Exception as e:
             print(f"分析流程执行出错: {e}")
             raise
 
+    def _cold_data_days(self) -> int:
+        """超过多少天的日期视为冷数据（storage.compress_after_days），不处理冷数据时返回 0"""
+        days = CONFIG["STORAGE"]["COMPRESS_AFTER_DAYS"]
+        if not days or days <= 0 or self.replay_run is not None:
+            return 0
+        # 新增标题检测时间范围内的日期下次运行仍会读取，不参与压缩和打包
+        return max(days, len(get_seen_titles().horizon_dates(format_date_folder())))
+
+    @staticmethod
+    def _compact_cold_days(days: int, today: datetime) -> None:
+        """压缩冷数据的日期目录，在报告生成之后同步执行"""
+        for archive_path in compact_cold_days(
+            OUTPUT_DIR, days, CONFIG["STORAGE"]["COMPRESSION"], today=today
+        ):
+            print(f"已压缩冷数据: {archive_path}")
+
+    @staticmethod
+    def _pack_cold_months(days: int, today: datetime) -> None:
+        """按配置将冷数据所在的已结束月份打包，在压缩之后同步执行"""
+        if not CONFIG["STORAGE"]["PACK_MONTHLY"]:
+            return
+        cutoff_date = (today - timedelta(days=days)).strftime("%Y年%m月%d日")
+        for pack_path in pack_cold_months(OUTPUT_DIR, cutoff_date):
+            print(f"已按月打包: {pack_path}")
+
+    def _report_http_stats(self) -> None:
+        """输出 HTTP 连接复用统计"""
+        stats = get_http_client().get_stats()
+        http2_info = (
+            f"，HTTP/2 响应 {stats['http2_responses']} 次"
+            if stats["http2_responses"]
+            else ""
+        )
+        print(
+            f"HTTP连接统计: 请求 {stats['requests']} 次，新建连接 {stats['new_connections']} 个，"
+            f"复用连接 {stats['reused_connections']} 次{http2_info}"
+        )
+
 
 def main():
     try:
@@ -531,31 +531,76 @@ async def trigger_crawl(
     include_url: bool = False
 ) -> str:
     """
-    手动触发一次爬取任务（可选持久化）
+    手动触发一次爬取任务（可选持久化），任务在后台执行，立即返回任务ID
 
     Args:
         platforms: 指定平台ID列表，如 ['zhihu', 'weibo', 'douyin']
                    - 不指定时：使用 config.yaml 中配置的所有平台
                    - 支持的平台来自 config/config.yaml 的 platforms 配置
                    - 每个平台都有对应的name字段（如"知乎"、"微博"），方便AI识别
-                   - 注意：失败的平台会在返回结果的 failed_platforms 字段中列出
         save_to_local: 是否保存到本地 output 目录，默认 False
         include_url: 是否包含URL链接，默认False（节省token）
 
     Returns:
-        JSON格式的任务状态信息，包含：
-        - platforms: 成功爬取的平台列表
-        - failed_platforms: 失败的平台列表（如有）
-        - total_news: 爬取的新闻总数
-        - data: 新闻数据
+        JSON格式的任务信息，包含：
+        - task_id: 任务ID，用于 get_crawl_task_status / cancel_crawl_task
+        - status: 任务状态（pending/running）
+        - platforms: 本次爬取的平台列表
 
     Examples:
         - 临时爬取: trigger_crawl(platforms=['zhihu'])
         - 爬取并保存: trigger_crawl(platforms=['weibo'], save_to_local=True)
         - 使用默认平台: trigger_crawl()  # 爬取config.yaml中配置的所有平台
+        - 随后查询结果: get_crawl_task_status(task_id='crawl_1730000000')
     """
     tools = _get_tools()
-    result = tools['system'].trigger_crawl(platforms=platforms, save_to_local=save_to_local, include_url=include_url)
+    result = tools['system'].start_crawl_task(platforms=platforms, save_to_local=save_to_local, include_url=include_url)
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
+@mcp.tool
+async def get_crawl_task_status(
+    task_id: Optional[str] = None,
+    include_data: bool = True
+) -> str:
+    """
+    查询后台爬取任务的进度和结果
+
+    Args:
+        task_id: trigger_crawl 返回的任务ID，不指定时列出最近的任务
+        include_data: 任务结束后是否返回完整新闻数据，默认 True
+
+    Returns:
+        JSON格式的任务状态，包含：
+        - status: pending/running/completed/failed/cancelled
+        - progress: 平台总数、已结束数、成功数、失败数
+        - platforms: 逐平台状态（queued/pending/fresh/cache/failed/skipped/timed_out/cancelled）、条目数和耗时
+        - result: 任务结束后的爬取结果（platforms、failed_platforms、total_news、data）
+
+    Examples:
+        - get_crawl_task_status(task_id='crawl_1730000000')
+        - get_crawl_task_status()  # 列出最近的任务
+    """
+    tools = _get_tools()
+    result = tools['system'].get_crawl_task_status(task_id=task_id, include_data=include_data)
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
+@mcp.tool
+async def cancel_crawl_task(task_id: str) -> str:
+    """
+    取消后台爬取任务
+
+    尚未开始的平台不再请求，已获取的平台结果会保留在任务结果中（被取消的任务不会保存到本地）。
+
+    Args:
+        task_id: trigger_crawl 返回的任务ID
+
+    Returns:
+        JSON格式的任务状态
+    """
+    tools = _get_tools()
+    result = tools['system'].cancel_crawl_task(task_id=task_id)
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
@@ -620,7 +665,9 @@ def run_server(
     print("    === 配置与系统管理 ===")
     print("    11. get_current_config      - 获取当前系统配置")
     print("    12. get_system_status       - 获取系统运行状态")
-    print("    13. trigger_crawl           - 手动触发爬取任务")
+    print("    13. trigger_crawl           - 手动触发爬取任务（后台执行）")
+    print("    14. get_crawl_task_status   - 查询爬取任务进度和结果")
+    print("    15. cancel_crawl_task       - 取消爬取任务")
     print("=" * 60)
     print()
 
@@ -0,0 +1,241 @@
+"""
+爬取任务服务
+
+管理后台运行的临时爬取任务：提交后立即返回任务ID，爬取在后台线程中执行，
+不占用 MCP Server 的事件循环；支持查询进度和逐平台结果，以及取消任务。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from trendradar.crawler import CrawlEngine
+from trendradar.utils import get_beijing_time
+
+from ..utils.errors import DataNotFoundError
+
+
+# finalize(task, results, id_to_name, failed_ids) -> 任务结果字典
+FinalizeCallback = Callable[["CrawlTask", Dict, Dict, List], Dict]
+
+
+class CrawlTask:
+    """单个后台爬取任务"""
+
+    def __init__(self, task_id: str, engine: CrawlEngine, ids: List, finalize: FinalizeCallback):
+        self.task_id = task_id
+        self.engine = engine
+        self.ids = ids
+        self.finalize = finalize
+        # pending -> running -> completed / failed / cancelled
+        self.status = "pending"
+        self.cancel_requested = False
+        # 爬取结束、开始整理（及保存）结果后不再接受取消
+        self.finalizing = False
+        self.created_at = get_beijing_time()
+        self.started_at = None
+        self.finished_at = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self._started = time.monotonic()
+        self._finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def run(self) -> None:
+        """在后台线程中执行爬取"""
+        with self._lock:
+            self.status = "running"
+            self.started_at = get_beijing_time()
+
+        try:
+            results, id_to_name, failed_ids = self.engine.crawl(self.ids)
+            with self._lock:
+                self.finalizing = True
+                # 取消请求到达时所有平台都已完成则不算取消
+                self.cancel_requested = self.cancel_requested and bool(self.engine.cancelled_ids)
+            result = self.finalize(self, results, id_to_name, failed_ids)
+            with self._lock:
+                self.result = result
+                self.status = "cancelled" if self.cancel_requested else "completed"
+        except Exception as e:
+            with self._lock:
+                self.error = str(e)
+                self.status = "failed"
+        finally:
+            with self._lock:
+                self.finished_at = get_beijing_time()
+                self._finished = time.monotonic()
+
+    def cancel(self) -> bool:
+        """
+        请求取消任务，已获取的平台结果会保留
+
+        Returns:
+            是否接受了取消请求（任务已结束或正在整理结果时不再取消）
+        """
+        with self._lock:
+            if self.is_finished or self.finalizing:
+                return False
+            self.cancel_requested = True
+        self.engine.cancel()
+        return True
+
+    def _platform_progress(self) -> List[Dict]:
+        """按平台列出进度，尚未开始的平台状态为 queued"""
+        metrics = self.engine.snapshot_metrics()
+        platforms = []
+        for id_info in self.ids:
+            if isinstance(id_info, tuple):
+                id_value, name = id_info
+            else:
+                id_value = name = id_info
+            platform_metrics = metrics.get(id_value)
+            if platform_metrics is None:
+                platforms.append({"id": id_value, "name": name, "status": "queued"})
+                continue
+            platforms.append({
+                "id": id_value,
+                "name": name,
+                "status": platform_metrics["status"],
+                "items": platform_metrics["items"],
+                "retries": platform_metrics["retries"],
+                "total_ms": platform_metrics["total_ms"],
+                "error": platform_metrics["error"],
+            })
+        return platforms
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """
+        任务状态
+
+        Args:
+            include_result: 任务结束后是否附带完整爬取结果
+        """
+        platforms = self._platform_progress()
+        finished_count = sum(
+            1 for p in platforms if p["status"] not in ("queued", "pending")
+        )
+        succeeded_count = sum(
+            1 for p in platforms if p["status"] in ("fresh", "cache")
+        )
+
+        with self._lock:
+            end = self._finished if self._finished is not None else time.monotonic()
+            task_info = {
+                "task_id": self.task_id,
+                "status": self.status,
+                "cancel_requested": self.cancel_requested,
+                "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S") if self.started_at else None,
+                "finished_at": self.finished_at.strftime("%Y-%m-%d %H:%M:%S") if self.finished_at else None,
+                "elapsed_seconds": round(end - self._started, 2),
+                "progress": {
+                    "total": len(platforms),
+                    "finished": finished_count,
+                    "succeeded": succeeded_count,
+                    "failed": finished_count - succeeded_count,
+                },
+                "platforms": platforms,
+            }
+            if self.error:
+                task_info["error"] = self.error
+            if include_result and self.result is not None:
+                task_info["result"] = self.result
+        return task_info
+
+
+class CrawlTaskService:
+    """后台爬取任务管理，只保留最近的若干个任务"""
+
+    def __init__(self, max_history: int = 50):
+        self.max_history = max_history
+        self._tasks: "OrderedDict[str, CrawlTask]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_second = 0
+        self._same_second_count = 0
+
+    def submit(self, engine: CrawlEngine, ids: List, finalize: FinalizeCallback) -> CrawlTask:
+        """
+        提交爬取任务并立即返回
+
+        Args:
+            engine: 已配置的爬取引擎（每个任务独立一个，以便单独取消）
+            ids: 平台ID或 (平台ID, 名称) 列表
+            finalize: 爬取结束后构建任务结果的回调
+        """
+        with self._lock:
+            # 同一秒内提交的任务依次加序号；不按现有任务判重，已移除任务的ID也不会被复用
+            second = int(time.time())
+            if second == self._last_second:
+                self._same_second_count += 1
+                task_id = f"crawl_{second}_{self._same_second_count}"
+            else:
+                self._last_second, self._same_second_count = second, 1
+                task_id = f"crawl_{second}"
+
+            task = CrawlTask(task_id, engine, ids, finalize)
+            self._tasks[task_id] = task
+            self._evict_finished()
+
+        thread = threading.Thread(
+            target=task.run, name=f"crawl-task-{task_id}", daemon=True
+        )
+        thread.start()
+        return task
+
+    def _evict_finished(self) -> None:
+        """超出保留数量时移除最早结束的任务，运行中的任务不会被移除"""
+        overflow = len(self._tasks) - self.max_history
+        if overflow <= 0:
+            return
+        for task_id in [tid for tid, task in self._tasks.items() if task.is_finished][:overflow]:
+            del self._tasks[task_id]
+
+    def get(self, task_id: str) -> CrawlTask:
+        """
+        获取任务
+
+        Raises:
+            DataNotFoundError: 任务不存在
+        """
+        with self._lock:
+            task = self._tasks.get(task_id)
+        if task is None:
+            raise DataNotFoundError(
+                f"爬取任务不存在: {task_id}",
+                suggestion="任务ID来自 trigger_crawl 的返回结果，服务重启后历史任务会被清除"
+            )
+        return task
+
+    def list_tasks(self) -> List[CrawlTask]:
+        """按提交时间倒序列出任务"""
+        with self._lock:
+            return list(reversed(self._tasks.values()))
+
+    def cancel(self, task_id: str) -> CrawlTask:
+        """取消任务"""
+        task = self.get(task_id)
+        task.cancel()
+        return task
+
+
+# 全局任务服务实例
+_global_task_service = None
+
+
+def get_crawl_task_service() -> CrawlTaskService:
+    """
+    获取全局爬取任务服务实例
+
+    Returns:
+        全局任务服务实例
+    """
+    global _global_task_service
+    if _global_task_service is None:
+        _global_task_service = CrawlTaskService()
+    return _global_task_service
@@ -9,6 +9,10 @@ from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
+from trendradar.crawler import DEFAULT_REQUEST_INTERVAL
+from trendradar.day_archive import split_archive_name
+from trendradar.month_pack import MonthPackStore
+
 from .cache_service import get_cache
 from .parser_service import ParserService
 from ..utils.errors import DataNotFoundError
@@ -436,7 +440,7 @@ class DataService:
             crawler_config = {
                 "enable_crawler": config_data.get("crawler", {}).get("enable_crawler", True),
                 "use_proxy": config_data.get("crawler", {}).get("use_proxy", False),
-                "request_interval": config_data.get("crawler", {}).get("request_interval", 1),
+                "request_interval": config_data.get("crawler", {}).get("request_interval", DEFAULT_REQUEST_INTERVAL),
                 "retry_times": 3,
                 "platforms": [p["id"] for p in config_data.get("platforms", [])]
             }
@@ -514,9 +518,10 @@ class DataService:
 
         available_dates = []
 
-        # 遍历日期文件夹
+        # 遍历日期文件夹（已压缩的日期为 <日期>.tar.gz / .tar.zst 归档）
         for date_folder in output_dir.iterdir():
-            if date_folder.is_dir() and not date_folder.name.startswith('.'):
+            is_archive = date_folder.is_file() and split_archive_name(date_folder.name)
+            if (date_folder.is_dir() or is_archive) and not date_folder.name.startswith('.'):
                 # 解析日期（格式: YYYY年MM月DD日）
                 try:
                     date_match = re.match(r'(\d{4})年(\d{2})月(\d{2})日', date_folder.name)
@@ -530,6 +535,10 @@ class DataService:
                 except Exception:
                     pass
 
+        # 已按月打包的日期
+        for date_str in MonthPackStore(output_dir).list_dates():
+            available_dates.append(datetime.strptime(date_str, "%Y年%m月%d日"))
+
         if not available_dates:
             return (None, None)
 
@@ -574,10 +583,34 @@ class DataService:
                     except:
                         pass
 
-                    # 计算存储大小
-                    for item in date_folder.rglob("*"):
+                    # 计算存储大小（txt 快照的大小来自每日快照清单，不再逐个 stat）
+                    total_storage += self.parser.day_manifest.total_size(date_folder.name)
+                    for item in date_folder.iterdir():
                         if item.is_file():
                             total_storage += item.stat().st_size
+                        elif item.name != "txt":
+                            for sub_item in item.rglob("*"):
+                                if sub_item.is_file():
+                                    total_storage += sub_item.stat().st_size
+                elif split_archive_name(date_folder.name):
+                    archive_date = datetime.strptime(
+                        split_archive_name(date_folder.name)[0], "%Y年%m月%d日"
+                    )
+                    if oldest_record is None or archive_date < oldest_record:
+                        oldest_record = archive_date
+                    if latest_record is None or archive_date > latest_record:
+                        latest_record = archive_date
+                    total_storage += date_folder.stat().st_size
+
+            pack_store = MonthPackStore(output_dir)
+            for month in pack_store.list_months():
+                total_storage += pack_store.pack_path(month).stat().st_size
+            for date_str in pack_store.list_dates():
+                packed_date = datetime.strptime(date_str, "%Y年%m月%d日")
+                if oldest_record is None or packed_date < oldest_record:
+                    oldest_record = packed_date
+                if latest_record is None or packed_date > latest_record:
+                    latest_record = packed_date
 
         # 读取版本信息
         version_file = self.parser.project_root / "version"
@@ -1,16 +1,25 @@
 """
 文件解析服务
 
-提供txt格式新闻数据和YAML配置文件的解析功能。
+提供新闻快照数据（txt 文件、SQLite 存储或按天追加的快照日志）和YAML配置文件的解析功能。
 """
 
+import os
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Union
 from datetime import datetime
 
 import yaml
 
+from trendradar.binary_snapshot import BinarySnapshotStore
+from trendradar.day_archive import DayArchiveStore
+from trendradar.day_manifest import DayManifest
+from trendradar.daylog import DayLogStore
+from trendradar.mmap_reader import HistoryReader, TitleRecord
+from trendradar.month_pack import MonthPackStore
+from trendradar.sqlite_store import SQLiteNewsStore
+
 from ..utils.errors import FileParseError, DataNotFoundError
 from .cache_service import get_cache
 
@@ -34,6 +43,56 @@ class ParserService:
 
         # 初始化缓存服务
         self.cache = get_cache()
+        self._news_store: Optional[SQLiteNewsStore] = None
+        self.day_log_store = DayLogStore(self.project_root / "output")
+        self.binary_store = BinarySnapshotStore(self.project_root / "output")
+        self.archive_store = DayArchiveStore(self.project_root / "output")
+        self.pack_store = MonthPackStore(self.project_root / "output")
+        self.day_manifest = DayManifest(self.project_root / "output")
+        self.history_reader = HistoryReader(
+            self.project_root / "output", self.binary_store, self.pack_store
+        )
+
+    def get_news_store(self) -> Optional[Union[SQLiteNewsStore, DayLogStore, BinarySnapshotStore]]:
+        """
+        获取配置的快照存储（与主程序相同）
+
+        storage.backend（环境变量 STORAGE_BACKEND 优先）为 sqlite / log / binary 时返回对应存储，
+        txt 时返回 None；数据库路径来自 storage.sqlite_path
+        """
+        storage_config = {}
+        config_path = self.project_root / "config" / "config.yaml"
+        if config_path.exists():
+            try:
+                with open(config_path, "r", encoding="utf-8") as f:
+                    storage_config = (yaml.safe_load(f) or {}).get("storage", {})
+            except Exception:
+                pass
+
+        backend = os.environ.get("STORAGE_BACKEND", "").strip() or storage_config.get("backend", "txt")
+        if backend == "log":
+            return self.day_log_store
+        if backend == "binary":
+            return self.binary_store
+        if backend != "sqlite":
+            return None
+        db_path = Path(storage_config.get("sqlite_path", "output/news.db"))
+        if not db_path.is_absolute():
+            db_path = self.project_root / db_path
+        if self._news_store is None or self._news_store.db_path != db_path:
+            self._news_store = SQLiteNewsStore(db_path)
+        return self._news_store
+
+    def _stored_news_store(
+        self, date_folder: str
+    ) -> Optional[Union[SQLiteNewsStore, DayLogStore, BinarySnapshotStore]]:
+        """配置的快照存储中有该日期时返回该存储，否则返回 None（数据库不存在时不创建）"""
+        news_store = self.get_news_store()
+        if news_store is None:
+            return None
+        if isinstance(news_store, SQLiteNewsStore) and not news_store.exists():
+            return None
+        return news_store if news_store.has_date(date_folder) else None
 
     @staticmethod
     def clean_title(title: str) -> str:
@@ -67,7 +126,17 @@ class ParserService:
         Raises:
             FileParseError: 文件解析错误
         """
+        # 已压缩的日期从整天的归档读取（每天只解压一次并缓存），已按月打包的日期只读取该快照的数据块
         if not file_path.exists():
+            date_folder = file_path.parent.parent.name
+            if file_path.parent.name == "txt":
+                for cold_store in (self.archive_store, self.pack_store):
+                    if not cold_store.has_date(date_folder):
+                        continue
+                    for _, titles_by_id, id_to_name in cold_store.load_day(
+                        date_folder, times=[file_path.stem]
+                    ):
+                        return titles_by_id, id_to_name
             raise FileParseError(str(file_path), "文件不存在")
 
         titles_by_id = {}
@@ -193,10 +262,24 @@ class ParserService:
         if cached:
             return cached
 
-        # 缓存未命中，读取文件
+        # 缓存未命中，优先读取配置的快照存储（storage.backend），其次是 txt 快照
         date_folder = self.get_date_folder_name(date)
+        news_store = self._stored_news_store(date_folder)
+        if news_store is not None:
+            result = self._read_titles_from_store(news_store, date_folder, platform_ids)
+            self.cache.set(cache_key, result)
+            return result
+
         txt_dir = self.project_root / "output" / date_folder / "txt"
 
+        if not txt_dir.exists():
+            # 已压缩或已按月打包的日期
+            for cold_store in (self.archive_store, self.pack_store):
+                if cold_store.has_date(date_folder):
+                    result = self._read_titles_from_store(cold_store, date_folder, platform_ids)
+                    self.cache.set(cache_key, result)
+                    return result
+
         if not txt_dir.exists():
             raise DataNotFoundError(
                 f"未找到 {date_folder} 的数据目录",
@@ -207,16 +290,17 @@ class ParserService:
         id_to_name = {}
         all_timestamps = {}
 
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
+        # 读取所有txt文件（文件列表和写入时刻来自每日快照清单，不再逐个 stat）
+        snapshots = self.day_manifest.list_snapshots(date_folder)
 
-        if not txt_files:
+        if not snapshots:
             raise DataNotFoundError(
                 f"{date_folder} 没有数据文件",
                 suggestion="请等待爬虫任务完成"
             )
 
-        for txt_file in txt_files:
+        for time_info, stamp in snapshots:
+            txt_file = txt_dir / f"{time_info}.txt"
             try:
                 titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
 
@@ -240,7 +324,7 @@ class ParserService:
                             all_titles[platform_id][title] = info.copy()
 
                 # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
+                all_timestamps[txt_file.name] = stamp
 
             except Exception as e:
                 # 忽略单个文件的解析错误，继续处理其他文件
@@ -259,6 +343,119 @@ class ParserService:
 
         return result
 
+    def iter_titles_for_date(
+        self,
+        date: datetime = None,
+        platform_ids: Optional[List[str]] = None,
+        fields: Iterable[str] = ()
+    ) -> Iterator[TitleRecord]:
+        """
+        逐条读取指定日期的标题（不缓存），供长时间范围的扫描使用
+
+        二进制快照和已按月打包的日期通过 mmap 直接读取，只解码请求的字段；其他存储
+        沿用 read_all_titles_for_date。每个平台的标题只产出一次，排名和链接取首次出现的值，
+        与 read_all_titles_for_date 的合并结果一致（二进制快照按快照顺序产出，不按平台分组）。
+
+        Args:
+            date: 日期对象，默认为今天
+            platform_ids: 平台ID列表，None表示所有平台
+            fields: 需要的字段，可选 platform_name / rank / url / mobile_url，标题和平台ID总是返回
+
+        Raises:
+            DataNotFoundError: 数据不存在（在开始迭代时抛出）
+        """
+        date_folder = self.get_date_folder_name(date)
+        reader = self._mapped_reader(date_folder)
+        if reader is not None:
+            found = False
+            for record in reader(date_folder, platform_ids, fields):
+                found = True
+                yield record
+            if not found:
+                raise DataNotFoundError(
+                    f"{date_folder} 没有有效的数据",
+                    suggestion="请检查数据文件格式或重新运行爬虫"
+                )
+            return
+
+        fields = set(fields)
+        all_titles, id_to_name, _ = self.read_all_titles_for_date(date, platform_ids)
+        for platform_id, titles in all_titles.items():
+            platform_name = id_to_name.get(platform_id, platform_id) if "platform_name" in fields else None
+            for title, info in titles.items():
+                yield TitleRecord(
+                    platform_id,
+                    title,
+                    platform_name,
+                    info["ranks"][0] if "rank" in fields and info.get("ranks") else None,
+                    info.get("url", "") if "url" in fields else None,
+                    info.get("mobileUrl", "") if "mobile_url" in fields else None,
+                )
+
+    def _mapped_reader(self, date_folder: str):
+        """
+        指定日期可用 mmap 逐条读取时返回对应的读取方法，否则返回 None
+
+        存储的选择顺序与 read_all_titles_for_date 相同
+        """
+        news_store = self._stored_news_store(date_folder)
+        if news_store is self.binary_store:
+            return self.history_reader.iter_binary_titles
+        if news_store is not None:
+            return None
+        if (self.project_root / "output" / date_folder / "txt").exists():
+            return None
+        if self.archive_store.has_date(date_folder):
+            return None
+        if self.pack_store.has_date(date_folder):
+            return self.history_reader.iter_packed_titles
+        return None
+
+    def _read_titles_from_store(
+        self,
+        news_store: Union[
+            SQLiteNewsStore, DayLogStore, BinarySnapshotStore, DayArchiveStore, MonthPackStore
+        ],
+        date_folder: str,
+        platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        从 SQLite 存储、快照日志、二进制快照、已压缩或已打包的日期读取指定日期的所有快照，返回结构与读取 txt 文件相同
+
+        all_timestamps 的键沿用 txt 文件名（HH时MM分.txt），值为爬取时刻；
+        指定平台时只读取这些平台的数据（id_to_name 也只包含这些平台）
+        """
+        all_titles = {}
+        id_to_name = {}
+        crawled_at = dict(news_store.list_snapshots(date_folder))
+
+        for time_info, titles_by_id, snapshot_id_to_name in news_store.load_day(
+            date_folder, platform_ids or None
+        ):
+            id_to_name.update(snapshot_id_to_name)
+
+            for platform_id, titles in titles_by_id.items():
+                if platform_ids and platform_id not in platform_ids:
+                    continue
+
+                if platform_id not in all_titles:
+                    all_titles[platform_id] = {}
+
+                for title, info in titles.items():
+                    if title in all_titles[platform_id]:
+                        all_titles[platform_id][title]["ranks"].extend(info["ranks"])
+                    else:
+                        all_titles[platform_id][title] = info.copy()
+
+        if not all_titles:
+            raise DataNotFoundError(
+                f"{date_folder} 没有有效的数据",
+                suggestion="请检查数据文件格式或重新运行爬虫"
+            )
+
+        all_timestamps = {f"{time_info}.txt": ts for time_info, ts in crawled_at.items()}
+        return all_titles, id_to_name, all_timestamps
+
     def parse_yaml_config(self, config_path: str = None) -> dict:
         """
         解析YAML配置文件
@@ -312,7 +312,7 @@ class AnalyticsTools:
 
             while current_date <= end_date:
                 try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
+                    records = self.data_service.parser.iter_titles_for_date(
                         date=current_date
                     )
 
@@ -320,11 +320,10 @@ class AnalyticsTools:
                     count = 0
                     matched_titles = []
 
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-                                matched_titles.append(title)
+                    for record in records:
+                        if topic.lower() in record.title.lower():
+                            count += 1
+                            matched_titles.append(record.title)
 
                     trend_data.append({
                         "date": current_date.strftime("%Y-%m-%d"),
@@ -452,24 +451,24 @@ class AnalyticsTools:
             current_date = start_date
             while current_date <= end_date:
                 try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
+                    records = self.data_service.parser.iter_titles_for_date(
+                        date=current_date, fields=["platform_name"]
                     )
 
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
+                    for record in records:
+                        platform_name = record.platform_name
+                        title = record.title
 
-                        for title in titles.keys():
-                            platform_stats[platform_name]["total_news"] += 1
-                            platform_stats[platform_name]["unique_titles"].add(title)
+                        platform_stats[platform_name]["total_news"] += 1
+                        platform_stats[platform_name]["unique_titles"].add(title)
 
-                            # 如果指定了话题，统计包含话题的新闻
-                            if topic and topic.lower() in title.lower():
-                                platform_stats[platform_name]["topic_mentions"] += 1
+                        # 如果指定了话题，统计包含话题的新闻
+                        if topic and topic.lower() in title.lower():
+                            platform_stats[platform_name]["topic_mentions"] += 1
 
-                            # 提取关键词（简单分词）
-                            keywords = self._extract_keywords(title)
-                            platform_stats[platform_name]["top_keywords"].update(keywords)
+                        # 提取关键词（简单分词）
+                        keywords = self._extract_keywords(title)
+                        platform_stats[platform_name]["top_keywords"].update(keywords)
 
                 except DataNotFoundError:
                     pass
@@ -1210,24 +1209,21 @@ class AnalyticsTools:
             current_date = start_date
             while current_date <= end_date:
                 try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
+                    records = self.data_service.parser.iter_titles_for_date(
+                        date=current_date, fields=["platform_name"]
                     )
 
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-                        all_platforms_news[platform_name] += len(titles)
-
-                        for title in titles.keys():
-                            all_titles_list.append({
-                                "title": title,
-                                "platform": platform_name,
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
+                    for record in records:
+                        all_platforms_news[record.platform_name] += 1
+                        all_titles_list.append({
+                            "title": record.title,
+                            "platform": record.platform_name,
+                            "date": current_date.strftime("%Y-%m-%d")
+                        })
 
-                            # 提取关键词
-                            keywords = self._extract_keywords(title)
-                            all_keywords.update(keywords)
+                        # 提取关键词
+                        keywords = self._extract_keywords(record.title)
+                        all_keywords.update(keywords)
 
                 except DataNotFoundError:
                     pass
@@ -1512,16 +1508,15 @@ class AnalyticsTools:
             current_date = start_date
             while current_date <= end_date:
                 try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
+                    records = self.data_service.parser.iter_titles_for_date(
                         date=current_date
                     )
 
                     # 统计该日的话题出现次数
                     count = 0
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
+                    for record in records:
+                        if topic.lower() in record.title.lower():
+                            count += 1
 
                     lifecycle_data.append({
                         "date": current_date.strftime("%Y-%m-%d"),
@@ -578,48 +578,50 @@ class SearchTools:
 
             while current_date <= search_end:
                 try:
-                    # 读取该日期的数据
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(current_date)
+                    # 逐条读取该日期的数据（不缓存整天数据，只读取用到的字段）
+                    fields = ["platform_name", "rank"]
+                    if include_url:
+                        fields += ["url", "mobile_url"]
+                    records = self.data_service.parser.iter_titles_for_date(current_date, fields=fields)
 
                     # 搜索相关新闻
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-
-                        for title, info in titles.items():
-                            # 计算标题相似度
-                            title_similarity = self._calculate_similarity(reference_text, title)
-
-                            # 提取标题关键词
-                            title_keywords = self._extract_keywords(title)
-
-                            # 计算关键词重合度
-                            keyword_overlap = self._calculate_keyword_overlap(
-                                reference_keywords,
-                                title_keywords
-                            )
-
-                            # 综合相似度 (70% 关键词重合 + 30% 文本相似度)
-                            combined_score = keyword_overlap * 0.7 + title_similarity * 0.3
-
-                            if combined_score >= threshold:
-                                news_item = {
-                                    "title": title,
-                                    "platform": platform_id,
-                                    "platform_name": platform_name,
-                                    "date": current_date.strftime("%Y-%m-%d"),
-                                    "similarity_score": round(combined_score, 4),
-                                    "keyword_overlap": round(keyword_overlap, 4),
-                                    "text_similarity": round(title_similarity, 4),
-                                    "common_keywords": list(set(reference_keywords) & set(title_keywords)),
-                                    "rank": info["ranks"][0] if info["ranks"] else 0
-                                }
-
-                                # 条件性添加 URL 字段
-                                if include_url:
-                                    news_item["url"] = info.get("url", "")
-                                    news_item["mobileUrl"] = info.get("mobileUrl", "")
-
-                                all_related_news.append(news_item)
+                    for record in records:
+                        title = record.title
+
+                        # 计算标题相似度
+                        title_similarity = self._calculate_similarity(reference_text, title)
+
+                        # 提取标题关键词
+                        title_keywords = self._extract_keywords(title)
+
+                        # 计算关键词重合度
+                        keyword_overlap = self._calculate_keyword_overlap(
+                            reference_keywords,
+                            title_keywords
+                        )
+
+                        # 综合相似度 (70% 关键词重合 + 30% 文本相似度)
+                        combined_score = keyword_overlap * 0.7 + title_similarity * 0.3
+
+                        if combined_score >= threshold:
+                            news_item = {
+                                "title": title,
+                                "platform": record.platform_id,
+                                "platform_name": record.platform_name,
+                                "date": current_date.strftime("%Y-%m-%d"),
+                                "similarity_score": round(combined_score, 4),
+                                "keyword_overlap": round(keyword_overlap, 4),
+                                "text_similarity": round(title_similarity, 4),
+                                "common_keywords": list(set(reference_keywords) & set(title_keywords)),
+                                "rank": record.rank or 0
+                            }
+
+                            # 条件性添加 URL 字段
+                            if include_url:
+                                news_item["url"] = record.url
+                                news_item["mobileUrl"] = record.mobile_url
+
+                            all_related_news.append(news_item)
 
                 except DataNotFoundError:
                     # 该日期没有数据，继续下一天
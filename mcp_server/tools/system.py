@@ -1,12 +1,27 @@
 """
 系统管理工具
 
-实现系统状态查询和爬虫触发功能。
+实现系统状态查询、爬虫触发和后台爬取任务管理功能。
 """
 
+import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import yaml
+
+from trendradar.binary_snapshot import BinarySnapshotStore
+from trendradar.circuit_breaker import CircuitBreaker
+from trendradar.coalescer import FetchCoalescer
+from trendradar.crawler import DEFAULT_API_URL, DEFAULT_REQUEST_INTERVAL, CrawlEngine
+from trendradar.proxy_pool import ProxyPool
+from trendradar.snapshot import write_titles_file
+from trendradar.sqlite_store import SQLiteNewsStore
+from trendradar.telemetry import CrawlTelemetry
+from trendradar.utils import ensure_directory_exists, get_beijing_time
+
+from ..services.crawl_task_service import get_crawl_task_service
 from ..services.data_service import DataService
 from ..utils.validators import validate_platforms
 from ..utils.errors import MCPError, CrawlTaskError
@@ -23,6 +38,11 @@ class SystemManagementTools:
             project_root: 项目根目录
         """
         self.data_service = DataService(project_root)
+        self.task_service = get_crawl_task_service()
+        # 所有临时爬取共享，重复触发的同一平台只请求一次上游
+        self.fetch_coalescer = FetchCoalescer()
+        # 代理池在各次临时爬取间共享，代理列表变化时重建
+        self.proxy_pool: Optional[ProxyPool] = None
         if project_root:
             self.project_root = Path(project_root)
         else:
@@ -65,298 +85,181 @@ class SystemManagementTools:
                 }
             }
 
-    def trigger_crawl(self, platforms: Optional[List[str]] = None, save_to_local: bool = False, include_url: bool = False) -> Dict:
+    def _prepare_crawl(self, platforms: Optional[List[str]]) -> Tuple[CrawlEngine, List]:
         """
-        手动触发一次临时爬取任务（可选持久化）
+        读取配置并构建爬取引擎和平台ID列表
 
         Args:
             platforms: 指定平台列表，为空则爬取所有平台
-            save_to_local: 是否保存到本地 output 目录，默认 False
-            include_url: 是否包含URL链接，默认False（节省token）
 
         Returns:
-            爬取结果字典，包含新闻数据和保存路径（如果保存）
+            (engine, ids) 元组
 
-        Example:
-            >>> tools = SystemManagementTools()
-            >>> # 临时爬取，不保存
-            >>> result = tools.trigger_crawl(platforms=['zhihu', 'weibo'])
-            >>> print(result['data'])
-            >>> # 爬取并保存到本地
-            >>> result = tools.trigger_crawl(platforms=['zhihu'], save_to_local=True)
-            >>> print(result['saved_files'])
+        Raises:
+            CrawlTaskError: 配置缺失或平台不存在
         """
-        try:
-            import json
-            import time
-            import random
-            import requests
-            from datetime import datetime
-            import pytz
-            import yaml
-
-            # 参数验证
-            platforms = validate_platforms(platforms)
-
-            # 加载配置文件
-            config_path = self.project_root / "config" / "config.yaml"
-            if not config_path.exists():
+        # 加载配置文件
+        config_path = self.project_root / "config" / "config.yaml"
+        if not config_path.exists():
+            raise CrawlTaskError(
+                "配置文件不存在",
+                suggestion=f"请确保配置文件存在: {config_path}"
+            )
+
+        # 读取配置
+        with open(config_path, "r", encoding="utf-8") as f:
+            config_data = yaml.safe_load(f)
+
+        # 获取平台配置
+        all_platforms = config_data.get("platforms", [])
+        if not all_platforms:
+            raise CrawlTaskError(
+                "配置文件中没有平台配置",
+                suggestion="请检查 config/config.yaml 中的 platforms 配置"
+            )
+
+        # 参数验证（按本次读取的配置，而不是固定的项目 config.yaml）
+        platforms = validate_platforms(platforms, [p["id"] for p in all_platforms if "id" in p])
+
+        # 过滤平台
+        if platforms:
+            target_platforms = [p for p in all_platforms if p["id"] in platforms]
+            if not target_platforms:
                 raise CrawlTaskError(
-                    "配置文件不存在",
-                    suggestion=f"请确保配置文件存在: {config_path}"
+                    f"指定的平台不存在: {platforms}",
+                    suggestion=f"可用平台: {[p['id'] for p in all_platforms]}"
                 )
+        else:
+            target_platforms = all_platforms
 
-            # 读取配置
-            with open(config_path, "r", encoding="utf-8") as f:
-                config_data = yaml.safe_load(f)
+        # 构建平台ID列表
+        ids = []
+        for platform in target_platforms:
+            if "name" in platform:
+                ids.append((platform["id"], platform["name"]))
+            else:
+                ids.append(platform["id"])
+
+        crawler_config = config_data.get("crawler", {})
+        proxy_url = crawler_config.get("default_proxy") if crawler_config.get("use_proxy") else None
+        api_url = os.environ.get("CRAWLER_API_URL", "").strip() or crawler_config.get("api_url") or DEFAULT_API_URL
+
+        # 与定时任务共享熔断状态，跳过已知不可用的平台
+        breaker_config = crawler_config.get("circuit_breaker", {})
+        circuit_breaker = None
+        if breaker_config.get("enabled", False):
+            circuit_breaker = CircuitBreaker(
+                state_dir=self.project_root / "output" / ".crawl_cache",
+                failure_threshold=breaker_config.get("failure_threshold", 3),
+                cooldown=breaker_config.get("cooldown", 1800),
+            )
+
+        pool_config = crawler_config.get("proxy_pool", {})
+        proxies = pool_config.get("proxies") or []
+        proxy_pool = None
+        if proxy_url and proxies:
+            if self.proxy_pool is None or self.proxy_pool.proxies != list(dict.fromkeys(proxies)):
+                self.proxy_pool = ProxyPool(
+                    proxies,
+                    state_dir=self.project_root / "output" / ".crawl_cache",
+                    max_error_rate=pool_config.get("max_error_rate", 0.5),
+                    eviction_cooldown=pool_config.get("eviction_cooldown", 300),
+                )
+            proxy_pool = self.proxy_pool
+
+        # 进行中的同平台请求直接共享，已完成的结果在窗口期内复用
+        self.fetch_coalescer.freshness_window = crawler_config.get("coalesce_window", 60)
+
+        # 临时爬取同样写入爬取遥测；Prometheus textfile 只反映定时任务的完整运行，这里不覆盖
+        telemetry = None
+        if crawler_config.get("telemetry", {}).get("enabled", False):
+            telemetry = CrawlTelemetry(output_dir=self.project_root / "output" / ".telemetry")
+
+        # 不使用指纹缓存：临时爬取若更新指纹，会让定时任务误判内容未变化而跳过保存
+        engine = CrawlEngine(
+            proxy_url=proxy_url,
+            max_workers=crawler_config.get("max_workers", 4) if crawler_config.get("concurrent_crawl", False) else 1,
+            host_max_concurrency=crawler_config.get("host_max_concurrency", 4),
+            host_min_interval=crawler_config.get("host_min_interval", 100),
+            request_interval=crawler_config.get("request_interval", DEFAULT_REQUEST_INTERVAL),
+            api_url=api_url,
+            circuit_breaker=circuit_breaker,
+            crawl_deadline=crawler_config.get("crawl_deadline", 0),
+            telemetry=telemetry,
+            coalescer=self.fetch_coalescer,
+            proxy_pool=proxy_pool,
+        )
 
-            # 获取平台配置
-            all_platforms = config_data.get("platforms", [])
-            if not all_platforms:
-                raise CrawlTaskError(
-                    "配置文件中没有平台配置",
-                    suggestion="请检查 config/config.yaml 中的 platforms 配置"
+        print(f"开始临时爬取，平台: {[p.get('name', p['id']) for p in target_platforms]}")
+        return engine, ids
+
+    def start_crawl_task(self, platforms: Optional[List[str]] = None, save_to_local: bool = False, include_url: bool = False) -> Dict:
+        """
+        在后台启动爬取任务并立即返回任务ID，不阻塞 MCP Server
+
+        Args:
+            platforms: 指定平台列表，为空则爬取所有平台
+            save_to_local: 是否保存到本地 output 目录，默认 False（任务被取消时不保存）
+            include_url: 是否包含URL链接，默认False（节省token）
+
+        Returns:
+            任务信息字典，包含 task_id，可通过 get_crawl_task_status 查询进度和结果
+        """
+        try:
+            engine, ids = self._prepare_crawl(platforms)
+
+            def finalize(task, results: Dict, id_to_name: Dict, failed_ids: List) -> Dict:
+                return self._build_crawl_result(
+                    results, id_to_name, failed_ids,
+                    save_to_local and not task.cancel_requested, include_url,
+                    task_id=task.task_id,
+                    status="cancelled" if task.cancel_requested else "completed"
                 )
 
-            # 过滤平台
-            if platforms:
-                target_platforms = [p for p in all_platforms if p["id"] in platforms]
-                if not target_platforms:
-                    raise CrawlTaskError(
-                        f"指定的平台不存在: {platforms}",
-                        suggestion=f"可用平台: {[p['id'] for p in all_platforms]}"
-                    )
-            else:
-                target_platforms = all_platforms
-
-            # 获取请求间隔
-            request_interval = config_data.get("crawler", {}).get("request_interval", 100)
-
-            # 构建平台ID列表
-            ids = []
-            for platform in target_platforms:
-                if "name" in platform:
-                    ids.append((platform["id"], platform["name"]))
-                else:
-                    ids.append(platform["id"])
-
-            print(f"开始临时爬取，平台: {[p.get('name', p['id']) for p in target_platforms]}")
-
-            # 爬取数据
-            results = {}
-            id_to_name = {}
-            failed_ids = []
-
-            for i, id_info in enumerate(ids):
-                if isinstance(id_info, tuple):
-                    id_value, name = id_info
-                else:
-                    id_value = id_info
-                    name = id_value
-
-                id_to_name[id_value] = name
-
-                # 构建请求URL
-                url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
-
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Accept": "application/json, text/plain, */*",
-                    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "Connection": "keep-alive",
-                    "Cache-Control": "no-cache",
-                }
+            task = self.task_service.submit(engine, ids, finalize)
 
-                # 重试机制
-                max_retries = 2
-                retries = 0
-                success = False
-
-                while retries <= max_retries and not success:
-                    try:
-                        response = requests.get(url, headers=headers, timeout=10)
-                        response.raise_for_status()
-
-                        data_text = response.text
-                        data_json = json.loads(data_text)
-
-                        status = data_json.get("status", "未知")
-                        if status not in ["success", "cache"]:
-                            raise ValueError(f"响应状态异常: {status}")
-
-                        status_info = "最新数据" if status == "success" else "缓存数据"
-                        print(f"获取 {id_value} 成功（{status_info}）")
-
-                        # 解析数据
-                        results[id_value] = {}
-                        for index, item in enumerate(data_json.get("items", []), 1):
-                            title = item["title"]
-                            url_link = item.get("url", "")
-                            mobile_url = item.get("mobileUrl", "")
-
-                            if title in results[id_value]:
-                                results[id_value][title]["ranks"].append(index)
-                            else:
-                                results[id_value][title] = {
-                                    "ranks": [index],
-                                    "url": url_link,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                        success = True
-
-                    except Exception as e:
-                        retries += 1
-                        if retries <= max_retries:
-                            wait_time = random.uniform(3, 5)
-                            print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
-                            time.sleep(wait_time)
-                        else:
-                            print(f"请求 {id_value} 失败: {e}")
-                            failed_ids.append(id_value)
-
-                # 请求间隔
-                if i < len(ids) - 1:
-                    actual_interval = request_interval + random.randint(-10, 20)
-                    actual_interval = max(50, actual_interval)
-                    time.sleep(actual_interval / 1000)
-
-            # 格式化返回数据
-            news_data = []
-            for platform_id, titles_data in results.items():
-                platform_name = id_to_name.get(platform_id, platform_id)
-                for title, info in titles_data.items():
-                    news_item = {
-                        "platform_id": platform_id,
-                        "platform_name": platform_name,
-                        "title": title,
-                        "ranks": info["ranks"]
-                    }
-
-                    # 条件性添加 URL 字段
-                    if include_url:
-                        news_item["url"] = info.get("url", "")
-                        news_item["mobile_url"] = info.get("mobileUrl", "")
-
-                    news_data.append(news_item)
-
-            # 获取北京时间
-            beijing_tz = pytz.timezone("Asia/Shanghai")
-            now = datetime.now(beijing_tz)
-
-            # 构建返回结果
-            result = {
+            return {
                 "success": True,
-                "task_id": f"crawl_{int(time.time())}",
-                "status": "completed",
-                "crawl_time": now.strftime("%Y-%m-%d %H:%M:%S"),
-                "platforms": list(results.keys()),
-                "total_news": len(news_data),
-                "failed_platforms": failed_ids,
-                "data": news_data,
-                "saved_to_local": save_to_local
+                "task_id": task.task_id,
+                "status": task.status,
+                "platforms": [p[0] if isinstance(p, tuple) else p for p in ids],
+                "save_to_local": save_to_local,
+                "note": "爬取已在后台开始，使用 get_crawl_task_status 查询进度和结果，使用 cancel_crawl_task 取消"
             }
 
-            # 如果需要持久化，调用保存逻辑
-            if save_to_local:
-                try:
-                    import re
-
-                    # 辅助函数：清理标题
-                    def clean_title(title: str) -> str:
-                        """清理标题中的特殊字符"""
-                        if not isinstance(title, str):
-                            title = str(title)
-                        cleaned_title = title.replace("\n", " ").replace("\r", " ")
-                        cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-                        cleaned_title = cleaned_title.strip()
-                        return cleaned_title
-
-                    # 辅助函数：创建目录
-                    def ensure_directory_exists(directory: str):
-                        """确保目录存在"""
-                        Path(directory).mkdir(parents=True, exist_ok=True)
-
-                    # 格式化日期和时间
-                    date_folder = now.strftime("%Y年%m月%d日")
-                    time_filename = now.strftime("%H时%M分")
-
-                    # 创建 txt 文件路径
-                    txt_dir = self.project_root / "output" / date_folder / "txt"
-                    ensure_directory_exists(str(txt_dir))
-                    txt_file_path = txt_dir / f"{time_filename}.txt"
-
-                    # 创建 html 文件路径
-                    html_dir = self.project_root / "output" / date_folder / "html"
-                    ensure_directory_exists(str(html_dir))
-                    html_file_path = html_dir / f"{time_filename}.html"
-
-                    # 保存 txt 文件（按照 main.py 的格式）
-                    with open(txt_file_path, "w", encoding="utf-8") as f:
-                        for id_value, title_data in results.items():
-                            # id | name 或 id
-                            name = id_to_name.get(id_value)
-                            if name and name != id_value:
-                                f.write(f"{id_value} | {name}\n")
-                            else:
-                                f.write(f"{id_value}\n")
-
-                            # 按排名排序标题
-                            sorted_titles = []
-                            for title, info in title_data.items():
-                                cleaned = clean_title(title)
-                                if isinstance(info, dict):
-                                    ranks = info.get("ranks", [])
-                                    url = info.get("url", "")
-                                    mobile_url = info.get("mobileUrl", "")
-                                else:
-                                    ranks = info if isinstance(info, list) else []
-                                    url = ""
-                                    mobile_url = ""
-
-                                rank = ranks[0] if ranks else 1
-                                sorted_titles.append((rank, cleaned, url, mobile_url))
-
-                            sorted_titles.sort(key=lambda x: x[0])
-
-                            for rank, cleaned, url, mobile_url in sorted_titles:
-                                line = f"{rank}. {cleaned}"
-                                if url:
-                                    line += f" [URL:{url}]"
-                                if mobile_url:
-                                    line += f" [MOBILE:{mobile_url}]"
-                                f.write(line + "\n")
-
-                            f.write("\n")
-
-                        if failed_ids:
-                            f.write("==== 以下ID请求失败 ====\n")
-                            for id_value in failed_ids:
-                                f.write(f"{id_value}\n")
-
-                    # 保存 html 文件（简化版）
-                    html_content = self._generate_simple_html(results, id_to_name, failed_ids, now)
-                    with open(html_file_path, "w", encoding="utf-8") as f:
-                        f.write(html_content)
-
-                    print(f"数据已保存到:")
-                    print(f"  TXT: {txt_file_path}")
-                    print(f"  HTML: {html_file_path}")
-
-                    result["saved_files"] = {
-                        "txt": str(txt_file_path),
-                        "html": str(html_file_path)
-                    }
-                    result["note"] = "数据已持久化到 output 文件夹"
-
-                except Exception as e:
-                    print(f"保存文件失败: {e}")
-                    result["save_error"] = str(e)
-                    result["note"] = "爬取成功但保存失败，数据仅在内存中"
-            else:
-                result["note"] = "临时爬取结果，未持久化到output文件夹"
+        except MCPError as e:
+            return {
+                "success": False,
+                "error": e.to_dict()
+            }
+        except Exception as e:
+            return self._internal_error(e)
 
-            return result
+    def get_crawl_task_status(self, task_id: Optional[str] = None, include_data: bool = True) -> Dict:
+        """
+        查询后台爬取任务的进度和逐平台结果
+
+        Args:
+            task_id: 任务ID，为空时列出最近的任务
+            include_data: 任务结束后是否返回完整新闻数据，默认 True
+
+        Returns:
+            任务状态字典
+        """
+        try:
+            if not task_id:
+                tasks = self.task_service.list_tasks()
+                return {
+                    "success": True,
+                    "tasks": [task.to_dict(include_result=False) for task in tasks],
+                    "total": len(tasks)
+                }
+
+            task = self.task_service.get(task_id)
+            return {
+                **task.to_dict(include_result=include_data),
+                "success": True
+            }
 
         except MCPError as e:
             return {
@@ -364,15 +267,166 @@ class SystemManagementTools:
                 "error": e.to_dict()
             }
         except Exception as e:
-            import traceback
+            return self._internal_error(e)
+
+    def cancel_crawl_task(self, task_id: str) -> Dict:
+        """
+        取消后台爬取任务，已完成的平台结果会保留
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            取消后的任务状态
+        """
+        try:
+            task = self.task_service.cancel(task_id)
+            if task.cancel_requested and not task.is_finished:
+                note = "已请求取消，正在进行的请求结束后任务状态变为 cancelled"
+            elif task.is_finished:
+                note = "任务已结束，无需取消"
+            else:
+                note = "爬取已结束，正在整理结果，无法取消"
+            return {
+                **task.to_dict(include_result=False),
+                "success": True,
+                "note": note
+            }
+
+        except MCPError as e:
             return {
                 "success": False,
-                "error": {
-                    "code": "INTERNAL_ERROR",
-                    "message": str(e),
-                    "traceback": traceback.format_exc()
-                }
+                "error": e.to_dict()
+            }
+        except Exception as e:
+            return self._internal_error(e)
+
+    def _internal_error(self, e: Exception) -> Dict:
+        """构建内部错误响应"""
+        import traceback
+        return {
+            "success": False,
+            "error": {
+                "code": "INTERNAL_ERROR",
+                "message": str(e),
+                "traceback": traceback.format_exc()
             }
+        }
+
+    def _build_crawl_result(
+        self,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        save_to_local: bool,
+        include_url: bool,
+        task_id: Optional[str] = None,
+        status: str = "completed"
+    ) -> Dict:
+        """格式化爬取结果，需要时持久化到 output 目录"""
+        # 格式化返回数据
+        news_data = []
+        for platform_id, titles_data in results.items():
+            platform_name = id_to_name.get(platform_id, platform_id)
+            for title, info in titles_data.items():
+                news_item = {
+                    "platform_id": platform_id,
+                    "platform_name": platform_name,
+                    "title": title,
+                    "ranks": info["ranks"]
+                }
+
+                # 条件性添加 URL 字段
+                if include_url:
+                    news_item["url"] = info.get("url", "")
+                    news_item["mobile_url"] = info.get("mobileUrl", "")
+
+                news_data.append(news_item)
+
+        # 获取北京时间
+        now = get_beijing_time()
+
+        # 构建返回结果
+        result = {
+            "success": True,
+            "task_id": task_id or f"crawl_{int(time.time())}",
+            "status": status,
+            "crawl_time": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "platforms": list(results.keys()),
+            "total_news": len(news_data),
+            "failed_platforms": failed_ids,
+            "data": news_data,
+            "saved_to_local": save_to_local
+        }
+
+        # 如果需要持久化，调用保存逻辑
+        if save_to_local:
+            try:
+                # 格式化日期和时间
+                date_folder = now.strftime("%Y年%m月%d日")
+                time_filename = now.strftime("%H时%M分")
+
+                # 创建 txt 文件路径
+                txt_dir = self.project_root / "output" / date_folder / "txt"
+                ensure_directory_exists(str(txt_dir))
+                txt_file_path = txt_dir / f"{time_filename}.txt"
+
+                # 创建 html 文件路径
+                html_dir = self.project_root / "output" / date_folder / "html"
+                ensure_directory_exists(str(html_dir))
+                html_file_path = html_dir / f"{time_filename}.html"
+
+                # 保存 txt 文件（与 main.py 格式一致）
+                write_titles_file(str(txt_file_path), results, id_to_name, failed_ids)
+                self.data_service.parser.day_manifest.record(date_folder, time_filename, results)
+
+                # 使用 SQLite 存储或快照日志时同时写入，供查询工具读取
+                news_store = self.data_service.parser.get_news_store()
+                if news_store is not None:
+                    saved_path = news_store.save_snapshot(
+                        date_folder, time_filename, results, id_to_name, failed_ids
+                    )
+                    if isinstance(news_store, SQLiteNewsStore):
+                        store_location = str(news_store.db_path)
+                        print(f"  SQLite: {store_location}")
+                    elif isinstance(news_store, BinarySnapshotStore):
+                        store_location = str(saved_path)
+                        print(f"  BIN: {store_location}")
+                    else:
+                        store_location = str(self.project_root / "output" / date_folder / "snapshots.log")
+                        print(f"  LOG: {store_location}")
+
+                # 保存 html 文件（简化版）
+                html_content = self._generate_simple_html(results, id_to_name, failed_ids, now)
+                with open(html_file_path, "w", encoding="utf-8") as f:
+                    f.write(html_content)
+
+                print(f"数据已保存到:")
+                print(f"  TXT: {txt_file_path}")
+                print(f"  HTML: {html_file_path}")
+
+                result["saved_files"] = {
+                    "txt": str(txt_file_path),
+                    "html": str(html_file_path)
+                }
+                if news_store is not None:
+                    if isinstance(news_store, SQLiteNewsStore):
+                        store_key = "sqlite"
+                    elif isinstance(news_store, BinarySnapshotStore):
+                        store_key = "binary"
+                    else:
+                        store_key = "log"
+                    result["saved_files"][store_key] = store_location
+                result["note"] = "数据已持久化到 output 文件夹"
+
+            except Exception as e:
+                print(f"保存文件失败: {e}")
+                result["save_error"] = str(e)
+                result["note"] = "爬取成功但保存失败，数据仅在内存中"
+        else:
+            result["note"] = "临时爬取结果，未持久化到output文件夹"
+
+        return result
 
     def _generate_simple_html(self, results: Dict, id_to_name: Dict, failed_ids: List, now) -> str:
         """生成简化的 HTML 报告"""
@@ -40,12 +40,15 @@ def get_supported_platforms() -> List[str]:
         return []
 
 
-def validate_platforms(platforms: Optional[List[str]]) -> List[str]:
+def validate_platforms(
+    platforms: Optional[List[str]], supported_platforms: Optional[List[str]] = None
+) -> List[str]:
     """
     验证平台列表
 
     Args:
         platforms: 平台ID列表，None表示使用 config.yaml 中配置的所有平台
+        supported_platforms: 支持的平台ID列表，None 表示读取项目 config.yaml
 
     Returns:
         验证后的平台列表
@@ -58,7 +61,8 @@ def validate_platforms(platforms: Optional[List[str]]) -> List[str]:
         - 会验证平台ID是否在 config.yaml 的 platforms 配置中
         - 配置加载失败时，允许所有平台通过（降级策略）
     """
-    supported_platforms = get_supported_platforms()
+    if supported_platforms is None:
+        supported_platforms = get_supported_platforms()
 
     if platforms is None:
         # 返回配置文件中的平台列表（用户的默认配置）
@@ -0,0 +1,36 @@
+"""
+测试共用的快照数据生成
+"""
+
+import pytest
+
+
+def generate_snapshots(rng, times, platforms=("baidu", "weibo", "zhihu"), vocabulary=30, size=10):
+    """
+    生成快照序列 [(时间, titles_by_id)]
+
+    每个平台从 vocabulary 个标题中随机抽取 size 个（词表较小时相邻快照大量重复），
+    约五分之一的概率请求失败，快照中缺失该平台
+    """
+    snapshots = []
+    for time_info in times:
+        titles_by_id = {}
+        for source_id in platforms:
+            if rng.random() < 0.2:
+                continue
+            titles = rng.sample(range(vocabulary), size)
+            titles_by_id[source_id] = {
+                f"{source_id} 标题 {number}": {
+                    "ranks": [rank],
+                    "url": f"https://example.com/{source_id}/{number}",
+                    "mobileUrl": "",
+                }
+                for rank, number in enumerate(titles, 1)
+            }
+        snapshots.append((time_info, titles_by_id))
+    return snapshots
+
+
+@pytest.fixture
+def make_snapshots():
+    return generate_snapshots
@@ -0,0 +1,179 @@
+"""
+平台熔断器：连续失败达到阈值后熔断，冷却期结束后放行一次试探，试探成功解除、失败重新熔断；
+状态持久化后跨运行生效
+"""
+
+import json
+import random
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import trendradar.circuit_breaker as circuit_breaker
+from trendradar.circuit_breaker import CircuitBreaker
+from trendradar.crawler import CrawlEngine
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+def test_opens_after_consecutive_failures(tmp_path, clock):
+    breaker = CircuitBreaker(tmp_path, failure_threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure("weibo")
+        assert not breaker.is_open("weibo")
+    breaker.record_failure("weibo")
+
+    assert breaker.is_open("weibo")
+    assert breaker.remaining_cooldown("weibo") == 60
+    assert not breaker.is_open("baidu")
+    clock.advance(45)
+    assert breaker.remaining_cooldown("weibo") == 15
+
+
+def test_success_resets_failure_count(tmp_path, clock):
+    breaker = CircuitBreaker(tmp_path, failure_threshold=3, cooldown=60)
+    breaker.record_failure("weibo")
+    breaker.record_failure("weibo")
+    breaker.record_success("weibo")
+    breaker.record_failure("weibo")
+    breaker.record_failure("weibo")
+
+    # 失败不连续，未达到阈值
+    assert not breaker.is_open("weibo")
+
+
+def test_half_open_probe_closes_on_success(tmp_path, clock):
+    breaker = CircuitBreaker(tmp_path, failure_threshold=2, cooldown=60)
+    breaker.record_failure("weibo")
+    breaker.record_failure("weibo")
+    assert breaker.is_open("weibo")
+
+    # 冷却期结束后放行试探请求，试探成功后解除熔断
+    clock.advance(60)
+    assert not breaker.is_open("weibo")
+    breaker.record_success("weibo")
+    assert "weibo" not in breaker.states
+
+    # 解除后重新从零计数
+    breaker.record_failure("weibo")
+    assert not breaker.is_open("weibo")
+
+
+def test_half_open_probe_failure_reopens(tmp_path, clock):
+    breaker = CircuitBreaker(tmp_path, failure_threshold=2, cooldown=60)
+    breaker.record_failure("weibo")
+    breaker.record_failure("weibo")
+
+    clock.advance(61)
+    assert not breaker.is_open("weibo")
+    # 试探失败立即重新熔断，冷却期从此刻重新计算
+    breaker.record_failure("weibo")
+    assert breaker.is_open("weibo")
+    assert breaker.remaining_cooldown("weibo") == 60
+
+
+def test_state_persists_across_instances(tmp_path, clock):
+    breaker = CircuitBreaker(tmp_path, failure_threshold=2, cooldown=60)
+    breaker.record_failure("weibo")
+    breaker.record_failure("weibo")
+    breaker.record_failure("baidu")
+    breaker.save()
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # 下一次运行读取已保存的状态
+    clock.advance(30)
+    next_run = CircuitBreaker(tmp_path, failure_threshold=2, cooldown=60)
+    assert next_run.is_open("weibo")
+    assert next_run.remaining_cooldown("weibo") == 30
+    assert not next_run.is_open("baidu")
+    # 未熔断平台的失败次数同样跨运行累计
+    next_run.record_failure("baidu")
+    assert next_run.is_open("baidu")
+
+    clock.advance(30)
+    next_run.record_success("weibo")
+    next_run.save()
+    with open(tmp_path / "circuit_breaker.json", "r", encoding="utf-8") as f:
+        assert set(json.load(f)) == {"baidu"}
+
+
+def test_corrupt_state_file_is_ignored(tmp_path, clock):
+    (tmp_path / "circuit_breaker.json").write_text("{", encoding="utf-8")
+    breaker = CircuitBreaker(tmp_path, failure_threshold=1, cooldown=60)
+    assert breaker.states == {}
+    breaker.record_failure("weibo")
+    breaker.save()
+    assert CircuitBreaker(tmp_path, failure_threshold=1, cooldown=60).is_open("weibo")
+
+
+class StubResponse:
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class StubClient:
+    """failing 中的平台返回 502，其余返回固定标题；记录请求过的平台"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.requested = []
+
+    def get(self, url, proxy_url=None, headers=None, timeout=None):
+        id_value = parse_qs(urlparse(url).query)["id"][0]
+        self.requested.append(id_value)
+        if id_value in self.failing:
+            return StubResponse(b"", 502)
+        items = [{"title": f"{id_value} 标题", "url": ""}]
+        return StubResponse(json.dumps({"status": "success", "items": items}).encode("utf-8"))
+
+
+def test_engine_skips_open_platforms_across_runs(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda a, b: 0)
+
+    def run(failing):
+        client = StubClient(failing)
+        engine = CrawlEngine(
+            http_client=client,
+            request_interval=0,
+            circuit_breaker=CircuitBreaker(tmp_path, failure_threshold=2, cooldown=60),
+        )
+        results, _, failed_ids = engine.crawl(["baidu", "weibo"])
+        return engine, client, results, failed_ids
+
+    # 连续两次运行失败后熔断
+    for _ in range(2):
+        run(failing=["weibo"])
+    engine, client, results, failed_ids = run(failing=[])
+    assert "weibo" not in client.requested
+    assert engine.skipped_ids == ["weibo"]
+    assert engine.platform_metrics["weibo"]["status"] == "skipped"
+    assert list(results) == ["baidu"] and failed_ids == ["weibo"]
+
+    # 跳过不计入失败次数，冷却期结束后试探成功即解除熔断
+    clock.advance(60)
+    engine, client, results, failed_ids = run(failing=[])
+    assert "weibo" in client.requested
+    assert sorted(results) == ["baidu", "weibo"] and failed_ids == []
+    assert CircuitBreaker(tmp_path).states == {}
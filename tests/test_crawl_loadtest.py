@@ -0,0 +1,39 @@
+"""
+爬取压测脚本冒烟测试：用少量模拟平台端到端跑完 main.py 和 MCP 两种爬取方式
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def test_loadtest_runs_end_to_end():
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "crawl_loadtest.py",
+            "--platforms", "3",
+            "--runs", "1",
+            "--workers", "1,2",
+            "--latency", "5",
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    rows = [
+        line.split(" | ")
+        for line in completed.stdout.splitlines()
+        if line.startswith(("fetcher |", "mcp |"))
+    ]
+    assert sorted((row[0], row[1]) for row in rows) == [
+        ("fetcher", "1"), ("fetcher", "2"), ("mcp", "1"), ("mcp", "2")
+    ]
+    # 模拟服务默认不注入错误，所有平台都应爬取成功
+    assert all(row[6] == "100.0%" for row in rows)
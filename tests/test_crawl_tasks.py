@@ -0,0 +1,255 @@
+"""
+后台爬取任务：提交后立即返回，查询进度直至结束；运行中可以取消，已结束或正在整理结果时不再取消
+"""
+
+import threading
+import time
+
+import pytest
+
+from mcp_server.services.crawl_task_service import CrawlTaskService
+from mcp_server.tools.system import SystemManagementTools
+from mcp_server.utils.errors import DataNotFoundError
+from trendradar.crawler import new_platform_metrics
+from trendradar.stub_server import StubNewsServer
+
+IDS = [("baidu", "百度"), ("weibo", "微博"), "zhihu"]
+
+
+class StubEngine:
+    """第一个平台完成后阻塞，直到测试放行或取消"""
+
+    def __init__(self, error=None, cancel_after_last_request=False):
+        self.error = error
+        # 取消请求到达时所有平台的请求都已发出，爬取照常完成
+        self.cancel_after_last_request = cancel_after_last_request
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.cancel_calls = 0
+        self.cancelled_ids = []
+        self._metrics = {}
+
+    def crawl(self, ids):
+        first = new_platform_metrics("baidu", "百度")
+        first.update(status="fresh", items=1)
+        self._metrics = {"baidu": first}
+        self.started.set()
+        assert self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        results = {"baidu": {"百度 标题": {"ranks": [1], "url": "", "mobileUrl": ""}}}
+        if self.cancel_calls and not self.cancel_after_last_request:
+            self.cancelled_ids = ["weibo", "zhihu"]
+            return results, {"baidu": "百度", "weibo": "微博", "zhihu": "zhihu"}, ["weibo", "zhihu"]
+        for id_value in ("weibo", "zhihu"):
+            metrics = new_platform_metrics(id_value, id_value)
+            metrics.update(status="fresh", items=1)
+            self._metrics[id_value] = metrics
+            results[id_value] = {f"{id_value} 标题": {"ranks": [1], "url": "", "mobileUrl": ""}}
+        return results, {"baidu": "百度", "weibo": "微博", "zhihu": "zhihu"}, []
+
+    def cancel(self):
+        self.cancel_calls += 1
+        self.release.set()
+
+    def snapshot_metrics(self):
+        return dict(self._metrics)
+
+
+def summarize(task, results, id_to_name, failed_ids):
+    return {"platforms": sorted(results), "failed": failed_ids, "cancel_requested": task.cancel_requested}
+
+
+def wait_finished(task, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not task.is_finished:
+        assert time.monotonic() < deadline, f"任务未在 {timeout} 秒内结束"
+        time.sleep(0.01)
+
+
+def test_task_progress_until_completed():
+    service = CrawlTaskService()
+    engine = StubEngine()
+    task = service.submit(engine, IDS, summarize)
+    assert engine.started.wait(5)
+
+    info = service.get(task.task_id).to_dict()
+    assert info["status"] == "running"
+    assert [p["status"] for p in info["platforms"]] == ["fresh", "queued", "queued"]
+    assert info["progress"] == {"total": 3, "finished": 1, "succeeded": 1, "failed": 0}
+    assert "result" not in info
+
+    engine.release.set()
+    wait_finished(task)
+    info = task.to_dict()
+    assert info["status"] == "completed"
+    assert info["progress"]["succeeded"] == 3
+    assert info["result"] == {"platforms": ["baidu", "weibo", "zhihu"], "failed": [], "cancel_requested": False}
+    assert "result" not in task.to_dict(include_result=False)
+    assert service.list_tasks() == [task]
+
+
+def test_cancel_running_task_keeps_finished_platforms():
+    service = CrawlTaskService()
+    engine = StubEngine()
+    task = service.submit(engine, IDS, summarize)
+    assert engine.started.wait(5)
+
+    assert service.cancel(task.task_id) is task
+    wait_finished(task)
+    assert engine.cancel_calls == 1
+    assert task.status == "cancelled"
+    assert task.result == {"platforms": ["baidu"], "failed": ["weibo", "zhihu"], "cancel_requested": True}
+
+
+def test_cancel_after_all_platforms_finished_is_not_a_cancellation():
+    service = CrawlTaskService()
+    engine = StubEngine(cancel_after_last_request=True)
+    task = service.submit(engine, IDS, summarize)
+    assert engine.started.wait(5)
+    assert task.cancel() is True
+    wait_finished(task)
+    assert task.status == "completed"
+    assert task.result["cancel_requested"] is False
+
+
+def test_cancel_refused_after_finish_and_while_finalizing():
+    service = CrawlTaskService()
+    finalizing = threading.Event()
+    release_finalize = threading.Event()
+
+    def slow_finalize(task, *args):
+        finalizing.set()
+        assert release_finalize.wait(5)
+        return summarize(task, *args)
+
+    engine = StubEngine()
+    task = service.submit(engine, IDS, slow_finalize)
+    engine.release.set()
+    assert finalizing.wait(5)
+    # 正在整理（保存）结果，不再取消
+    assert task.cancel() is False
+    assert engine.cancel_calls == 0
+
+    release_finalize.set()
+    wait_finished(task)
+    assert task.status == "completed"
+    assert task.cancel() is False
+    assert task.status == "completed" and not task.cancel_requested
+
+
+def test_failed_crawl_reports_error():
+    service = CrawlTaskService()
+    engine = StubEngine(error=RuntimeError("上游不可用"))
+    task = service.submit(engine, IDS, summarize)
+    engine.release.set()
+    wait_finished(task)
+    info = task.to_dict()
+    assert info["status"] == "failed"
+    assert info["error"] == "上游不可用"
+    assert task.cancel() is False
+
+
+def test_unknown_task_and_history_limit():
+    service = CrawlTaskService(max_history=2)
+    with pytest.raises(DataNotFoundError):
+        service.get("crawl_0")
+
+    running = StubEngine()
+    running_task = service.submit(running, IDS, summarize)
+    finished_tasks = []
+    for _ in range(3):
+        engine = StubEngine()
+        engine.release.set()
+        task = service.submit(engine, IDS, summarize)
+        wait_finished(task)
+        finished_tasks.append(task)
+
+    # 同一秒内提交的任务ID不重复，超出保留数量时只移除已结束的任务
+    assert len({task.task_id for task in [running_task, *finished_tasks]}) == 4
+    remaining = service.list_tasks()
+    assert running_task in remaining
+    assert len(remaining) == 2
+    running.release.set()
+    wait_finished(running_task)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """只包含平台配置的项目目录，爬取请求发往本地模拟服务"""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "config.yaml").write_text(
+        "crawler:\n"
+        "  request_interval: 0\n"
+        "platforms:\n"
+        "  - id: baidu\n    name: 百度\n"
+        "  - id: weibo\n    name: 微博\n"
+        "  - id: zhihu\n",
+        encoding="utf-8",
+    )
+    with StubNewsServer(latency_ms=150, items=5) as server:
+        monkeypatch.setenv("CRAWLER_API_URL", server.api_url)
+        monkeypatch.delenv("STORAGE_BACKEND", raising=False)
+        yield tmp_path
+
+
+def poll_status(tools, task_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        status = tools.get_crawl_task_status(task_id)
+        assert status["success"], status
+        if status["status"] in ("completed", "failed", "cancelled"):
+            return status
+        assert time.monotonic() < deadline, f"任务未在 {timeout} 秒内结束"
+        time.sleep(0.02)
+
+
+def test_tools_start_poll_and_save(project):
+    tools = SystemManagementTools(str(project))
+    started = tools.start_crawl_task(save_to_local=True)
+    assert started["success"], started
+    assert started["platforms"] == ["baidu", "weibo", "zhihu"]
+
+    status = poll_status(tools, started["task_id"])
+    assert status["status"] == "completed"
+    assert status["progress"] == {"total": 3, "finished": 3, "succeeded": 3, "failed": 0}
+    result = status["result"]
+    assert result["platforms"] == ["baidu", "weibo", "zhihu"] and result["total_news"] == 15
+    assert result["saved_to_local"] is True
+    assert (project / "output").exists() and list((project / "output").glob("*/txt/*.txt"))
+
+    listed = tools.get_crawl_task_status()
+    assert started["task_id"] in [task["task_id"] for task in listed["tasks"]]
+    assert all("result" not in task for task in listed["tasks"])
+    assert "result" not in tools.get_crawl_task_status(started["task_id"], include_data=False)
+
+
+def test_tools_cancel_running_task(project):
+    tools = SystemManagementTools(str(project))
+    started = tools.start_crawl_task(save_to_local=True)
+    task = tools.task_service.get(started["task_id"])
+    deadline = time.monotonic() + 5
+    while task.to_dict()["progress"]["finished"] < 1:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    cancelled = tools.cancel_crawl_task(started["task_id"])
+    assert cancelled["success"] and cancelled["cancel_requested"]
+    status = poll_status(tools, started["task_id"])
+    assert status["status"] == "cancelled"
+    assert status["result"]["status"] == "cancelled"
+    assert "zhihu" in status["result"]["failed_platforms"]
+    # 被取消的任务不保存结果
+    assert status["result"]["saved_to_local"] is False
+    assert not list(project.glob("output/*/txt/*.txt"))
+
+    again = tools.cancel_crawl_task(started["task_id"])
+    assert again["success"] and again["note"] == "任务已结束，无需取消"
+
+
+def test_tools_unknown_task(project):
+    tools = SystemManagementTools(str(project))
+    for response in (tools.get_crawl_task_status("crawl_0"), tools.cancel_crawl_task("crawl_0")):
+        assert response["success"] is False
+        assert response["error"]["code"] == "DATA_NOT_FOUND"
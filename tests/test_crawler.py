@@ -0,0 +1,166 @@
+"""
+爬取引擎：并发爬取与串行爬取的结果一致，按主机限流，超过截止时间的平台记为失败
+"""
+
+import json
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from trendradar.crawler import CrawlEngine, HostRateLimiter
+
+PLATFORMS = [("baidu", "百度"), ("weibo", "微博"), "zhihu", ("toutiao", "今日头条"), "bilibili"]
+
+
+class StubResponse:
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class StubClient:
+    """按平台ID返回固定内容的 HTTP 客户端，记录每次请求的发起时刻"""
+
+    def __init__(self, delays=None, failing=(), bad_status=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.bad_status = set(bad_status)
+        self.lock = threading.Lock()
+        self.started = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url, proxy_url=None, headers=None, timeout=None):
+        id_value = parse_qs(urlparse(url).query)["id"][0]
+        with self.lock:
+            self.started.append((id_value, time.monotonic()))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.delays.get(id_value, 0.01)
+            if timeout is not None and delay > timeout:
+                time.sleep(timeout)
+                raise requests.Timeout(f"{id_value} 请求超时")
+            time.sleep(delay)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+        if id_value in self.failing:
+            return StubResponse(b"", 502)
+        rng = random.Random(id_value)
+        items = [
+            {"title": f"{id_value} 标题 {rng.randint(0, 50)}", "url": f"https://example.com/{id_value}/{i}"}
+            for i in range(20)
+        ]
+        status = "error" if id_value in self.bad_status else "success"
+        return StubResponse(json.dumps({"status": status, "items": items}).encode("utf-8"))
+
+
+@pytest.fixture(autouse=True)
+def no_retry_wait(monkeypatch):
+    # 重试前不等待
+    monkeypatch.setattr(random, "uniform", lambda a, b: 0)
+
+
+def as_dicts(results):
+    return {
+        id_value: {title: (item.ranks, item.url, item.mobile_url) for title, item in title_data.items()}
+        for id_value, title_data in results.items()
+    }
+
+
+def test_concurrent_results_match_serial():
+    stub_options = {
+        "delays": {"baidu": 0.05, "weibo": 0.01, "zhihu": 0.03, "toutiao": 0.02, "bilibili": 0.04},
+        "failing": ["toutiao"],
+        "bad_status": ["bilibili"],
+    }
+    serial = CrawlEngine(http_client=StubClient(**stub_options), request_interval=0)
+    concurrent = CrawlEngine(
+        http_client=StubClient(**stub_options), max_workers=4, host_min_interval=0
+    )
+
+    serial_results, serial_names, serial_failed = serial.crawl(PLATFORMS)
+    concurrent_results, concurrent_names, concurrent_failed = concurrent.crawl(PLATFORMS)
+
+    assert as_dicts(concurrent_results) == as_dicts(serial_results)
+    assert list(concurrent_results) == list(serial_results) == ["baidu", "weibo", "zhihu"]
+    assert concurrent_names == serial_names
+    assert concurrent_failed == serial_failed == ["toutiao", "bilibili"]
+    assert {
+        id_value: metrics["status"] for id_value, metrics in concurrent.platform_metrics.items()
+    } == {id_value: metrics["status"] for id_value, metrics in serial.platform_metrics.items()}
+
+
+def test_per_host_interval_and_concurrency_are_respected():
+    client = StubClient(delays={id_value: 0.05 for id_value in "abcdefgh"})
+    engine = CrawlEngine(
+        http_client=client, max_workers=8, host_max_concurrency=2, host_min_interval=30
+    )
+    begin = time.monotonic()
+    results, _, failed_ids = engine.crawl(list("abcdefgh"))
+
+    assert sorted(results) == list("abcdefgh") and failed_ids == []
+    assert client.max_in_flight <= 2
+    starts = sorted(started for _, started in client.started)
+    # 同一主机的请求按 host_min_interval 依次安排发起时刻，第 k 个请求不早于开始后 k 个间隔
+    # （线程唤醒延迟只会让请求晚于安排的时刻，相邻两次的实际间隔可能短于 host_min_interval）
+    for k, started in enumerate(starts):
+        assert started - begin >= k * 0.03
+
+
+def test_rate_limiter_tracks_hosts_separately():
+    limiter = HostRateLimiter(max_concurrency=4, min_interval_ms=200)
+    starts = {}
+
+    def request(url):
+        with limiter.limit(url):
+            starts[url] = time.monotonic()
+
+    begin = time.monotonic()
+    threads = [
+        threading.Thread(target=request, args=(url,))
+        for url in ("https://a.example.com/x", "https://b.example.com/x", "https://a.example.com/y")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 不同主机互不等待，同一主机的第二次请求等待 min_interval
+    assert starts["https://b.example.com/x"] - begin < 0.1
+    assert max(starts["https://a.example.com/x"], starts["https://a.example.com/y"]) - begin >= 0.2
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_deadline_marks_unfinished_platforms_failed(max_workers):
+    client = StubClient(delays={"slow": 2.0, "slower": 3.0})
+    engine = CrawlEngine(
+        http_client=client,
+        max_workers=max_workers,
+        host_min_interval=0,
+        request_interval=0,
+        crawl_deadline=0.3,
+    )
+
+    start = time.monotonic()
+    results, id_to_name, failed_ids = engine.crawl(["fast", "slow", "quick", "slower"])
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.5
+    assert "fast" in results
+    assert set(failed_ids) >= {"slow", "slower"}
+    assert set(results) | set(failed_ids) == set(id_to_name)
+    assert set(engine.timed_out_ids) >= {"slow", "slower"}
+    assert set(engine.timed_out_ids) == set(failed_ids)
+    for id_value in engine.timed_out_ids:
+        assert engine.platform_metrics[id_value]["status"] == "timed_out"
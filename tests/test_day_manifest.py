@@ -0,0 +1,172 @@
+"""
+每日快照清单：逐个记录快照得到的清单与扫描 txt 目录重建的结果一致，读取清单不写入文件
+"""
+
+import json
+import os
+import threading
+
+from trendradar.day_manifest import MANIFEST_NAME, DayManifest
+from trendradar.snapshot import parse_titles, write_titles_file
+
+DATE = "2025年11月12日"
+
+
+def write_snapshot(output_dir, time_info, titles_by_id, failed_ids=()):
+    txt_dir = output_dir / DATE / "txt"
+    txt_dir.mkdir(parents=True, exist_ok=True)
+    write_titles_file(str(txt_dir / f"{time_info}.txt"), titles_by_id, {}, list(failed_ids))
+
+
+def save_snapshot(manifest, output_dir, time_info, titles_by_id, failed_ids=()):
+    """与主程序保存快照的流程相同：写入 txt 后记录到清单"""
+    write_snapshot(output_dir, time_info, titles_by_id, failed_ids)
+    manifest.record(DATE, time_info, titles_by_id)
+
+
+def titles(source_id, count, offset=0):
+    return {
+        f"{source_id} 标题 {number}": {"ranks": [rank], "url": "", "mobileUrl": ""}
+        for rank, number in enumerate(range(offset, offset + count), 1)
+    }
+
+
+def scan(output_dir):
+    """旧的做法：逐个 stat 并解析 txt 快照"""
+    snapshots = {}
+    for file_path in sorted((output_dir / DATE / "txt").glob("*.txt")):
+        with open(file_path, "r", encoding="utf-8") as f:
+            titles_by_id, _, _ = parse_titles(f.read())
+        stat = file_path.stat()
+        snapshots[file_path.stem] = {
+            "stamp": stat.st_mtime,
+            "size": stat.st_size,
+            "platforms": {
+                source_id: len(title_data)
+                for source_id, title_data in titles_by_id.items()
+                if title_data
+            },
+        }
+    return snapshots
+
+
+def test_recorded_manifest_matches_scan(tmp_path):
+    manifest = DayManifest(tmp_path)
+    save_snapshot(manifest, tmp_path, "08时00分", {"weibo": titles("weibo", 5), "baidu": titles("baidu", 3)})
+    # 标题清理后重复的只计一次，没有标题的平台不计入
+    save_snapshot(
+        manifest,
+        tmp_path,
+        "09时00分",
+        {"weibo": {"同一  标题": {"ranks": [1]}, "同一 标题": {"ranks": [2]}}, "zhihu": {}},
+        failed_ids=["baidu"],
+    )
+    save_snapshot(manifest, tmp_path, "10时00分", {"weibo": titles("weibo", 4, offset=2)})
+
+    assert manifest.load(DATE)["snapshots"] == scan(tmp_path)
+    assert manifest.load(DATE)["snapshots"]["09时00分"]["platforms"] == {"weibo": 1}
+    assert manifest.list_snapshots(DATE) == [
+        (time_info, entry["stamp"]) for time_info, entry in scan(tmp_path).items()
+    ]
+    assert manifest.total_size(DATE) == sum(entry["size"] for entry in scan(tmp_path).values())
+
+    # 其他实例（如 MCP 服务）读到的清单与写入方一致
+    assert DayManifest(tmp_path).load(DATE)["snapshots"] == scan(tmp_path)
+
+
+def test_out_of_order_records(tmp_path):
+    manifest = DayManifest(tmp_path)
+    for time_info in ["10时00分", "08时00分", "12时00分", "09时00分"]:
+        save_snapshot(manifest, tmp_path, time_info, {"weibo": titles("weibo", 3)})
+
+    assert [time_info for time_info, _ in manifest.list_snapshots(DATE)] == [
+        "08时00分", "09时00分", "10时00分", "12时00分"
+    ]
+    assert manifest.load(DATE)["snapshots"] == scan(tmp_path)
+
+
+def test_first_crawl_of_the_day(tmp_path):
+    manifest = DayManifest(tmp_path)
+    assert manifest.list_snapshots(DATE) == []
+
+    save_snapshot(manifest, tmp_path, "08时00分", {"weibo": titles("weibo", 3)})
+    assert len(manifest.list_snapshots(DATE)) == 1
+    assert manifest.load(DATE)["snapshots"] == scan(tmp_path)
+
+
+def test_missing_manifest_is_scanned_without_writing(tmp_path):
+    for time_info in ["08时00分", "09时00分"]:
+        write_snapshot(tmp_path, time_info, {"weibo": titles("weibo", 3)})
+    manifest_path = tmp_path / DATE / MANIFEST_NAME
+
+    manifest = DayManifest(tmp_path)
+    assert manifest.load(DATE)["snapshots"] == scan(tmp_path)
+    assert not manifest_path.exists()
+
+    # 下次保存快照时连同已有快照一起写入清单
+    save_snapshot(manifest, tmp_path, "10时00分", {"weibo": titles("weibo", 3, offset=1)})
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        assert json.load(f)["snapshots"] == scan(tmp_path)
+
+
+def test_missing_manifest_rescanned_when_txt_dir_changes(tmp_path):
+    write_snapshot(tmp_path, "08时00分", {"weibo": titles("weibo", 3)})
+    # 长期运行的读取方（如 MCP 服务）在没有清单时能读到之后写入的快照
+    reader = DayManifest(tmp_path)
+    assert [time_info for time_info, _ in reader.list_snapshots(DATE)] == ["08时00分"]
+
+    write_snapshot(tmp_path, "09时00分", {"weibo": titles("weibo", 3, offset=1)})
+    assert reader.load(DATE)["snapshots"] == scan(tmp_path)
+    assert not (tmp_path / DATE / MANIFEST_NAME).exists()
+
+
+def test_concurrent_writers_keep_all_records(tmp_path):
+    # 两个独立的实例（相当于主程序和 MCP 服务）同时保存快照，互不覆盖对方的记录
+    writers = [DayManifest(tmp_path), DayManifest(tmp_path)]
+    write_snapshot(tmp_path, "00时00分", {"weibo": titles("weibo", 1)})
+
+    def save_all(manifest, minutes):
+        for minute in minutes:
+            save_snapshot(manifest, tmp_path, f"{minute // 60:02d}时{minute % 60:02d}分", {"weibo": titles("weibo", 2)})
+
+    threads = [
+        threading.Thread(target=save_all, args=(writer, range(offset, 120, 2)))
+        for offset, writer in enumerate(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert DayManifest(tmp_path).load(DATE)["snapshots"] == scan(tmp_path)
+    assert len(scan(tmp_path)) == 120
+
+
+def test_stale_manifest_is_repaired_by_rebuild(tmp_path):
+    manifest = DayManifest(tmp_path)
+    for time_info in ["08时00分", "09时00分", "10时00分"]:
+        save_snapshot(manifest, tmp_path, time_info, {"weibo": titles("weibo", 3)})
+    manifest_path = tmp_path / DATE / MANIFEST_NAME
+    saved_mtime = manifest_path.stat().st_mtime_ns
+
+    # 绕过清单增删快照：读取时不扫描目录，也不改写清单
+    os.remove(tmp_path / DATE / "txt" / "09时00分.txt")
+    write_snapshot(tmp_path, "11时00分", {"baidu": titles("baidu", 2)})
+    reader = DayManifest(tmp_path)
+    assert [time_info for time_info, _ in reader.list_snapshots(DATE)] == [
+        "08时00分", "09时00分", "10时00分"
+    ]
+    assert manifest_path.stat().st_mtime_ns == saved_mtime
+
+    # 显式重建后与扫描结果一致，其他实例也读到重建后的清单
+    assert manifest.rebuild(DATE)["snapshots"] == scan(tmp_path)
+    assert reader.load(DATE)["snapshots"] == scan(tmp_path)
+
+
+def test_old_manifest_version_is_treated_as_missing(tmp_path):
+    write_snapshot(tmp_path, "08时00分", {"weibo": titles("weibo", 3)})
+    manifest_path = tmp_path / DATE / MANIFEST_NAME
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "dir_mtime_ns": 0, "snapshots": {}}, f)
+
+    assert DayManifest(tmp_path).load(DATE)["snapshots"] == scan(tmp_path)
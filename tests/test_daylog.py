@@ -0,0 +1,131 @@
+"""
+快照日志：追加写入的快照按索引读取与 txt 快照一致；索引缺失或落后时读取方只在内存中重建，
+末尾不完整的记录由下次写入截断
+"""
+
+import random
+
+from trendradar.daylog import INDEX_NAME, LOG_NAME, DayLogStore
+from trendradar.snapshot import format_titles, parse_titles
+
+DATE = "2025年11月12日"
+TIMES = ["08时00分", "09时00分", "10时00分", "11时00分"]
+ID_TO_NAME = {"baidu": "百度", "weibo": "微博", "zhihu": "知乎"}
+
+
+def save_day(store, make_snapshots, times=TIMES):
+    snapshots = make_snapshots(random.Random(16), times)
+    for number, (time_info, titles_by_id) in enumerate(snapshots):
+        failed_ids = [source_id for source_id in ID_TO_NAME if source_id not in titles_by_id]
+        store.save_snapshot(
+            DATE, time_info, titles_by_id, ID_TO_NAME, failed_ids, crawled_at=1000.0 + number
+        )
+    return snapshots
+
+
+def expected_day(snapshots):
+    """与写入 txt 快照后再解析的结果一致"""
+    expected = []
+    for time_info, titles_by_id in snapshots:
+        failed_ids = [source_id for source_id in ID_TO_NAME if source_id not in titles_by_id]
+        parsed, id_to_name, _ = parse_titles(format_titles(titles_by_id, ID_TO_NAME, failed_ids))
+        expected.append((time_info, parsed, id_to_name))
+    return expected
+
+
+def file_state(tmp_path):
+    day_dir = tmp_path / DATE
+    return {name: (day_dir / name).read_bytes() for name in (LOG_NAME, INDEX_NAME) if (day_dir / name).exists()}
+
+
+def test_appended_snapshots_round_trip(tmp_path, make_snapshots):
+    store = DayLogStore(tmp_path)
+    snapshots = save_day(store, make_snapshots)
+
+    assert store.load_day(DATE) == expected_day(snapshots)
+    assert store.list_snapshots(DATE) == [(time_info, 1000.0 + n) for n, time_info in enumerate(TIMES)]
+    assert store.load_day(DATE, times=["09时00分"]) == expected_day(snapshots)[1:2]
+    assert store.load_failed_ids(DATE, TIMES[0]) == [
+        source_id for source_id in ID_TO_NAME if source_id not in snapshots[0][1]
+    ]
+    for _, titles_by_id, id_to_name in store.load_day(DATE, platform_ids=["weibo"]):
+        assert set(titles_by_id) <= {"weibo"} and set(id_to_name) == set(titles_by_id)
+    assert store.has_date(DATE) and not store.has_date("2025年11月13日")
+
+
+def test_rewritten_time_uses_last_record(tmp_path, make_snapshots):
+    store = DayLogStore(tmp_path)
+    save_day(store, make_snapshots)
+    rewritten = {"weibo": {"重写的标题": {"ranks": [1], "url": "", "mobileUrl": ""}}}
+    store.save_snapshot(DATE, "09时00分", rewritten, ID_TO_NAME, [], crawled_at=2000.0)
+
+    assert [time_info for time_info, _ in store.list_snapshots(DATE)] == TIMES
+    assert store.load_day(DATE, times=["09时00分"])[0][1] == rewritten
+    # 重建索引得到相同的结果
+    (tmp_path / DATE / INDEX_NAME).unlink()
+    assert store.load_day(DATE, times=["09时00分"])[0][1] == rewritten
+
+
+def test_missing_index_rebuilt_in_memory(tmp_path, make_snapshots, capsys):
+    store = DayLogStore(tmp_path)
+    snapshots = save_day(store, make_snapshots)
+    index_path = tmp_path / DATE / INDEX_NAME
+    index_path.unlink()
+    log_mtime = (tmp_path / DATE / LOG_NAME).stat().st_mtime
+
+    reader = DayLogStore(tmp_path)
+    assert reader.load_day(DATE) == expected_day(snapshots)
+    # 缺少索引时爬取时刻取日志的修改时刻
+    assert reader.list_snapshots(DATE) == [(time_info, log_mtime) for time_info in TIMES]
+    assert not index_path.exists()
+    assert capsys.readouterr().out == ""
+
+    # 下次写入时保存重建的索引
+    store.save_snapshot(DATE, "12时00分", snapshots[0][1], ID_TO_NAME, [], crawled_at=3000.0)
+    assert index_path.exists()
+    assert [time_info for time_info, _ in DayLogStore(tmp_path).list_snapshots(DATE)] == TIMES + ["12时00分"]
+
+
+def test_index_behind_log_keeps_known_times(tmp_path, make_snapshots):
+    store = DayLogStore(tmp_path)
+    snapshots = save_day(store, make_snapshots)
+    index_path = tmp_path / DATE / INDEX_NAME
+    # 其他进程已追加日志、尚未写入索引
+    lines = index_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    index_path.write_text("".join(lines[:-1]), encoding="utf-8")
+    log_mtime = (tmp_path / DATE / LOG_NAME).stat().st_mtime
+
+    reader = DayLogStore(tmp_path)
+    assert reader.load_day(DATE) == expected_day(snapshots)
+    assert reader.list_snapshots(DATE) == [
+        (time_info, 1000.0 + n) for n, time_info in enumerate(TIMES[:-1])
+    ] + [(TIMES[-1], log_mtime)]
+    assert index_path.read_text(encoding="utf-8") == "".join(lines[:-1])
+
+
+def test_partial_trailing_record_left_to_writer(tmp_path, make_snapshots, capsys):
+    store = DayLogStore(tmp_path)
+    snapshots = save_day(store, make_snapshots)
+    log_path = tmp_path / DATE / LOG_NAME
+    # 写入中途的记录：记录头完整，正文只写了一部分
+    with open(log_path, "ab") as f:
+        f.write("@@ 12时00分 500\n未写完的正文".encode("utf-8"))
+    before = file_state(tmp_path)
+
+    # 读取方不截断日志、不改写索引，也不输出提示
+    reader = DayLogStore(tmp_path)
+    assert reader.load_day(DATE) == expected_day(snapshots)
+    assert [time_info for time_info, _ in reader.list_snapshots(DATE)] == TIMES
+    assert file_state(tmp_path) == before
+    assert capsys.readouterr().out == ""
+
+    # 写入方截断不完整的记录后再追加
+    store.save_snapshot(DATE, "12时00分", snapshots[0][1], ID_TO_NAME, [], crawled_at=3000.0)
+    assert "已截断" in capsys.readouterr().out
+    assert "未写完的正文".encode("utf-8") not in log_path.read_bytes()
+    reloaded = DayLogStore(tmp_path)
+    assert reloaded.load_day(DATE)[:-1] == expected_day(snapshots)
+    assert reloaded.load_day(DATE)[-1][1] == expected_day(snapshots[:1])[0][1]
+    assert reloaded.list_snapshots(DATE) == [
+        (time_info, 1000.0 + n) for n, time_info in enumerate(TIMES)
+    ] + [("12时00分", 3000.0)]
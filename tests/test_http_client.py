@@ -0,0 +1,206 @@
+"""
+HTTP 客户端：httpx 的异常按 requests 的异常类型抛出，单独设置连接数的主机使用独立的连接池
+
+测试环境不一定安装 httpx，HTTP/2 相关的用例使用模拟的 httpx 模块
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import trendradar.http_client as http_client
+from trendradar.http_client import HttpClient
+
+
+class HTTPError(Exception):
+    pass
+
+
+class RequestError(HTTPError):
+    pass
+
+
+class TransportError(RequestError):
+    pass
+
+
+class TimeoutException(TransportError):
+    pass
+
+
+class ConnectTimeout(TimeoutException):
+    pass
+
+
+class ReadTimeout(TimeoutException):
+    pass
+
+
+class PoolTimeout(TimeoutException):
+    pass
+
+
+class NetworkError(TransportError):
+    pass
+
+
+class ConnectError(NetworkError):
+    pass
+
+
+class ProxyError(TransportError):
+    pass
+
+
+class DecodingError(RequestError):
+    pass
+
+
+class HTTPStatusError(HTTPError):
+    pass
+
+
+class Limits:
+    def __init__(self, max_connections=None, max_keepalive_connections=None):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+
+
+class FakeResponse:
+    http_version = "HTTP/2"
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPStatusError(f"{self.status_code} Error")
+
+
+class FakeClient:
+    """模拟的 httpx.Client：记录创建参数，请求时抛出预设的异常"""
+
+    instances = []
+
+    def __init__(self, http2=False, proxy=None, limits=None):
+        self.http2 = http2
+        self.proxy = proxy
+        self.limits = limits
+        self.error = None
+        self.status_code = 200
+        self.requests = []
+        FakeClient.instances.append(self)
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        if self.error is not None:
+            raise self.error
+        return FakeResponse(self.status_code)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_httpx(monkeypatch):
+    FakeClient.instances = []
+    namespace = SimpleNamespace(
+        HTTPError=HTTPError,
+        TransportError=TransportError,
+        TimeoutException=TimeoutException,
+        ConnectTimeout=ConnectTimeout,
+        ReadTimeout=ReadTimeout,
+        PoolTimeout=PoolTimeout,
+        ConnectError=ConnectError,
+        ProxyError=ProxyError,
+        HTTPStatusError=HTTPStatusError,
+        Limits=Limits,
+        Client=FakeClient,
+    )
+    monkeypatch.setattr(http_client, "httpx", namespace)
+    return namespace
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (ConnectTimeout("connect"), requests.exceptions.ConnectTimeout),
+        (PoolTimeout("pool"), requests.exceptions.ConnectTimeout),
+        (ReadTimeout("read"), requests.exceptions.ReadTimeout),
+        (ProxyError("proxy"), requests.exceptions.ProxyError),
+        (ConnectError("refused"), requests.exceptions.ConnectionError),
+        (DecodingError("decode"), requests.exceptions.RequestException),
+    ],
+)
+def test_http2_errors_raised_as_requests_errors(fake_httpx, error, expected):
+    client = HttpClient(enable_http2=True)
+    client._get_http2_client(None, "https://example.com/").error = error
+
+    with pytest.raises(expected) as excinfo:
+        client.get("https://example.com/api", timeout=5)
+    assert excinfo.value.__cause__ is error
+    # 超时按 requests 的超时处理，调用方统一捕获 requests.Timeout
+    if isinstance(error, TimeoutException):
+        assert isinstance(excinfo.value, requests.exceptions.Timeout)
+    else:
+        assert not isinstance(excinfo.value, requests.exceptions.Timeout)
+
+
+def test_http2_status_error_raised_as_requests_http_error(fake_httpx):
+    client = HttpClient(enable_http2=True)
+    client._get_http2_client(None, "https://example.com/").status_code = 502
+
+    response = client.get("https://example.com/api")
+    with pytest.raises(requests.exceptions.HTTPError) as excinfo:
+        response.raise_for_status()
+    assert excinfo.value.response is response
+    assert client.get_stats()["http2_responses"] == 1
+
+
+def test_http2_clients_sized_per_host(fake_httpx):
+    client = HttpClient(
+        pool_connections=4,
+        pool_maxsize=5,
+        enable_http2=True,
+        host_pool_maxsize={"API.Example.com": 2},
+    )
+    client.post("https://api.example.com/a", data=b"payload")
+    client.get("https://api.example.com/b")
+    client.get("https://other.example.com/")
+    client.get("https://other.example.com/", proxy_url="http://127.0.0.1:8080")
+
+    host_client, default_client, proxy_client = FakeClient.instances
+    assert [request[1] for request in host_client.requests] == [
+        "https://api.example.com/a", "https://api.example.com/b"
+    ]
+    # bytes 请求体按 httpx 的 content 参数传递
+    assert host_client.requests[0][2] == {"content": b"payload"}
+    assert (host_client.limits.max_connections, host_client.limits.max_keepalive_connections) == (2, 2)
+    assert (default_client.limits.max_connections, default_client.limits.max_keepalive_connections) == (20, 5)
+    assert proxy_client.proxy == "http://127.0.0.1:8080"
+    assert default_client.proxy is None
+
+
+def test_missing_httpx_falls_back_to_http1(monkeypatch):
+    monkeypatch.setattr(http_client, "httpx", None)
+    assert HttpClient(enable_http2=True).enable_http2 is False
+
+
+def test_http1_pools_sized_per_host():
+    client = HttpClient(pool_maxsize=7, host_pool_maxsize={"api.example.com": 3})
+    session = client._get_session(None)
+
+    def pool_maxsize(url):
+        pool = session.get_adapter(url).poolmanager.connection_from_url(url)
+        return pool.pool.maxsize
+
+    assert pool_maxsize("https://api.example.com/a") == 3
+    assert pool_maxsize("http://api.example.com/a") == 3
+    assert pool_maxsize("https://other.example.com/") == 7
+    # 只按主机名匹配，不匹配以该主机名开头的其他主机
+    assert pool_maxsize("https://api.example.com.cn/") == 7
+    assert session.get_adapter("https://api.example.com/") is not session.get_adapter("https://other.example.com/")
+    # 同一代理的请求共享会话
+    assert client._get_session(None) is session
+    assert client._get_session("http://127.0.0.1:8080") is not session
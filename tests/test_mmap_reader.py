@@ -0,0 +1,78 @@
+"""
+二进制快照的 mmap 逐条读取：产出的标题与合并整天快照的结果一致，并且每读一个快照就产出
+"""
+
+import random
+
+from trendradar.binary_snapshot import BinarySnapshotStore
+from trendradar.mmap_reader import HistoryReader
+
+DATE = "2025年11月12日"
+TIMES = ["08时00分", "09时00分", "10时00分", "11时00分"]
+
+
+def save_day(output_dir):
+    store = BinarySnapshotStore(output_dir)
+    rng = random.Random(5)
+    for time_info in TIMES:
+        titles_by_id = {
+            source_id: {
+                f"{source_id} 标题 {number}": {
+                    "ranks": [rank],
+                    "url": f"https://example.com/{time_info}/{number}",
+                    "mobileUrl": "",
+                }
+                for rank, number in enumerate(rng.sample(range(20), 8), 1)
+            }
+            for source_id in ("baidu", "weibo")
+        }
+        store.save_snapshot(DATE, time_info, titles_by_id, {"baidu": "百度", "weibo": "微博"}, [])
+    return store
+
+
+def merged_day(store):
+    """与 read_all_titles_for_date 相同的合并：同一平台的标题取首次出现的排名和链接"""
+    merged = {}
+    for _, titles_by_id, _ in store.load_day(DATE):
+        for source_id, title_data in titles_by_id.items():
+            for title, data in title_data.items():
+                merged.setdefault((source_id, title), (data["ranks"][0], data["url"]))
+    return merged
+
+
+def test_records_match_merged_day(tmp_path):
+    store = save_day(tmp_path)
+    records = list(HistoryReader(tmp_path, binary_store=store).iter_binary_titles(
+        DATE, fields=["rank", "url", "platform_name"]
+    ))
+
+    assert len(records) == len({(record.platform_id, record.title) for record in records})
+    assert {
+        (record.platform_id, record.title): (record.rank, record.url) for record in records
+    } == merged_day(store)
+    assert {record.platform_id: record.platform_name for record in records} == {
+        "baidu": "百度", "weibo": "微博"
+    }
+
+
+def test_records_are_yielded_per_snapshot(tmp_path, monkeypatch):
+    store = save_day(tmp_path)
+    opened = []
+    snapshot_path = store.snapshot_path
+
+    def tracking_path(date_folder, time_info):
+        opened.append(time_info)
+        return snapshot_path(date_folder, time_info)
+
+    monkeypatch.setattr(store, "snapshot_path", tracking_path)
+    records = HistoryReader(tmp_path, binary_store=store).iter_binary_titles(DATE, ["weibo"])
+
+    # 第一条标题来自第一个快照，此时还没有读取后面的快照
+    first = next(records)
+    assert first.platform_id == "weibo"
+    assert opened == TIMES[:1]
+    rest = list(records)
+    assert opened == TIMES
+    assert {first.title} | {record.title for record in rest} == {
+        title for source_id, title in merged_day(store) if source_id == "weibo"
+    }
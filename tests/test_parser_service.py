@@ -0,0 +1,107 @@
+"""
+MCP 解析服务：按 storage.backend 选择读取的存储，已压缩日期的快照每天只解压一次
+"""
+
+from datetime import datetime
+
+import pytest
+
+import trendradar.day_archive as day_archive
+from mcp_server.services.cache_service import get_cache
+from mcp_server.services.parser_service import ParserService
+from trendradar.day_archive import compact_day
+from trendradar.sqlite_store import SQLiteNewsStore
+from trendradar.snapshot import write_titles_file
+
+DATE = datetime(2025, 11, 12)
+DATE_FOLDER = "2025年11月12日"
+TIMES = ["08时00分", "09时00分", "10时00分"]
+
+
+def titles(source_id, names):
+    return {
+        source_id: {
+            name: {"ranks": [rank], "url": "", "mobileUrl": ""}
+            for rank, name in enumerate(names, 1)
+        }
+    }
+
+
+def make_project(tmp_path, backend):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "config.yaml").write_text(
+        f"storage:\n  backend: {backend}\n  sqlite_path: output/news.db\n", encoding="utf-8"
+    )
+    return tmp_path / "output"
+
+
+def write_txt(output_dir, time_info, titles_by_id):
+    txt_dir = output_dir / DATE_FOLDER / "txt"
+    txt_dir.mkdir(parents=True, exist_ok=True)
+    write_titles_file(str(txt_dir / f"{time_info}.txt"), titles_by_id, {}, [])
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(monkeypatch):
+    monkeypatch.delenv("STORAGE_BACKEND", raising=False)
+    get_cache().clear()
+    yield
+    get_cache().clear()
+
+
+def test_txt_backend_ignores_leftover_database(tmp_path):
+    output_dir = make_project(tmp_path, "txt")
+    write_txt(output_dir, "08时00分", titles("weibo", ["txt 标题"]))
+    # 之前使用 sqlite 后端时留下的数据库
+    SQLiteNewsStore(output_dir / "news.db").save_snapshot(
+        DATE_FOLDER, "08时00分", titles("weibo", ["旧数据库标题"]), {}, []
+    )
+
+    all_titles, _, _ = ParserService(str(tmp_path)).read_all_titles_for_date(DATE)
+    assert list(all_titles["weibo"]) == ["txt 标题"]
+
+
+def test_sqlite_backend_reads_database(tmp_path):
+    output_dir = make_project(tmp_path, "sqlite")
+    write_txt(output_dir, "08时00分", titles("weibo", ["txt 标题"]))
+    SQLiteNewsStore(output_dir / "news.db").save_snapshot(
+        DATE_FOLDER, "08时00分", titles("weibo", ["数据库标题"]), {}, []
+    )
+
+    all_titles, _, _ = ParserService(str(tmp_path)).read_all_titles_for_date(DATE)
+    assert list(all_titles["weibo"]) == ["数据库标题"]
+
+
+def test_sqlite_backend_without_database_falls_back_to_txt(tmp_path):
+    output_dir = make_project(tmp_path, "sqlite")
+    write_txt(output_dir, "08时00分", titles("weibo", ["txt 标题"]))
+
+    all_titles, _, _ = ParserService(str(tmp_path)).read_all_titles_for_date(DATE)
+    assert list(all_titles["weibo"]) == ["txt 标题"]
+    # 读取时不创建数据库
+    assert not (output_dir / "news.db").exists()
+
+
+def test_archived_day_is_decompressed_once(tmp_path, monkeypatch):
+    output_dir = make_project(tmp_path, "txt")
+    expected = {}
+    for number, time_info in enumerate(TIMES):
+        expected[time_info] = titles("weibo", [f"标题 {number}", f"标题 {number + 1}"])
+        write_txt(output_dir, time_info, expected[time_info])
+    compact_day(output_dir, DATE_FOLDER)
+
+    reads = []
+    original = day_archive.iter_archive_files
+
+    def counting_iter(*args, **kwargs):
+        reads.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(day_archive, "iter_archive_files", counting_iter)
+    parser = ParserService(str(tmp_path))
+    txt_dir = output_dir / DATE_FOLDER / "txt"
+    for time_info in TIMES:
+        titles_by_id, _ = parser.parse_txt_file(txt_dir / f"{time_info}.txt")
+        assert titles_by_id == expected[time_info]
+    assert len(reads) == 1
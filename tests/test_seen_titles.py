@@ -0,0 +1,144 @@
+"""
+已出现标题索引：增量记录的判断结果与逐个扫描时间范围内全部快照的结果一致
+"""
+
+import random
+
+import pytest
+
+from trendradar.seen_titles import SeenTitleIndex, parse_horizon, snapshot_timestamp
+
+DAY_ONE = "2025年11月12日"
+DAY_TWO = "2025年11月13日"
+
+
+def make_day_snapshots(make_snapshots, rng, dates, times):
+    """生成多天的快照序列 [(日期, 时间, titles_by_id)]，标题从小词表中抽取以产生大量重复"""
+    return [
+        (date_folder, time_info, titles_by_id)
+        for date_folder in dates
+        for time_info, titles_by_id in make_snapshots(rng, times, vocabulary=40, size=12)
+    ]
+
+
+def scan_new_titles(snapshots, horizon, date_folder, time_info, titles_by_id):
+    """旧的做法：解析时间范围内所有更早的快照，找出此前未出现过的标题"""
+    timestamp = snapshot_timestamp(date_folder, time_info)
+    seconds = parse_horizon(horizon)
+    if seconds is None:
+        start = snapshot_timestamp(date_folder, "00时00分")
+    else:
+        start = timestamp - seconds
+
+    history = [
+        snapshot for snapshot in snapshots
+        if start <= snapshot_timestamp(snapshot[0], snapshot[1]) < timestamp
+    ]
+    if not history:
+        return {}
+
+    seen = {}
+    for _, _, history_titles in history:
+        for source_id, title_data in history_titles.items():
+            seen.setdefault(source_id, set()).update(title_data)
+    new_titles = {}
+    for source_id, title_data in titles_by_id.items():
+        source_new_titles = {
+            title: data for title, data in title_data.items()
+            if title not in seen.get(source_id, set())
+        }
+        if source_new_titles:
+            new_titles[source_id] = source_new_titles
+    return new_titles
+
+
+@pytest.mark.parametrize("horizon", ["today", "2h", "24h"])
+def test_incremental_matches_full_scan(tmp_path, make_snapshots, horizon):
+    snapshots = make_day_snapshots(
+        make_snapshots,
+        random.Random(horizon),
+        [DAY_ONE, DAY_TWO],
+        ["08时00分", "09时30分", "11时00分", "23时30分"],
+    )
+    index = SeenTitleIndex(tmp_path, horizon=horizon)
+    for position, (date_folder, time_info, titles_by_id) in enumerate(snapshots):
+        index.record(date_folder, time_info, float(position), titles_by_id)
+        index.prune(date_folder, time_info)
+        expected = scan_new_titles(snapshots, horizon, date_folder, time_info, titles_by_id)
+        assert index.new_titles(date_folder, time_info, titles_by_id) == expected
+
+
+@pytest.mark.parametrize("horizon", ["today", "24h"])
+def test_out_of_order_records(tmp_path, make_snapshots, horizon):
+    snapshots = make_day_snapshots(
+        make_snapshots,
+        random.Random(7),
+        [DAY_ONE, DAY_TWO],
+        ["07时00分", "08时00分", "09时00分", "10时00分"],
+    )
+    rng = random.Random(3)
+    # 索引只需判断最新的快照：打乱记录顺序后，结果与按时间顺序扫描一致
+    for count in range(1, len(snapshots) + 1):
+        shuffled = list(enumerate(snapshots[:count]))
+        rng.shuffle(shuffled)
+        index = SeenTitleIndex(tmp_path, horizon=horizon)
+        for position, (date_folder, time_info, titles_by_id) in shuffled:
+            index.record(date_folder, time_info, float(position), titles_by_id)
+
+        date_folder, time_info, titles_by_id = snapshots[count - 1]
+        expected = scan_new_titles(snapshots, horizon, date_folder, time_info, titles_by_id)
+        assert index.new_titles(date_folder, time_info, titles_by_id) == expected
+
+
+def test_platform_failed_in_previous_snapshot(tmp_path):
+    first = {"weibo": {"甲": {"ranks": [1]}, "乙": {"ranks": [2]}}, "baidu": {"丙": {"ranks": [1]}}}
+    # weibo 在第二次爬取时请求失败
+    second = {"baidu": {"丙": {"ranks": [1]}}}
+    third = {"weibo": {"甲": {"ranks": [1]}, "丁": {"ranks": [2]}}, "baidu": {"丙": {"ranks": [1]}}}
+    snapshots = [(DAY_ONE, "08时00分", first), (DAY_ONE, "09时00分", second), (DAY_ONE, "10时00分", third)]
+
+    index = SeenTitleIndex(tmp_path)
+    for position, snapshot in enumerate(snapshots):
+        index.record(snapshot[0], snapshot[1], float(position), snapshot[2])
+
+    new_titles = index.new_titles(DAY_ONE, "10时00分", third)
+    assert new_titles == scan_new_titles(snapshots, "today", DAY_ONE, "10时00分", third)
+    # 失败前出现过的标题不算新增
+    assert new_titles == {"weibo": {"丁": {"ranks": [2]}}}
+
+
+def test_first_crawl_of_the_day(tmp_path):
+    yesterday = {"weibo": {"甲": {"ranks": [1]}}}
+    today = {"weibo": {"甲": {"ranks": [1]}, "乙": {"ranks": [2]}}}
+    index = SeenTitleIndex(tmp_path)
+    index.record(DAY_ONE, "23时00分", 1.0, yesterday)
+    index.record(DAY_TWO, "08时00分", 2.0, today)
+
+    # 当天首次爬取没有更早的快照，不把全部标题当作新增
+    assert index.new_titles(DAY_TWO, "08时00分", today) == {}
+    assert scan_new_titles([(DAY_TWO, "08时00分", today)], "today", DAY_TWO, "08时00分", today) == {}
+
+    # 跨天的时间范围内前一天的快照算作历史
+    index = SeenTitleIndex(tmp_path / "24h", horizon="24h")
+    index.record(DAY_ONE, "23时00分", 1.0, yesterday)
+    index.record(DAY_TWO, "08时00分", 2.0, today)
+    assert index.new_titles(DAY_TWO, "08时00分", today) == {"weibo": {"乙": {"ranks": [2]}}}
+
+
+def test_saved_index_reloads_and_detects_overwritten_snapshots(tmp_path, make_snapshots):
+    snapshots = make_day_snapshots(
+        make_snapshots, random.Random(11), [DAY_ONE], ["08时00分", "09时00分", "10时00分"]
+    )
+    index = SeenTitleIndex(tmp_path)
+    for position, (date_folder, time_info, titles_by_id) in enumerate(snapshots):
+        index.record(date_folder, time_info, float(position), titles_by_id)
+    index.save()
+
+    reloaded = SeenTitleIndex(tmp_path)
+    assert reloaded.is_recorded(DAY_ONE, "09时00分", 1.0)
+    # 同一时间的快照被覆盖（写入时刻变化）视为未记录
+    assert not reloaded.is_recorded(DAY_ONE, "09时00分", 5.0)
+    date_folder, time_info, titles_by_id = snapshots[-1]
+    assert reloaded.new_titles(date_folder, time_info, titles_by_id) == scan_new_titles(
+        snapshots, "today", date_folder, time_info, titles_by_id
+    )
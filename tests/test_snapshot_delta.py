@@ -0,0 +1,116 @@
+"""
+快照增量记录：回放增量得到的标题排名、以及每个快照的新增/消失标题，与直接对比完整快照的结果一致
+"""
+
+import random
+
+from trendradar.snapshot_delta import SnapshotDeltas, diff_snapshot, new_deltas, replay_deltas
+
+DATE = "2025年11月12日"
+
+
+def full_ranks(titles_by_id):
+    """直接从完整快照取标题排名 {平台ID: {标题: 排名}}"""
+    return {
+        source_id: {title: data["ranks"][0] for title, data in title_data.items()}
+        for source_id, title_data in titles_by_id.items()
+        if title_data
+    }
+
+
+def compute_deltas(snapshots):
+    state = {}
+    return [
+        diff_snapshot(state, time_info, float(position), titles_by_id)
+        for position, (time_info, titles_by_id) in enumerate(snapshots)
+    ]
+
+
+def test_replay_matches_every_snapshot(make_snapshots):
+    snapshots = make_snapshots(random.Random(1), [f"{hour:02d}时00分" for hour in range(8, 20)])
+    records = compute_deltas(snapshots)
+    for count in range(1, len(snapshots) + 1):
+        assert replay_deltas(records[:count]) == full_ranks(snapshots[count - 1][1])
+
+
+def test_added_and_removed_match_snapshot_comparison(make_snapshots):
+    snapshots = make_snapshots(random.Random(2), [f"{hour:02d}时30分" for hour in range(8, 20)])
+    records = compute_deltas(snapshots)
+    previous = {}
+    for (_, titles_by_id), record in zip(snapshots, records):
+        current = full_ranks(titles_by_id)
+        for source_id in set(previous) | set(current):
+            delta = record["platforms"].get(source_id, {})
+            old_titles = previous.get(source_id, {})
+            new_titles = current.get(source_id, {})
+            assert {entry[0] for entry in delta.get("added", [])} == set(new_titles) - set(old_titles)
+            assert set(delta.get("removed", [])) == set(old_titles) - set(new_titles)
+            assert {entry[0] for entry in delta.get("moved", [])} == {
+                title for title in set(new_titles) & set(old_titles)
+                if new_titles[title] != old_titles[title]
+            }
+        previous = current
+
+
+def test_first_snapshot_of_the_day_adds_everything(make_snapshots):
+    (time_info, titles_by_id), = make_snapshots(random.Random(3), ["08时00分"], ("baidu", "weibo"))
+    record = diff_snapshot({}, time_info, 1.0, titles_by_id)
+    for source_id, title_data in titles_by_id.items():
+        added = record["platforms"][source_id]["added"]
+        assert [entry[0] for entry in added] == list(title_data)
+        assert [entry[2] for entry in added] == [data["url"] for data in title_data.values()]
+        assert set(record["platforms"][source_id]) == {"added"}
+
+
+def test_platform_failed_in_previous_snapshot():
+    first = {"weibo": {"甲": {"ranks": [1]}, "乙": {"ranks": [2]}}, "baidu": {"丙": {"ranks": [1]}}}
+    second = {"baidu": {"丙": {"ranks": [1]}}}
+    third = {"weibo": {"甲": {"ranks": [2]}, "丁": {"ranks": [1]}}, "baidu": {"丙": {"ranks": [1]}}}
+    records = compute_deltas([("08时00分", first), ("09时00分", second), ("10时00分", third)])
+
+    # 失败的平台记为全部消失，恢复后全部记为新增
+    assert records[1]["platforms"] == {"weibo": {"removed": ["甲", "乙"]}}
+    assert {entry[0] for entry in records[2]["platforms"]["weibo"]["added"]} == {"甲", "丁"}
+    assert "baidu" not in records[2]["platforms"]
+    assert replay_deltas(records) == full_ranks(third)
+
+
+def test_load_recomputes_from_first_mismatch(tmp_path, make_snapshots):
+    store = SnapshotDeltas(tmp_path)
+    snapshots = make_snapshots(random.Random(4), ["08时00分", "09时00分", "10时00分", "11时00分"])
+    deltas = new_deltas()
+    deltas["records"] = compute_deltas(snapshots)
+    store.save(DATE, deltas)
+    listed = [(time_info, float(position)) for position, (time_info, _) in enumerate(snapshots)]
+
+    # 快照列表未变时全部沿用
+    loaded, pending = store.load(DATE, listed)
+    assert pending == [] and loaded == deltas
+
+    # 补入一个更早时间的快照（乱序写入），并覆盖 10时00分 的快照
+    late = make_snapshots(random.Random(5), ["08时30分"])[0]
+    rewritten = make_snapshots(random.Random(6), ["10时00分"])[0]
+    updated = [snapshots[0], late, snapshots[1], rewritten, snapshots[3]]
+    stamps = {"08时30分": 10.0, "10时00分": 11.0}
+    updated_listed = [
+        (time_info, stamps.get(time_info, dict(listed).get(time_info)))
+        for time_info, _ in updated
+    ]
+    loaded, pending = store.load(DATE, updated_listed)
+    assert [record["time"] for record in loaded["records"]] == ["08时00分"]
+    assert pending == ["08时30分", "09时00分", "10时00分", "11时00分"]
+
+    # 从保留的前缀继续计算，与从头计算整个序列的结果一致
+    state = replay_deltas(loaded["records"])
+    titles = dict(updated)
+    for time_info in pending:
+        loaded["records"].append(
+            diff_snapshot(state, time_info, dict(updated_listed)[time_info], titles[time_info])
+        )
+    state = {}
+    expected = [
+        diff_snapshot(state, time_info, stamp, titles[time_info])
+        for time_info, stamp in updated_listed
+    ]
+    assert loaded["records"] == expected
+    assert replay_deltas(loaded["records"]) == full_ranks(updated[-1][1])
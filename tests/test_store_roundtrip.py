@@ -0,0 +1,170 @@
+"""
+快照存储往返：SQLite、二进制快照、日期归档和月度打包保存后读取的结果，与写入 txt 快照
+再解析的结果一致（标题清理、排序、缺少平台名称、没有标题的平台和请求失败的平台）
+"""
+
+import os
+import random
+
+import pytest
+
+from trendradar.binary_snapshot import BinarySnapshotStore
+from trendradar.day_archive import DayArchiveStore, compact_day
+from trendradar.models import NewsItem
+from trendradar.month_pack import MonthPackStore
+from trendradar.snapshot import parse_titles, write_titles_file
+from trendradar.sqlite_store import SQLiteNewsStore
+
+DATE = "2025年11月12日"
+OTHER_DATE = "2025年11月13日"
+MONTH = "2025年11月"
+ID_TO_NAME = {"weibo": "微博", "zhihu": "知乎", "toutiao": "toutiao", "bilibili": "哔哩哔哩"}
+CRAWLED_AT = 1762905600.0
+
+
+def edge_case_snapshots():
+    """标题需要清理、排名相同或缺失、只有手机链接、平台名称缺失或与ID相同"""
+    return [
+        (
+            "07时30分",
+            {
+                "weibo": {
+                    "  多余  空格的 标题 ": {"ranks": [3], "url": "https://example.com/a", "mobileUrl": "https://m.example.com/a"},
+                    "排名相同 一": {"ranks": [1], "url": "https://example.com/b", "mobileUrl": ""},
+                    "排名相同 二": {"ranks": [1], "url": "", "mobileUrl": "https://m.example.com/c"},
+                    "换行\n的标题": {"ranks": [2, 5], "url": "", "mobileUrl": ""},
+                    "没有排名": {"ranks": [], "url": "", "mobileUrl": ""},
+                },
+                "zhihu": {},
+                "toutiao": {
+                    "条目 对象": NewsItem("条目 对象", [1], "https://example.com/d"),
+                },
+                # 没有平台名称
+                "baidu": {"百度 标题": {"ranks": [1], "url": "", "mobileUrl": ""}},
+            },
+            ["bilibili"],
+        ),
+        # 所有平台请求失败
+        ("08时00分", {}, ["weibo", "zhihu"]),
+    ]
+
+
+def build_snapshots(make_snapshots):
+    snapshots = edge_case_snapshots()
+    for time_info, titles_by_id in make_snapshots(
+        random.Random(17), ["09时00分", "10时00分", "11时00分"], platforms=("weibo", "zhihu", "bilibili")
+    ):
+        failed_ids = [source_id for source_id in ("weibo", "zhihu", "bilibili") if source_id not in titles_by_id]
+        snapshots.append((time_info, titles_by_id, failed_ids))
+    return snapshots
+
+
+def write_txt_day(output_dir, date_folder, snapshots):
+    txt_dir = output_dir / date_folder / "txt"
+    txt_dir.mkdir(parents=True, exist_ok=True)
+    for number, (time_info, titles_by_id, failed_ids) in enumerate(snapshots):
+        file_path = txt_dir / f"{time_info}.txt"
+        write_titles_file(str(file_path), titles_by_id, ID_TO_NAME, failed_ids)
+        os.utime(file_path, (CRAWLED_AT + number, CRAWLED_AT + number))
+
+
+def expected_from_txt(tmp_path, snapshots):
+    """写入 txt 快照后解析：[(时间, titles_by_id, id_to_name)] 和 {时间: 失败平台}"""
+    reference_dir = tmp_path / "reference"
+    write_txt_day(reference_dir, DATE, snapshots)
+    expected, failed = [], {}
+    for time_info, _, _ in snapshots:
+        with open(reference_dir / DATE / "txt" / f"{time_info}.txt", "r", encoding="utf-8") as f:
+            titles_by_id, id_to_name, failed_ids = parse_titles(f.read())
+        expected.append((time_info, titles_by_id, id_to_name))
+        failed[time_info] = failed_ids
+    return expected, failed
+
+
+def save_sqlite(output_dir, snapshots):
+    store = SQLiteNewsStore(output_dir / "news.db")
+    for number, (time_info, titles_by_id, failed_ids) in enumerate(snapshots):
+        store.save_snapshot(DATE, time_info, titles_by_id, ID_TO_NAME, failed_ids, crawled_at=CRAWLED_AT + number)
+    return store
+
+
+def save_binary(output_dir, snapshots):
+    store = BinarySnapshotStore(output_dir)
+    for number, (time_info, titles_by_id, failed_ids) in enumerate(snapshots):
+        store.save_snapshot(DATE, time_info, titles_by_id, ID_TO_NAME, failed_ids, crawled_at=CRAWLED_AT + number)
+    return store
+
+
+def save_archive(output_dir, snapshots):
+    write_txt_day(output_dir, DATE, snapshots)
+    compact_day(output_dir, DATE)
+    return DayArchiveStore(output_dir)
+
+
+def save_binary_archive(output_dir, snapshots):
+    save_binary(output_dir, snapshots)
+    compact_day(output_dir, DATE)
+    return DayArchiveStore(output_dir)
+
+
+def save_pack(output_dir, snapshots):
+    write_txt_day(output_dir, DATE, snapshots)
+    MonthPackStore(output_dir).pack_month(MONTH)
+    return MonthPackStore(output_dir)
+
+
+def save_archive_pack(output_dir, snapshots):
+    # 先压缩为日期归档，再打包进月度文件；同月另一天保持为日期目录
+    save_archive(output_dir, snapshots)
+    write_txt_day(output_dir, OTHER_DATE, snapshots[:1])
+    MonthPackStore(output_dir).pack_month(MONTH)
+    return MonthPackStore(output_dir)
+
+
+STORES = {
+    "sqlite": save_sqlite,
+    "binary": save_binary,
+    "archive": save_archive,
+    "binary_archive": save_binary_archive,
+    "pack": save_pack,
+    "archive_pack": save_archive_pack,
+}
+
+
+@pytest.mark.parametrize("backend", sorted(STORES))
+def test_store_matches_txt(tmp_path, make_snapshots, backend):
+    snapshots = build_snapshots(make_snapshots)
+    expected, failed = expected_from_txt(tmp_path, snapshots)
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    store = STORES[backend](output_dir, snapshots)
+
+    assert store.has_date(DATE)
+    assert store.load_day(DATE) == expected
+    assert store.list_snapshots(DATE) == [
+        (time_info, CRAWLED_AT + number) for number, (time_info, _, _) in enumerate(snapshots)
+    ]
+    for time_info, _, _ in snapshots:
+        assert store.load_failed_ids(DATE, time_info) == failed[time_info]
+
+
+@pytest.mark.parametrize("backend", sorted(STORES))
+def test_store_filters_match_txt(tmp_path, make_snapshots, backend):
+    snapshots = build_snapshots(make_snapshots)
+    expected, _ = expected_from_txt(tmp_path, snapshots)
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    store = STORES[backend](output_dir, snapshots)
+
+    times = ["07时30分", "10时00分"]
+    filtered = [
+        (
+            time_info,
+            {k: v for k, v in titles_by_id.items() if k in ("weibo", "toutiao")},
+            {k: v for k, v in id_to_name.items() if k in ("weibo", "toutiao")},
+        )
+        for time_info, titles_by_id, id_to_name in expected
+        if time_info in times
+    ]
+    assert store.load_day(DATE, platform_ids=["weibo", "toutiao"], times=times) == filtered
+    assert store.load_day("2025年11月20日") == []
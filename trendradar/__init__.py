@@ -0,0 +1,5 @@
+"""
+TrendRadar 核心库
+
+main.py 定时任务与 MCP Server 共用的爬取、网络和工具模块。
+"""
@@ -0,0 +1,131 @@
+"""
+原始响应归档与离线回放
+
+开启归档后，每次爬取的各平台原始响应会压缩保存到 output/.raw_archive，
+文件名为运行时间（北京时间），如 20251019-083000.jsonl.gz。
+回放时按平台ID从归档中读取响应，不访问网络，用于基准测试、性能分析和复现线上问题。
+"""
+
+import gzip
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .utils import get_beijing_time
+
+
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+
+class ArchivedRun:
+    """一次运行的归档内容"""
+
+    def __init__(self, run_key: str, entries: Dict[str, Dict]):
+        self.run_key = run_key
+        self.entries = entries
+
+    def get(self, id_value: str) -> Optional[Dict]:
+        """
+        获取平台的归档记录
+
+        Returns:
+            {"raw": bytes 或 None, "error": str 或 None}，未归档该平台时返回 None
+        """
+        return self.entries.get(id_value)
+
+
+class ResponseArchive:
+    """原始响应归档，记录线程安全，每次运行写入一个 gzip 压缩的 JSON Lines 文件"""
+
+    def __init__(
+        self, archive_dir: Union[str, Path] = Path("output") / ".raw_archive"
+    ):
+        self.archive_dir = Path(archive_dir)
+        self.run_key: Optional[str] = None
+        self._records: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def start_run(self, run_key: Optional[str] = None) -> str:
+        """开始记录新一次运行，返回运行标识"""
+        with self._lock:
+            self.run_key = run_key or get_beijing_time().strftime("%Y%m%d-%H%M%S")
+            self._records = []
+        return self.run_key
+
+    def record(
+        self, id_value: str, raw: Optional[bytes], error: Optional[str] = None
+    ) -> None:
+        """记录平台的原始响应，请求最终失败时 raw 为 None 并记录错误信息"""
+        record = {
+            "id": id_value,
+            "fetched_at": get_beijing_time().strftime("%Y-%m-%d %H:%M:%S"),
+            "payload": raw.decode("utf-8", errors="replace") if raw is not None else None,
+            "error": error,
+        }
+        with self._lock:
+            self._records.append(record)
+
+    def save(self) -> Optional[Path]:
+        """写入本次运行的归档文件，没有记录时不写入"""
+        with self._lock:
+            if not self.run_key or not self._records:
+                return None
+            records = list(self._records)
+            file_path = self.archive_dir / f"{self.run_key}{ARCHIVE_SUFFIX}"
+
+        try:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write("\n")
+            os.replace(tmp_path, file_path)
+            return file_path
+        except Exception as e:
+            print(f"保存原始响应归档失败: {e}")
+            return None
+
+    def list_runs(self) -> List[str]:
+        """按时间顺序列出已归档的运行标识"""
+        if not self.archive_dir.exists():
+            return []
+        return sorted(
+            path.name[: -len(ARCHIVE_SUFFIX)]
+            for path in self.archive_dir.glob(f"*{ARCHIVE_SUFFIX}")
+        )
+
+    def load_run(self, run_key: str = "latest") -> ArchivedRun:
+        """
+        读取一次运行的归档
+
+        Args:
+            run_key: 运行标识，"latest" 表示最近一次
+
+        Raises:
+            ValueError: 找不到对应归档
+        """
+        if run_key == "latest":
+            runs = self.list_runs()
+            if not runs:
+                raise ValueError(f"归档目录中没有可回放的数据: {self.archive_dir}")
+            run_key = runs[-1]
+
+        file_path = self.archive_dir / f"{run_key}{ARCHIVE_SUFFIX}"
+        if not file_path.exists():
+            raise ValueError(f"找不到回放归档: {file_path}")
+
+        entries = {}
+        with gzip.open(file_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                payload = record.get("payload")
+                entries[record["id"]] = {
+                    "raw": payload.encode("utf-8") if payload is not None else None,
+                    "error": record.get("error"),
+                }
+        return ArchivedRun(run_key, entries)
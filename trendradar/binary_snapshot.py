@@ -0,0 +1,315 @@
+"""
+二进制快照格式
+
+txt 快照每行都要做字符串切分才能解析，且每个快照都完整重复所有链接。二进制格式将
+快照编码为定长整数数组加一张去重的字符串表，整体再用 zlib 压缩，解码时只需一次
+解压、一次 UTF-8 解码和数组读取，保存在 output/<日期>/bin/<时间>.bin。
+
+文件结构（整数均为小端序）：
+    头部    magic "TRSN" | 版本 u8 | 标志 u8（bit0: zlib 压缩）| 正文长度 u32
+    正文    字符串数 u32 | 平台数 u32 | 标题数 u32 | 失败平台数 u32 | 字符串表字节数 u32
+            字符串表（UTF-8，以 \\0 分隔，第 0 项固定为空字符串）
+            平台数组 u32[平台数 × 3]：平台ID、平台名称（字符串序号）、标题数
+            标题数组 u32[标题数 × 4]：排名、标题、url、mobileUrl（后三项为字符串序号）
+            失败平台数组 u32[失败平台数]：平台ID（字符串序号）
+
+命令行用法：
+    python -m trendradar.binary_snapshot convert output [--remove-txt]   # 转换已有 txt 快照
+    python -m trendradar.binary_snapshot export 2025年11月12日            # 导出某天的 txt 快照
+"""
+
+import argparse
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .day_manifest import DayManifest
+from .snapshot import parse_titles, sort_titles, write_titles_file
+
+MAGIC = b"TRSN"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+HEADER = struct.Struct("<4sBBI")
+COUNTS = struct.Struct("<5I")
+BIN_SUFFIX = ".bin"
+
+# 快照内容：(时间, {平台ID: {标题: {ranks, url, mobileUrl}}}, {平台ID: 平台名称})
+DaySnapshot = Tuple[str, Dict, Dict]
+
+
+def _u32_array(values: List[int]) -> bytes:
+    data = array("I", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _read_u32_array(body: bytes, offset: int, count: int) -> Tuple[array, int]:
+    data = array("I")
+    end = offset + count * 4
+    data.frombytes(body[offset:end])
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data, end
+
+
+def encode_snapshot(
+    results: Dict, id_to_name: Dict, failed_ids: List, compress: bool = True
+) -> bytes:
+    """将爬取结果编码为二进制快照，标题的清理和排序与 txt 快照一致"""
+    strings: List[str] = [""]
+    string_index: Dict[str, int] = {"": 0}
+
+    def intern(value: str) -> int:
+        # \0 是字符串表的分隔符，标题中极少出现，直接去除
+        value = value.replace("\0", "")
+        index = string_index.get(value)
+        if index is None:
+            index = string_index[value] = len(strings)
+            strings.append(value)
+        return index
+
+    platforms: List[int] = []
+    titles: List[int] = []
+    for id_value, title_data in results.items():
+        sorted_titles = sort_titles(title_data)
+        platforms.extend(
+            (intern(id_value), intern(id_to_name.get(id_value) or id_value), len(sorted_titles))
+        )
+        for rank, title, url, mobile_url in sorted_titles:
+            titles.extend((rank, intern(title), intern(url), intern(mobile_url)))
+    failed = [intern(id_value) for id_value in failed_ids]
+
+    string_blob = "\0".join(strings).encode("utf-8")
+    body = b"".join([
+        COUNTS.pack(len(strings), len(results), len(titles) // 4, len(failed), len(string_blob)),
+        string_blob,
+        _u32_array(platforms),
+        _u32_array(titles),
+        _u32_array(failed),
+    ])
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+    return HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(body)) + body
+
+
+def decode_snapshot(data: bytes) -> Tuple[Dict, Dict, List]:
+    """
+    解码二进制快照，结果与 snapshot.parse_titles 解析对应 txt 快照相同
+
+    Returns:
+        (titles_by_id, id_to_name, failed_ids)，没有标题的平台不包含在内
+
+    Raises:
+        ValueError: 文件格式或版本不正确
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("二进制快照文件不完整")
+    magic, version, flags, body_length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("不是二进制快照文件")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"不支持的二进制快照版本: {version}")
+    body = data[HEADER.size:HEADER.size + body_length]
+    if len(body) != body_length:
+        raise ValueError("二进制快照文件不完整")
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    string_count, platform_count, title_count, failed_count, blob_length = COUNTS.unpack_from(body)
+    offset = COUNTS.size
+    strings = body[offset:offset + blob_length].decode("utf-8").split("\0")
+    if len(strings) != string_count:
+        raise ValueError("二进制快照字符串表损坏")
+    offset += blob_length
+    platforms, offset = _read_u32_array(body, offset, platform_count * 3)
+    titles, offset = _read_u32_array(body, offset, title_count * 4)
+    failed, offset = _read_u32_array(body, offset, failed_count)
+
+    titles_by_id: Dict = {}
+    id_to_name: Dict = {}
+    # 按列切分后用 zip 遍历，避免逐个下标访问
+    ranks = titles[0::4]
+    title_refs = [strings[i] for i in titles[1::4]]
+    url_refs = [strings[i] for i in titles[2::4]]
+    mobile_refs = [strings[i] for i in titles[3::4]]
+    start = 0
+    for index in range(0, len(platforms), 3):
+        end = start + platforms[index + 2]
+        if end == start:
+            continue
+        source_id = strings[platforms[index]]
+        id_to_name[source_id] = strings[platforms[index + 1]]
+        titles_by_id[source_id] = {
+            title: {"ranks": [rank], "url": url, "mobileUrl": mobile_url}
+            for rank, title, url, mobile_url in zip(
+                ranks[start:end],
+                title_refs[start:end],
+                url_refs[start:end],
+                mobile_refs[start:end],
+            )
+        }
+        start = end
+    return titles_by_id, id_to_name, [strings[i] for i in failed]
+
+
+class BinarySnapshotStore:
+    """二进制快照存储，每次爬取一个 .bin 文件，接口与 SQLiteNewsStore 一致"""
+
+    def __init__(self, output_dir: Union[str, Path] = "output"):
+        self.output_dir = Path(output_dir)
+
+    def _bin_dir(self, date_folder: str) -> Path:
+        return self.output_dir / date_folder / "bin"
+
+    def save_snapshot(
+        self,
+        date_folder: str,
+        time_info: str,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        crawled_at: Optional[float] = None,
+    ) -> Path:
+        """写入一次爬取快照，同一时间的快照会被覆盖"""
+        bin_dir = self._bin_dir(date_folder)
+        bin_dir.mkdir(parents=True, exist_ok=True)
+        file_path = bin_dir / f"{time_info}{BIN_SUFFIX}"
+        tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(encode_snapshot(results, id_to_name, failed_ids))
+        os.replace(tmp_path, file_path)
+        if crawled_at is not None:
+            os.utime(file_path, (crawled_at, crawled_at))
+        return file_path
+
+    def list_snapshots(self, date_folder: str) -> List[Tuple[str, float]]:
+        """按时间顺序列出某天的快照 [(时间, 爬取时刻)]"""
+        bin_dir = self._bin_dir(date_folder)
+        if not bin_dir.exists():
+            return []
+        return [
+            (file_path.stem, file_path.stat().st_mtime)
+            for file_path in sorted(bin_dir.glob(f"*{BIN_SUFFIX}"))
+        ]
+
+    def has_date(self, date_folder: str) -> bool:
+        return bool(self.list_snapshots(date_folder))
+
+    def snapshot_path(self, date_folder: str, time_info: str) -> Path:
+        return self._bin_dir(date_folder) / f"{time_info}{BIN_SUFFIX}"
+
+    def _read(self, date_folder: str, time_info: str) -> Tuple[Dict, Dict, List]:
+        with open(self.snapshot_path(date_folder, time_info), "rb") as f:
+            return decode_snapshot(f.read())
+
+    def load_day(
+        self,
+        date_folder: str,
+        platform_ids: Optional[List[str]] = None,
+        times: Optional[List[str]] = None,
+    ) -> List[DaySnapshot]:
+        """按时间顺序读取某天的快照，结构与解析 txt 快照相同"""
+        snapshots = []
+        for time_info, _ in self.list_snapshots(date_folder):
+            if times is not None and time_info not in times:
+                continue
+            titles_by_id, id_to_name, _ = self._read(date_folder, time_info)
+            if platform_ids is not None:
+                titles_by_id = {
+                    source_id: title_data
+                    for source_id, title_data in titles_by_id.items()
+                    if source_id in platform_ids
+                }
+                id_to_name = {
+                    source_id: name
+                    for source_id, name in id_to_name.items()
+                    if source_id in titles_by_id
+                }
+            snapshots.append((time_info, titles_by_id, id_to_name))
+        return snapshots
+
+    def load_failed_ids(self, date_folder: str, time_info: str) -> List[str]:
+        """某次快照中请求失败的平台"""
+        return self._read(date_folder, time_info)[2]
+
+    def export_txt(self, date_folder: str, output_dir: Union[str, Path] = "output") -> List[Path]:
+        """将某天的快照导出为 txt 快照文件，返回写入的文件列表"""
+        txt_dir = Path(output_dir) / date_folder / "txt"
+        txt_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for time_info, _ in self.list_snapshots(date_folder):
+            titles_by_id, id_to_name, failed_ids = self._read(date_folder, time_info)
+            file_path = txt_dir / f"{time_info}.txt"
+            write_titles_file(str(file_path), titles_by_id, id_to_name, failed_ids)
+            written.append(file_path)
+        # 导出的 txt 快照整体替换了该天的 txt 目录内容，重建快照清单
+        DayManifest(output_dir).rebuild(date_folder)
+        return written
+
+    def import_txt(
+        self, output_dir: Union[str, Path] = "output", remove_txt: bool = False
+    ) -> Tuple[int, int, int]:
+        """
+        将 output 目录下已有的 txt 快照转换为二进制快照
+
+        Args:
+            output_dir: 待转换的 output 目录
+            remove_txt: 转换并校验成功后是否删除 txt 文件
+
+        Returns:
+            (转换的快照数, txt 总字节数, 二进制总字节数)
+        """
+        count = txt_bytes = bin_bytes = 0
+        for date_dir in sorted(Path(output_dir).iterdir()):
+            txt_dir = date_dir / "txt"
+            if date_dir.name.startswith(".") or not txt_dir.is_dir():
+                continue
+            for txt_path in sorted(txt_dir.glob("*.txt")):
+                with open(txt_path, "r", encoding="utf-8") as f:
+                    parsed = parse_titles(f.read())
+                file_path = self.save_snapshot(
+                    date_dir.name,
+                    txt_path.stem,
+                    *parsed,
+                    crawled_at=txt_path.stat().st_mtime,
+                )
+                with open(file_path, "rb") as f:
+                    if decode_snapshot(f.read()) != parsed:
+                        raise ValueError(f"转换结果校验失败: {txt_path}")
+                count += 1
+                txt_bytes += txt_path.stat().st_size
+                bin_bytes += file_path.stat().st_size
+                if remove_txt:
+                    txt_path.unlink()
+        return count, txt_bytes, bin_bytes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrendRadar 二进制快照工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="将已有 txt 快照转换为二进制快照")
+    convert_parser.add_argument("output_dir", nargs="?", default="output")
+    convert_parser.add_argument("--remove-txt", action="store_true", help="转换并校验成功后删除 txt 文件")
+    export_parser = subparsers.add_parser("export", help="导出某天的 txt 快照")
+    export_parser.add_argument("date", help="日期，如 2025年11月12日")
+    export_parser.add_argument("--output-dir", default="output")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        store = BinarySnapshotStore(args.output_dir)
+        count, txt_bytes, bin_bytes = store.import_txt(args.output_dir, args.remove_txt)
+        ratio = bin_bytes / txt_bytes if txt_bytes else 0
+        print(
+            f"已转换 {count} 个快照：txt {txt_bytes / 1024:.1f} KB -> "
+            f"二进制 {bin_bytes / 1024:.1f} KB（{ratio:.1%}）"
+        )
+    else:
+        files = BinarySnapshotStore(args.output_dir).export_txt(args.date, args.output_dir)
+        print(f"已导出 {len(files)} 个快照文件")
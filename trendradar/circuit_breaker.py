@@ -0,0 +1,93 @@
+"""
+平台熔断器
+
+记录每个平台的连续失败次数，达到阈值后在冷却期内跳过该平台，
+冷却期结束后放行一次试探请求。状态持久化在 output/.crawl_cache 下，跨运行生效。
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Union
+
+
+class CircuitBreaker:
+    """按平台ID熔断"""
+
+    def __init__(
+        self,
+        state_dir: Union[str, Path] = Path("output") / ".crawl_cache",
+        failure_threshold: int = 3,
+        cooldown: int = 1800,
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            state_dir: 状态文件目录
+            failure_threshold: 连续失败多少次后熔断
+            cooldown: 熔断冷却时间（秒）
+        """
+        self.state_file = Path(state_dir) / "circuit_breaker.json"
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = max(0, cooldown)
+        self._lock = threading.Lock()
+        self.states: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """读取持久化的熔断状态"""
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"读取熔断状态失败: {e}")
+            return {}
+
+    def is_open(self, id_value: str) -> bool:
+        """平台是否处于熔断状态（冷却期结束后返回 False，放行一次试探）"""
+        with self._lock:
+            state = self.states.get(id_value)
+            if not state or state.get("failures", 0) < self.failure_threshold:
+                return False
+            return time.time() - state.get("opened_at", 0) < self.cooldown
+
+    def remaining_cooldown(self, id_value: str) -> int:
+        """熔断剩余冷却时间（秒）"""
+        with self._lock:
+            state = self.states.get(id_value, {})
+            remaining = state.get("opened_at", 0) + self.cooldown - time.time()
+            return max(0, int(remaining))
+
+    def record_success(self, id_value: str) -> None:
+        """请求成功，重置失败计数"""
+        with self._lock:
+            if self.states.pop(id_value, None) is not None:
+                print(f"{id_value} 已恢复，解除熔断")
+
+    def record_failure(self, id_value: str) -> None:
+        """请求失败，累计失败次数，达到阈值时（重新）开始冷却"""
+        with self._lock:
+            state = self.states.setdefault(id_value, {"failures": 0, "opened_at": 0})
+            state["failures"] += 1
+            if state["failures"] >= self.failure_threshold:
+                state["opened_at"] = time.time()
+                print(
+                    f"{id_value} 连续失败 {state['failures']} 次，熔断 {self.cooldown} 秒"
+                )
+
+    def save(self) -> None:
+        """持久化熔断状态（先写临时文件再替换，避免并发读到半个文件）"""
+        with self._lock:
+            states = dict(self.states)
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(states, f, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"保存熔断状态失败: {e}")
@@ -0,0 +1,80 @@
+"""
+请求合并
+
+同一平台的重复请求共享一次上游请求：进行中的请求由后来者等待并复用结果，
+已完成的结果在新鲜窗口内直接复用。用于 MCP Server 中多个客户端短时间内
+反复触发 trigger_crawl 的场景，减少上游压力和等待时间。
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .models import PlatformPayload
+
+
+class Flight:
+    """一次上游请求"""
+
+    # outcome 取值：ok 成功，failed 失败（后来者共享失败结果），
+    # abandoned 发起方因取消或超时放弃（后来者需要自行请求）
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload: Optional[PlatformPayload] = None
+        self.outcome: Optional[str] = None
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+
+
+class FetchCoalescer:
+    """按平台合并请求，线程安全"""
+
+    def __init__(self, freshness_window: float = 60):
+        """
+        Args:
+            freshness_window: 已完成结果的复用时间（秒），0 表示只合并进行中的请求
+        """
+        self.freshness_window = freshness_window
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, id_value: str) -> Tuple[str, Flight]:
+        """
+        登记一次请求
+
+        Returns:
+            (role, flight)：role 为 "lead" 时由调用方发起请求并在结束后调用 finish；
+            为 "follow" 时等待 flight.done；为 "cached" 时直接使用 flight.payload
+        """
+        now = time.monotonic()
+        with self._lock:
+            flight = self._flights.get(id_value)
+            if flight is not None:
+                if not flight.done.is_set():
+                    return "follow", flight
+                if (
+                    flight.outcome == "ok"
+                    and now - flight.finished_at < self.freshness_window
+                ):
+                    return "cached", flight
+            flight = Flight()
+            self._flights[id_value] = flight
+            return "lead", flight
+
+    def finish(
+        self,
+        id_value: str,
+        flight: Flight,
+        payload: Optional[PlatformPayload],
+        outcome: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """记录请求结果并唤醒等待者；失败和放弃的结果不会在窗口内复用"""
+        flight.payload = payload
+        flight.outcome = outcome
+        flight.error = error
+        flight.finished_at = time.monotonic()
+        with self._lock:
+            if outcome != "ok" and self._flights.get(id_value) is flight:
+                del self._flights[id_value]
+        flight.done.set()
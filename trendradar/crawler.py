@@ -0,0 +1,789 @@
+"""
+爬取引擎
+
+main.py 定时任务与 MCP Server 的 trigger_crawl 共用的新闻平台爬取实现，
+支持串行/并发爬取、按主机限流、连接池复用、响应指纹缓存、平台熔断、整体截止时间、
+原始响应归档和离线回放、按平台记录的爬取遥测、跨任务的重复请求合并，
+以及按健康评分分配请求的代理池。
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from .archive import ArchivedRun, ResponseArchive
+from .circuit_breaker import CircuitBreaker
+from .coalescer import Flight, FetchCoalescer
+from .http_client import HttpClient, get_http_client, measure_connection
+from .models import NewsItem, PlatformPayload
+from .proxy_pool import ProxyPool, redact_proxy
+from .telemetry import CrawlTelemetry, new_platform_metrics
+from .utils import get_beijing_time, json_loads
+
+
+DEFAULT_API_URL = "https://newsnow.busiyi.world/api/s"
+# 串行爬取时两次请求的间隔(毫秒)，config.yaml 未配置 crawler.request_interval 时使用
+DEFAULT_REQUEST_INTERVAL = 1000
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    "Connection": "keep-alive",
+    "Cache-Control": "no-cache",
+}
+
+IdInfo = Union[str, Tuple[str, str]]
+
+
+class HostRateLimiter:
+    """按上游主机限制并发数和请求发起间隔"""
+
+    def __init__(self, max_concurrency: int = 4, min_interval_ms: int = 100):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_interval = max(0, min_interval_ms) / 1000
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextmanager
+    def limit(self, url: str):
+        """占用目标主机的一个请求名额，并保证与上一次请求发起的最小间隔"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(
+                    self.max_concurrency
+                )
+            semaphore = self._semaphores[host]
+
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start_at + self.min_interval
+
+            wait_time = start_at - time.monotonic()
+            if wait_time > 0:
+                time.sleep(wait_time)
+            yield
+
+
+class CrawlFingerprintCache:
+    """平台响应指纹缓存：内容未变化的平台直接复用上次的解析结果"""
+
+    # 与榜单内容无关、每次请求都可能变化的顶层字段，不参与指纹计算
+    VOLATILE_FIELDS_PATTERN = re.compile(
+        rb'"(?:status|updatedTime)"\s*:\s*(?:"[^"]*"|\d+)\s*,?'
+    )
+
+    def __init__(self, cache_dir: Union[str, Path] = Path("output") / ".crawl_cache"):
+        self.cache_file = Path(cache_dir) / "fingerprints.json"
+        self.entries = self._load()
+
+    def _load(self) -> Dict:
+        """读取上次运行保存的指纹"""
+        if not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, "rb") as f:
+                return json_loads(f.read())
+        except Exception as e:
+            print(f"读取爬取指纹缓存失败: {e}")
+            return {}
+
+    @classmethod
+    def fingerprint(cls, raw: bytes) -> str:
+        """计算响应内容指纹"""
+        content = cls.VOLATILE_FIELDS_PATTERN.sub(b"", raw)
+        return hashlib.sha1(content).hexdigest()
+
+    def get_unchanged(
+        self, id_value: str, fingerprint: str
+    ) -> Optional[Dict[str, NewsItem]]:
+        """指纹与上次一致时返回上次的解析结果"""
+        entry = self.entries.get(id_value)
+        if entry and entry.get("fingerprint") == fingerprint:
+            return {
+                title: NewsItem.from_compact(title, value)
+                for title, value in entry.get("titles", {}).items()
+            }
+        return None
+
+    def get_latest(self, id_value: str) -> Optional[Dict[str, NewsItem]]:
+        """返回平台最近一次成功爬取的解析结果，不校验指纹"""
+        entry = self.entries.get(id_value)
+        if not entry or not entry.get("titles"):
+            return None
+        return {
+            title: NewsItem.from_compact(title, value)
+            for title, value in entry["titles"].items()
+        }
+
+    def update(
+        self, id_value: str, fingerprint: str, title_data: Dict[str, NewsItem]
+    ) -> None:
+        """记录平台的最新指纹和解析结果"""
+        self.entries[id_value] = {
+            "fingerprint": fingerprint,
+            "updated_time": get_beijing_time().strftime("%Y-%m-%d %H:%M:%S"),
+            "titles": {title: item.to_compact() for title, item in title_data.items()},
+        }
+
+    def save(self) -> None:
+        """持久化指纹缓存"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"保存爬取指纹缓存失败: {e}")
+
+
+class CrawlEngine:
+    """爬取引擎：同步接口供定时任务使用，异步接口供 MCP Server 使用"""
+
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        max_workers: int = 1,
+        host_max_concurrency: int = 4,
+        host_min_interval: int = 100,
+        request_interval: int = DEFAULT_REQUEST_INTERVAL,
+        fingerprint_cache: Optional[CrawlFingerprintCache] = None,
+        http_client: Optional[HttpClient] = None,
+        api_url: str = DEFAULT_API_URL,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        crawl_deadline: float = 0,
+        response_archive: Optional[ResponseArchive] = None,
+        replay_run: Optional[ArchivedRun] = None,
+        telemetry: Optional[CrawlTelemetry] = None,
+        coalescer: Optional[FetchCoalescer] = None,
+        proxy_pool: Optional[ProxyPool] = None,
+    ):
+        self.proxy_url = proxy_url
+        # 配置代理池时每次请求从池中选择代理，proxy_url 不再生效
+        self.proxy_pool = proxy_pool
+        self.max_workers = max(1, max_workers)
+        self.request_interval = request_interval
+        self.fingerprint_cache = fingerprint_cache
+        self.http_client = http_client
+        self.api_url = api_url
+        # 原始响应归档；回放模式下直接从归档读取，不访问网络也不限流
+        self.response_archive = response_archive
+        self.replay_run = replay_run
+        # 多个引擎共享同一个 coalescer 时，同一平台的重复请求只访问一次上游
+        self.coalescer = coalescer
+        # 串行模式沿用 request_interval 控制节奏，并发模式按主机限流
+        self.rate_limiter = (
+            HostRateLimiter(host_max_concurrency, host_min_interval)
+            if self.max_workers > 1 and replay_run is None
+            else None
+        )
+        self.circuit_breaker = circuit_breaker
+        # 整体爬取截止时间（秒），0 表示不限制
+        self.crawl_deadline = crawl_deadline
+        self._deadline: Optional[float] = None
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        # 最近一次爬取中内容与上次完全一致的平台
+        self.unchanged_ids: List[str] = []
+        # 最近一次爬取中因熔断跳过、因超过截止时间放弃、因取消而未完成的平台
+        self.skipped_ids: List[str] = []
+        self.timed_out_ids: List[str] = []
+        self.cancelled_ids: List[str] = []
+        # 最近一次爬取的各平台指标，配置 telemetry 时同时写入文件
+        self.telemetry = telemetry
+        self.run_key: Optional[str] = None
+        self.platform_metrics: Dict[str, Dict] = {}
+
+    def snapshot_metrics(self) -> Dict[str, Dict]:
+        """当前爬取各平台指标的副本，可在爬取进行中调用以查看进度"""
+        with self._lock:
+            return {
+                id_value: dict(metrics)
+                for id_value, metrics in self.platform_metrics.items()
+            }
+
+    def _metrics_for(self, id_value: str, name: Optional[str] = None) -> Dict:
+        """获取（或创建）平台在本次爬取中的指标记录"""
+        with self._lock:
+            metrics = self.platform_metrics.get(id_value)
+            if metrics is None:
+                metrics = new_platform_metrics(id_value, name or id_value)
+                self.platform_metrics[id_value] = metrics
+            return metrics
+
+    def cancel(self) -> None:
+        """
+        取消正在进行的爬取
+
+        尚未开始的平台不再请求，重试等待立即结束；已发出的请求在本次尝试结束后退出。
+        已获取的结果照常返回。
+        """
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _mark_cancelled(self, id_value: str) -> None:
+        """记录因取消而未完成的平台"""
+        with self._lock:
+            if id_value not in self.cancelled_ids:
+                self.cancelled_ids.append(id_value)
+            metrics = self.platform_metrics.get(id_value)
+            if metrics is not None:
+                metrics["status"] = "cancelled"
+
+    def _remaining_time(self, deadline: Optional[float] = None) -> Optional[float]:
+        """距离截止时间的剩余秒数，未设置截止时间时返回 None"""
+        if deadline is None:
+            deadline = self._deadline
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    def _mark_timed_out(self, id_value: str, deadline: Optional[float] = None) -> None:
+        """记录超时放弃的平台；上一轮爬取遗留线程的标记会被忽略"""
+        with self._lock:
+            if deadline is not None and deadline != self._deadline:
+                return
+            if id_value not in self.timed_out_ids:
+                self.timed_out_ids.append(id_value)
+            metrics = self.platform_metrics.get(id_value)
+            if metrics is not None:
+                metrics["status"] = "timed_out"
+
+    def fetch_data(
+        self,
+        id_info: IdInfo,
+        max_retries: int = 2,
+        min_retry_wait: int = 3,
+        max_retry_wait: int = 5,
+        deadline: Optional[float] = None,
+    ) -> Tuple[Optional[PlatformPayload], str, str]:
+        """获取指定ID数据，支持重试；deadline 为 time.monotonic() 截止时刻"""
+        if isinstance(id_info, tuple):
+            id_value, alias = id_info
+        else:
+            id_value = id_info
+            alias = id_value
+
+        metrics = self._metrics_for(id_value, alias)
+        if self.replay_run is not None:
+            return self._replay_fetch(id_value, metrics), id_value, alias
+
+        retry_options = {
+            "max_retries": max_retries,
+            "min_retry_wait": min_retry_wait,
+            "max_retry_wait": max_retry_wait,
+            "deadline": deadline,
+        }
+        if self.coalescer is not None:
+            payload = self._fetch_coalesced(id_value, metrics, retry_options)
+        else:
+            payload = self._fetch_remote(id_value, metrics, **retry_options)
+        return payload, id_value, alias
+
+    def _fetch_coalesced(
+        self, id_value: str, metrics: Dict, retry_options: Dict
+    ) -> Optional[PlatformPayload]:
+        """与共享同一 coalescer 的其他爬取合并请求"""
+        deadline = retry_options["deadline"]
+        while True:
+            role, flight = self.coalescer.begin(id_value)
+            if role == "lead":
+                break
+            if role == "follow" and not self._wait_for_flight(
+                flight, id_value, deadline
+            ):
+                return None
+            if flight.outcome == "ok":
+                source_status = flight.payload.data.get("status")
+                print(f"{id_value} 复用其他任务的请求结果")
+                metrics["coalesced"] = True
+                metrics["source_status"] = source_status
+                metrics["status"] = "cache" if source_status == "cache" else "fresh"
+                metrics["bytes"] = len(flight.payload.raw)
+                return flight.payload
+            if flight.outcome == "failed":
+                print(f"请求 {id_value} 失败（共享其他任务的请求）: {flight.error}")
+                metrics["coalesced"] = True
+                metrics["status"] = "failed"
+                metrics["error"] = flight.error
+                return None
+            # 发起方因取消或超时放弃，重新登记后自行请求
+
+        payload = None
+        try:
+            payload = self._fetch_remote(id_value, metrics, **retry_options)
+        finally:
+            if payload is not None:
+                outcome = "ok"
+            elif metrics["status"] in ("cancelled", "timed_out"):
+                outcome = "abandoned"
+            else:
+                outcome = "failed"
+            self.coalescer.finish(id_value, flight, payload, outcome, metrics["error"])
+        return payload
+
+    def _wait_for_flight(
+        self, flight: Flight, id_value: str, deadline: Optional[float]
+    ) -> bool:
+        """等待其他任务的请求完成，期间被取消或超过截止时间时返回 False"""
+        while not flight.done.wait(0.1):
+            if self.cancelled:
+                self._mark_cancelled(id_value)
+                return False
+            remaining = self._remaining_time(deadline)
+            if remaining is not None and remaining <= 0:
+                print(f"已超过爬取截止时间，放弃 {id_value}")
+                self._mark_timed_out(id_value, deadline)
+                return False
+        return True
+
+    def _fetch_remote(
+        self,
+        id_value: str,
+        metrics: Dict,
+        max_retries: int,
+        min_retry_wait: int,
+        max_retry_wait: int,
+        deadline: Optional[float],
+    ) -> Optional[PlatformPayload]:
+        """请求上游接口，支持重试"""
+        url = f"{self.api_url}?id={id_value}&latest"
+        http_client = self.http_client or get_http_client()
+        fetch_start = time.perf_counter()
+
+        retries = 0
+        while retries <= max_retries:
+            metrics["retries"] = retries
+            metrics["total_ms"] = round((time.perf_counter() - fetch_start) * 1000, 2)
+            if self.cancelled:
+                self._mark_cancelled(id_value)
+                return None
+            remaining = self._remaining_time(deadline)
+            if remaining is not None and remaining <= 0:
+                print(f"已超过爬取截止时间，放弃 {id_value}")
+                self._mark_timed_out(id_value, deadline)
+                return None
+            timeout = 10 if remaining is None else min(10, remaining)
+
+            try:
+                # 重试等待期间不占用主机名额，避免拖慢其他平台
+                if self.rate_limiter:
+                    with self.rate_limiter.limit(url):
+                        raw = self._timed_get(http_client, url, timeout, metrics)
+                else:
+                    raw = self._timed_get(http_client, url, timeout, metrics)
+
+                # 响应只在这里解码一次，后续解析直接使用解码结果
+                data_json = json_loads(raw)
+
+                status = data_json.get("status", "未知")
+                metrics["source_status"] = status
+                if status not in ["success", "cache"]:
+                    raise ValueError(f"响应状态异常: {status}")
+
+                status_info = "最新数据" if status == "success" else "缓存数据"
+                print(f"获取 {id_value} 成功（{status_info}）")
+                metrics["status"] = "fresh" if status == "success" else "cache"
+                metrics["error"] = None
+                metrics["total_ms"] = round(
+                    (time.perf_counter() - fetch_start) * 1000, 2
+                )
+                if self.response_archive is not None:
+                    self.response_archive.record(id_value, raw)
+                return PlatformPayload(raw, data_json)
+
+            except Exception as e:
+                metrics["error"] = f"{type(e).__name__}: {e}"
+                metrics["total_ms"] = round(
+                    (time.perf_counter() - fetch_start) * 1000, 2
+                )
+                retries += 1
+                # 请求的超时时间被截止时间截短，按超时放弃处理，不计为平台请求失败
+                remaining = self._remaining_time(deadline)
+                if remaining is not None and remaining <= 0:
+                    print(f"请求 {id_value} 失败: {e}. 已超过爬取截止时间，放弃")
+                    self._mark_timed_out(id_value, deadline)
+                    return None
+                if retries <= max_retries:
+                    base_wait = random.uniform(min_retry_wait, max_retry_wait)
+                    additional_wait = (retries - 1) * random.uniform(1, 2)
+                    wait_time = base_wait + additional_wait
+                    if remaining is not None and wait_time >= remaining:
+                        print(f"请求 {id_value} 失败: {e}. 重试将超过爬取截止时间，放弃")
+                        self._record_failure(id_value, e, metrics)
+                        return None
+                    print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
+                    # 等待期间收到取消请求时立即结束
+                    self._cancel_event.wait(wait_time)
+                else:
+                    print(f"请求 {id_value} 失败: {e}")
+                    self._record_failure(id_value, e, metrics)
+                    return None
+        return None
+
+    def _timed_get(
+        self, http_client: HttpClient, url: str, timeout: float, metrics: Dict
+    ) -> bytes:
+        """发送一次请求并记录连接和请求耗时，返回响应内容"""
+        proxy_url = self.proxy_url
+        if self.proxy_pool is not None:
+            proxy_url = self.proxy_pool.acquire()
+            metrics["proxy"] = redact_proxy(proxy_url)
+        # 收到任何 HTTP 响应即说明代理转发正常，上游错误不计入代理错误率
+        proxy_ok = False
+        start = time.perf_counter()
+        with measure_connection() as timing:
+            try:
+                response = http_client.get(
+                    url,
+                    proxy_url=proxy_url,
+                    headers=DEFAULT_HEADERS,
+                    timeout=timeout,
+                )
+                proxy_ok = True
+                response.raise_for_status()
+                raw = response.content
+            finally:
+                metrics.update(timing)
+                metrics["request_ms"] = round((time.perf_counter() - start) * 1000, 2)
+                if self.proxy_pool is not None:
+                    self.proxy_pool.report(
+                        proxy_url, proxy_ok, metrics["request_ms"]
+                    )
+        metrics["bytes"] = len(raw)
+        return raw
+
+    def _record_failure(self, id_value: str, error: Exception, metrics: Dict) -> None:
+        """记录最终失败的请求；开启归档时一并归档，回放时同样按失败处理"""
+        metrics["status"] = "failed"
+        if self.response_archive is not None:
+            self.response_archive.record(id_value, None, str(error))
+
+    def _replay_fetch(self, id_value: str, metrics: Dict) -> Optional[PlatformPayload]:
+        """从归档中读取平台响应"""
+        metrics["replayed"] = True
+        entry = self.replay_run.get(id_value)
+        if entry is None:
+            print(f"回放归档 {self.replay_run.run_key} 中没有 {id_value} 的数据")
+            metrics["error"] = "回放归档中没有该平台"
+            return None
+        if entry["raw"] is None:
+            print(f"请求 {id_value} 失败（回放）: {entry['error']}")
+            metrics["error"] = entry["error"]
+            return None
+        try:
+            data_json = json_loads(entry["raw"])
+        except Exception as e:
+            print(f"解析 {id_value} 的回放数据失败: {e}")
+            metrics["error"] = f"{type(e).__name__}: {e}"
+            return None
+        print(f"获取 {id_value} 成功（回放 {self.replay_run.run_key}）")
+        metrics["source_status"] = data_json.get("status")
+        metrics["status"] = "cache" if data_json.get("status") == "cache" else "fresh"
+        metrics["bytes"] = len(entry["raw"])
+        return PlatformPayload(entry["raw"], data_json)
+
+    def parse_response(
+        self, id_value: str, payload: PlatformPayload
+    ) -> Optional[Dict[str, NewsItem]]:
+        """解析平台响应为 {title: NewsItem}，失败返回 None"""
+        if self.fingerprint_cache is None:
+            return self._parse_titles(id_value, payload.data)
+
+        fingerprint = self.fingerprint_cache.fingerprint(payload.raw)
+        cached_titles = self.fingerprint_cache.get_unchanged(id_value, fingerprint)
+        if cached_titles is not None:
+            print(f"{id_value} 内容未变化，复用上次解析结果")
+            self.unchanged_ids.append(id_value)
+            return cached_titles
+
+        title_data = self._parse_titles(id_value, payload.data)
+        if title_data is not None:
+            self.fingerprint_cache.update(id_value, fingerprint, title_data)
+        return title_data
+
+    def _parse_titles(self, id_value: str, data: Dict) -> Optional[Dict[str, NewsItem]]:
+        """将响应中的条目整理为 {title: NewsItem}，只保留标题、排名和链接"""
+        try:
+            title_data = {}
+            for index, item in enumerate(data.get("items", []), 1):
+                title = item["title"]
+                if title in title_data:
+                    title_data[title].ranks.append(index)
+                else:
+                    title_data[title] = NewsItem(
+                        title, [index], item.get("url", ""), item.get("mobileUrl", "")
+                    )
+            return title_data
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+        return None
+
+    def crawl(
+        self, ids_list: List[IdInfo], request_interval: Optional[int] = None
+    ) -> Tuple[Dict, Dict, List]:
+        """
+        爬取多个平台数据（同步）
+
+        Args:
+            ids_list: 平台ID或 (平台ID, 名称) 列表
+            request_interval: 串行模式下的请求间隔（毫秒），默认使用构造参数
+
+        Returns:
+            (results, id_to_name, failed_ids) 元组
+        """
+        try:
+            return self._crawl(ids_list, request_interval)
+        finally:
+            # 取消只作用于本次爬取
+            self._cancel_event.clear()
+
+    def _crawl(
+        self, ids_list: List[IdInfo], request_interval: Optional[int]
+    ) -> Tuple[Dict, Dict, List]:
+        """crawl 的实现，取消标记由 crawl 负责清除"""
+        if request_interval is None:
+            request_interval = self.request_interval
+
+        self.unchanged_ids = []
+        self.skipped_ids = []
+        self.timed_out_ids = []
+        self.cancelled_ids = []
+        self.run_key = get_beijing_time().strftime("%Y%m%d-%H%M%S")
+        self.platform_metrics = {}
+        crawl_start = time.perf_counter()
+        if self.response_archive is not None:
+            self.response_archive.start_run(self.run_key)
+        self._deadline = (
+            time.monotonic() + self.crawl_deadline if self.crawl_deadline > 0 else None
+        )
+
+        if self.max_workers > 1 and len(ids_list) > 1:
+            crawl_result = self._crawl_concurrently(ids_list)
+        else:
+            crawl_result = self._crawl_serially(ids_list, request_interval)
+
+        if self.fingerprint_cache is not None:
+            self.fingerprint_cache.save()
+        if self.response_archive is not None:
+            archive_file = self.response_archive.save()
+            if archive_file:
+                print(f"原始响应已归档到: {archive_file}")
+        if self.circuit_breaker is not None:
+            self._update_circuit_breaker(*crawl_result)
+        if self.proxy_pool is not None:
+            self.proxy_pool.save()
+        self._finish_metrics(*crawl_result)
+        if self.telemetry is not None:
+            self.telemetry.write_run(
+                self.run_key,
+                (time.perf_counter() - crawl_start) * 1000,
+                list(self.platform_metrics.values()),
+                proxies=self.proxy_pool.snapshot() if self.proxy_pool else None,
+            )
+            slowest = sorted(
+                (m for m in self.platform_metrics.values() if m["total_ms"]),
+                key=lambda m: m["total_ms"],
+                reverse=True,
+            )[:3]
+            if slowest:
+                summary = ", ".join(
+                    f"{m['id']} {m['total_ms'] / 1000:.2f}秒" for m in slowest
+                )
+                print(f"耗时最长的平台: {summary}")
+        return crawl_result
+
+    def _finish_metrics(
+        self, results: Dict, id_to_name: Dict, failed_ids: List
+    ) -> None:
+        """补全各平台指标（条目数、内容是否变化、解析失败），并按 ids_list 顺序排列"""
+        unchanged_ids = set(self.unchanged_ids)
+        ordered = {}
+        for id_value, name in id_to_name.items():
+            metrics = self._metrics_for(id_value, name)
+            if id_value in results:
+                metrics["items"] = len(results[id_value])
+                metrics["unchanged"] = id_value in unchanged_ids
+            elif metrics["status"] in ("fresh", "cache"):
+                metrics["status"] = "failed"
+                metrics["error"] = "响应解析失败"
+            elif metrics["status"] == "pending":
+                metrics["status"] = "failed"
+            ordered[id_value] = metrics
+        self.platform_metrics = ordered
+
+    def _is_circuit_open(self, id_value: str) -> bool:
+        """平台处于熔断状态时记录并跳过"""
+        if self.circuit_breaker is None or not self.circuit_breaker.is_open(id_value):
+            return False
+        remaining = self.circuit_breaker.remaining_cooldown(id_value)
+        print(f"{id_value} 处于熔断状态，跳过（剩余冷却 {remaining} 秒）")
+        self.skipped_ids.append(id_value)
+        metrics = self._metrics_for(id_value)
+        metrics["status"] = "skipped"
+        metrics["error"] = f"熔断中，剩余冷却 {remaining} 秒"
+        return True
+
+    def _update_circuit_breaker(
+        self, results: Dict, id_to_name: Dict, failed_ids: List
+    ) -> None:
+        """根据本次实际请求结果更新熔断状态，跳过、超时放弃和取消的平台不计入"""
+        not_attempted = (
+            set(self.skipped_ids) | set(self.timed_out_ids) | set(self.cancelled_ids)
+        )
+        for id_value in results:
+            self.circuit_breaker.record_success(id_value)
+        for id_value in failed_ids:
+            if id_value not in not_attempted:
+                self.circuit_breaker.record_failure(id_value)
+        self.circuit_breaker.save()
+
+    def _crawl_serially(
+        self, ids_list: List[IdInfo], request_interval: int
+    ) -> Tuple[Dict, Dict, List]:
+        """逐个平台爬取，平台之间按 request_interval 间隔"""
+        results = {}
+        id_to_name = {}
+        failed_ids = []
+
+        for i, id_info in enumerate(ids_list):
+            if isinstance(id_info, tuple):
+                id_value, name = id_info
+            else:
+                id_value = id_info
+                name = id_value
+
+            id_to_name[id_value] = name
+
+            if self._is_circuit_open(id_value):
+                failed_ids.append(id_value)
+                continue
+
+            if self.cancelled:
+                self._metrics_for(id_value, name)
+                self._mark_cancelled(id_value)
+                failed_ids.append(id_value)
+                continue
+
+            remaining = self._remaining_time()
+            if remaining is not None and remaining <= 0:
+                self._metrics_for(id_value, name)
+                self._mark_timed_out(id_value)
+                failed_ids.append(id_value)
+                continue
+
+            response, _, _ = self.fetch_data(id_info, deadline=self._deadline)
+
+            title_data = self.parse_response(id_value, response) if response else None
+            if title_data is not None:
+                results[id_value] = title_data
+            else:
+                failed_ids.append(id_value)
+
+            # 回放和复用其他任务结果时没有访问上游，不需要间隔
+            upstream_hit = self.replay_run is None and not self.platform_metrics.get(
+                id_value, {}
+            ).get("coalesced")
+            if i < len(ids_list) - 1 and upstream_hit:
+                actual_interval = request_interval + random.randint(-10, 20)
+                actual_interval = max(50, actual_interval)
+                self._cancel_event.wait(actual_interval / 1000)
+
+        if self.cancelled_ids:
+            print(f"爬取已取消，未完成: {self.cancelled_ids}")
+        if self.timed_out_ids:
+            print(f"爬取超过截止时间 {self.crawl_deadline} 秒，未完成: {self.timed_out_ids}")
+        print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        return results, id_to_name, failed_ids
+
+    def _crawl_concurrently(
+        self, ids_list: List[IdInfo]
+    ) -> Tuple[Dict, Dict, List]:
+        """并发爬取，耗时约等于最慢的平台；结果顺序与 ids_list 保持一致"""
+        id_to_name = {}
+        for id_info in ids_list:
+            if isinstance(id_info, tuple):
+                id_to_name[id_info[0]] = id_info[1]
+            else:
+                id_to_name[id_info] = id_info
+
+        fetch_list = [
+            id_info
+            for id_info in ids_list
+            if not self._is_circuit_open(
+                id_info[0] if isinstance(id_info, tuple) else id_info
+            )
+        ]
+
+        parsed = {}
+        if fetch_list:
+            workers = min(self.max_workers, len(fetch_list))
+            executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="crawler"
+            )
+            futures = {
+                executor.submit(
+                    self.fetch_data, id_info, deadline=self._deadline
+                ): id_info
+                for id_info in fetch_list
+            }
+            handled = set()
+            try:
+                for future in as_completed(futures, timeout=self._remaining_time()):
+                    handled.add(future)
+                    response, id_value, _ = future.result()
+                    if response:
+                        parsed[id_value] = self.parse_response(id_value, response)
+            except FuturesTimeoutError:
+                for future, id_info in futures.items():
+                    if future in handled:
+                        continue
+                    if future.done() and not future.cancelled():
+                        response, id_value, _ = future.result()
+                        if response:
+                            parsed[id_value] = self.parse_response(id_value, response)
+                    else:
+                        id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+                        self._metrics_for(id_value, id_to_name[id_value])
+                        self._mark_timed_out(id_value)
+                print(
+                    f"爬取超过截止时间 {self.crawl_deadline} 秒，取消未完成的请求: {self.timed_out_ids}"
+                )
+            finally:
+                # 不等待仍在进行的请求，它们会在当前尝试结束后因超过截止时间而退出
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        results = {}
+        failed_ids = []
+        for id_value in id_to_name:
+            if parsed.get(id_value) is not None:
+                results[id_value] = parsed[id_value]
+            else:
+                failed_ids.append(id_value)
+
+        if self.cancelled_ids:
+            print(f"爬取已取消，未完成: {self.cancelled_ids}")
+        print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        return results, id_to_name, failed_ids
+
+    async def crawl_async(
+        self, ids_list: List[IdInfo], request_interval: Optional[int] = None
+    ) -> Tuple[Dict, Dict, List]:
+        """爬取多个平台数据（异步），在工作线程中执行，不阻塞事件循环"""
+        return await asyncio.to_thread(self.crawl, ids_list, request_interval)
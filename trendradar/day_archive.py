@@ -0,0 +1,349 @@
+"""
+冷数据压缩
+
+超过一定天数的 output/<日期> 目录不会再被修改，但会一直以未压缩的 txt / html 形式保留。
+压缩步骤将这些目录整体打包为 output/<日期>.tar.gz（或安装 zstandard 后使用 .tar.zst），
+校验后删除原目录。读取时流式解压，DayArchiveStore 提供与其他快照存储一致的读取接口，
+MCP 查询可以透明地读取压缩和未压缩的日期。
+
+归档内保留原目录结构（txt/、html/、bin/、snapshots.log 等），快照优先从 txt 读取，
+其次是二进制快照和快照日志。
+
+命令行用法：
+    python -m trendradar.day_archive compact output --days 30 [--method zstd]   # 压缩 30 天前的日期
+    python -m trendradar.day_archive extract output 2025年11月12日             # 还原某天的目录
+"""
+
+import argparse
+import os
+import shutil
+import tarfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .binary_snapshot import decode_snapshot
+from .daylog import INDEX_NAME, LOG_NAME, iter_log_records
+from .snapshot import parse_titles
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_SUFFIXES = {"gzip": ".tar.gz", "zstd": ".tar.zst"}
+DATE_FORMAT = "%Y年%m月%d日"
+
+# 快照内容：(时间, {平台ID: {标题: {ranks, url, mobileUrl}}}, {平台ID: 平台名称})
+DaySnapshot = Tuple[str, Dict, Dict]
+
+
+def is_date_folder(name: str) -> bool:
+    try:
+        datetime.strptime(name, DATE_FORMAT)
+    except ValueError:
+        return False
+    return True
+
+
+def split_archive_name(name: str) -> Optional[Tuple[str, str]]:
+    """日期归档文件名 -> (日期, 压缩方式)，不是日期归档时返回 None"""
+    for method, suffix in ARCHIVE_SUFFIXES.items():
+        if name.endswith(suffix) and is_date_folder(name[: -len(suffix)]):
+            return name[: -len(suffix)], method
+    return None
+
+
+def find_day_archive(output_dir: Union[str, Path], date_folder: str) -> Optional[Path]:
+    """某天的归档文件，不存在时返回 None"""
+    for suffix in ARCHIVE_SUFFIXES.values():
+        archive_path = Path(output_dir) / f"{date_folder}{suffix}"
+        if archive_path.exists():
+            return archive_path
+    return None
+
+
+@contextmanager
+def _open_tar_stream(
+    archive_path: Path, method: Optional[str] = None
+) -> Iterator[tarfile.TarFile]:
+    """以流模式打开归档，成员只能按顺序读取，解压不落盘"""
+    method = method or split_archive_name(archive_path.name)[1]
+    with open(archive_path, "rb") as f:
+        if method == "gzip":
+            with tarfile.open(fileobj=f, mode="r|gz") as tar:
+                yield tar
+            return
+        if zstandard is None:
+            raise RuntimeError(f"读取 {archive_path.name} 需要安装 zstandard")
+        with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                yield tar
+
+
+def iter_archive_files(
+    archive_path: Union[str, Path], prefix: str = ""
+) -> Iterator[Tuple[str, float, bytes]]:
+    """按归档顺序流式读取文件 (相对路径, 修改时间, 内容)，只读取以 prefix 开头的文件"""
+    with _open_tar_stream(Path(archive_path)) as tar:
+        for member in tar:
+            if not member.isfile() or not member.name.startswith(prefix):
+                continue
+            yield member.name, member.mtime, tar.extractfile(member).read()
+
+
+def read_archived_file(file_path: Union[str, Path]) -> Optional[bytes]:
+    """
+    读取已压缩日期中的文件
+
+    Args:
+        file_path: 压缩前的路径，如 output/2025年11月12日/txt/10时30分.txt
+
+    Returns:
+        文件内容，所在日期未压缩或归档中没有该文件时返回 None
+    """
+    file_path = Path(file_path)
+    for day_dir in file_path.parents:
+        if not is_date_folder(day_dir.name):
+            continue
+        archive_path = find_day_archive(day_dir.parent, day_dir.name)
+        if archive_path is None:
+            return None
+        member_name = file_path.relative_to(day_dir).as_posix()
+        for name, _, data in iter_archive_files(archive_path, member_name):
+            if name == member_name:
+                return data
+        return None
+    return None
+
+
+def compact_day(
+    output_dir: Union[str, Path], date_folder: str, method: str = "gzip"
+) -> Path:
+    """将某天的目录打包压缩，校验归档内容后删除原目录，返回归档路径"""
+    day_dir = Path(output_dir) / date_folder
+    archive_path = Path(output_dir) / f"{date_folder}{ARCHIVE_SUFFIXES[method]}"
+    files = sorted(path for path in day_dir.rglob("*") if path.is_file())
+    expected = {path.relative_to(day_dir).as_posix(): path.stat().st_size for path in files}
+
+    tmp_path = archive_path.with_name(f"{archive_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            if method == "gzip":
+                with tarfile.open(fileobj=f, mode="w:gz", compresslevel=9) as tar:
+                    for path in files:
+                        tar.add(path, arcname=path.relative_to(day_dir).as_posix())
+            else:
+                with zstandard.ZstdCompressor(level=19).stream_writer(f, closefd=False) as writer:
+                    with tarfile.open(fileobj=writer, mode="w|") as tar:
+                        for path in files:
+                            tar.add(path, arcname=path.relative_to(day_dir).as_posix())
+            f.flush()
+            os.fsync(f.fileno())
+
+        archived = {}
+        with _open_tar_stream(tmp_path, method) as tar:
+            for member in tar:
+                if member.isfile():
+                    archived[member.name] = len(tar.extractfile(member).read())
+        if archived != expected:
+            raise ValueError(f"{date_folder} 归档校验失败")
+        os.replace(tmp_path, archive_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    shutil.rmtree(day_dir)
+    return archive_path
+
+
+def compact_cold_days(
+    output_dir: Union[str, Path] = "output",
+    older_than_days: int = 30,
+    method: str = "gzip",
+    today: Optional[datetime] = None,
+) -> List[Path]:
+    """
+    压缩早于 older_than_days 天的日期目录
+
+    Args:
+        output_dir: output 目录
+        older_than_days: 保留多少天内的日期不压缩
+        method: "gzip" 或 "zstd"（未安装 zstandard 时回退到 gzip）
+        today: 当前日期，默认为本地当天
+
+    Returns:
+        新生成的归档文件列表
+    """
+    if method not in ARCHIVE_SUFFIXES:
+        raise ValueError(f"不支持的压缩方式: {method}（可选 gzip / zstd）")
+    if method == "zstd" and zstandard is None:
+        print("未安装 zstandard，冷数据压缩回退到 gzip")
+        method = "gzip"
+
+    output_dir = Path(output_dir)
+    if not output_dir.exists():
+        return []
+    today = today or datetime.now()
+    cutoff = (today - timedelta(days=older_than_days)).strftime(DATE_FORMAT)
+
+    archives = []
+    for day_dir in sorted(output_dir.iterdir()):
+        if not day_dir.is_dir() or not is_date_folder(day_dir.name) or day_dir.name >= cutoff:
+            continue
+        if find_day_archive(output_dir, day_dir.name) is not None:
+            print(f"{day_dir.name} 已有归档，跳过压缩（请检查是否有数据写入了已压缩的日期）")
+            continue
+        try:
+            archives.append(compact_day(output_dir, day_dir.name, method))
+        except Exception as e:
+            print(f"压缩 {day_dir.name} 失败: {e}")
+    return archives
+
+
+def extract_day(output_dir: Union[str, Path], date_folder: str) -> Path:
+    """将某天的归档还原为目录并删除归档"""
+    archive_path = find_day_archive(output_dir, date_folder)
+    if archive_path is None:
+        raise FileNotFoundError(f"{date_folder} 没有归档")
+    day_dir = Path(output_dir) / date_folder
+    for name, mtime, data in iter_archive_files(archive_path):
+        file_path = day_dir / name
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(data)
+        os.utime(file_path, (mtime, mtime))
+    archive_path.unlink()
+    return day_dir
+
+
+class DayArchiveStore:
+    """已压缩日期的只读快照存储，接口与 SQLiteNewsStore 的读取部分一致"""
+
+    def __init__(self, output_dir: Union[str, Path] = "output"):
+        self.output_dir = Path(output_dir)
+        self._lock = threading.Lock()
+        # 最近读取的一天：(归档路径, 修改时间) -> [(时间, 爬取时刻, 标题, 平台名称, 失败平台)]
+        self._cached_key: Optional[Tuple[Path, float]] = None
+        self._cached_day: List[Tuple[str, float, Dict, Dict, List]] = []
+
+    def has_date(self, date_folder: str) -> bool:
+        return find_day_archive(self.output_dir, date_folder) is not None
+
+    def _read_day(self, date_folder: str) -> List[Tuple[str, float, Dict, Dict, List]]:
+        """流式读取归档中的全部快照，优先使用 txt，其次是二进制快照和快照日志"""
+        archive_path = find_day_archive(self.output_dir, date_folder)
+        if archive_path is None:
+            return []
+        key = (archive_path, archive_path.stat().st_mtime)
+        with self._lock:
+            if self._cached_key == key:
+                return self._cached_day
+
+        txt_snapshots, bin_snapshots = [], []
+        log_data, log_mtime, crawled_at = b"", 0.0, {}
+        for name, mtime, data in iter_archive_files(archive_path):
+            if name.startswith("txt/") and name.endswith(".txt"):
+                txt_snapshots.append(
+                    (Path(name).stem, mtime, *parse_titles(data.decode("utf-8")))
+                )
+            elif name.startswith("bin/") and name.endswith(".bin"):
+                bin_snapshots.append((Path(name).stem, mtime, *decode_snapshot(data)))
+            elif name == LOG_NAME:
+                log_data = data
+                log_mtime = mtime
+            elif name == INDEX_NAME:
+                for line in data.decode("utf-8").splitlines():
+                    fields = line.split("\t")
+                    if len(fields) == 4:
+                        crawled_at[fields[0]] = float(fields[3])
+
+        if txt_snapshots:
+            snapshots = txt_snapshots
+        elif bin_snapshots:
+            snapshots = bin_snapshots
+        else:
+            records = {}
+            for time_info, body in iter_log_records(log_data):
+                records[time_info] = body
+            snapshots = [
+                (
+                    time_info,
+                    crawled_at.get(time_info, log_mtime),
+                    *parse_titles(records[time_info].decode("utf-8")),
+                )
+                for time_info in records
+            ]
+        snapshots.sort(key=lambda snapshot: snapshot[0])
+
+        with self._lock:
+            self._cached_key, self._cached_day = key, snapshots
+        return snapshots
+
+    def list_snapshots(self, date_folder: str) -> List[Tuple[str, float]]:
+        """按时间顺序列出某天的快照 [(时间, 爬取时刻)]"""
+        return [(snapshot[0], snapshot[1]) for snapshot in self._read_day(date_folder)]
+
+    def load_day(
+        self,
+        date_folder: str,
+        platform_ids: Optional[List[str]] = None,
+        times: Optional[List[str]] = None,
+        since: Optional[str] = None,
+    ) -> List[DaySnapshot]:
+        """按时间顺序读取某天的快照，结构与解析 txt 快照相同"""
+        snapshots = []
+        for time_info, _, titles_by_id, id_to_name, _ in self._read_day(date_folder):
+            if times is not None and time_info not in times:
+                continue
+            if since is not None and time_info < since:
+                continue
+            if platform_ids is not None:
+                titles_by_id = {
+                    source_id: title_data
+                    for source_id, title_data in titles_by_id.items()
+                    if source_id in platform_ids
+                }
+            id_to_name = {
+                source_id: name
+                for source_id, name in id_to_name.items()
+                if source_id in titles_by_id
+            }
+            # 返回副本，避免调用方修改缓存中的数据
+            titles_by_id = {
+                source_id: {
+                    title: {**data, "ranks": list(data["ranks"])}
+                    for title, data in title_data.items()
+                }
+                for source_id, title_data in titles_by_id.items()
+            }
+            snapshots.append((time_info, titles_by_id, id_to_name))
+        return snapshots
+
+    def load_failed_ids(self, date_folder: str, time_info: str) -> List[str]:
+        """某次快照中请求失败的平台"""
+        for snapshot in self._read_day(date_folder):
+            if snapshot[0] == time_info:
+                return list(snapshot[4])
+        return []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrendRadar 冷数据压缩工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compact_parser = subparsers.add_parser("compact", help="压缩早于指定天数的日期目录")
+    compact_parser.add_argument("output_dir", nargs="?", default="output")
+    compact_parser.add_argument("--days", type=int, default=30, help="保留多少天内的日期不压缩")
+    compact_parser.add_argument("--method", default="gzip", choices=sorted(ARCHIVE_SUFFIXES))
+    extract_parser = subparsers.add_parser("extract", help="将某天的归档还原为目录")
+    extract_parser.add_argument("output_dir")
+    extract_parser.add_argument("date", help="日期，如 2025年11月12日")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        archives = compact_cold_days(args.output_dir, args.days, args.method)
+        print(f"已压缩 {len(archives)} 天")
+    else:
+        print(f"已还原到 {extract_day(args.output_dir, args.date)}")
@@ -0,0 +1,258 @@
+"""
+每日快照清单
+
+一次运行中主程序会多次列出 output/<日期>/txt 并逐个 stat 快照文件（首次爬取判断、
+当日汇总、新增标题检测），MCP 服务每次请求也会重复扫描。清单记录当天每个 txt 快照的
+写入时刻、大小以及各平台标题数，保存快照时只更新该快照的记录，读取时不再扫描 txt 目录。
+
+清单保存在 output/<日期>/manifest.json：
+    {"version": 2,
+     "snapshots": {时间: {"stamp": 写入时刻, "size": 字节数, "platforms": {平台ID: 标题数}}}}
+
+读取清单不会写入任何文件。只有以下情况会扫描 txt 目录：
+    - 某天没有清单（如升级前的数据），读取时在内存中扫描（txt 目录有变化时重新扫描），
+      下次保存快照时随之写入
+    - 通过 rebuild / 命令行 repair 显式重建（如手动增删、还原了快照，或导出了 txt 快照）：
+        python -m trendradar.day_manifest repair [output_dir] [--date 2025年11月12日]
+重建时写入时刻和大小未变的快照沿用原记录，只解析新增或变化的快照。
+
+主程序和 MCP 服务（save_to_local）可能同时保存同一天的快照，清单的读-改-写通过
+output/<日期>/.manifest.lock 文件锁在进程间互斥。
+"""
+
+import argparse
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+from .snapshot import parse_titles
+from .utils import clean_title
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".manifest.lock"
+MANIFEST_VERSION = 2
+
+
+def new_manifest() -> Dict:
+    return {"version": MANIFEST_VERSION, "snapshots": {}}
+
+
+def title_counts(titles_by_id: Dict) -> Dict[str, int]:
+    """各平台标题数，与解析写入的快照文件得到的结果一致（标题清理后去重，没有标题的平台不计入）"""
+    counts = {}
+    for source_id, title_data in titles_by_id.items():
+        count = len({clean_title(title) for title in title_data})
+        if count:
+            counts[source_id] = count
+    return counts
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """进程间互斥锁（fcntl / msvcrt），两者都不可用时不加锁"""
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class DayManifest:
+    """按天维护的 txt 快照清单"""
+
+    def __init__(self, output_dir: Union[str, Path] = "output"):
+        self.output_dir = Path(output_dir)
+        self._lock = threading.Lock()
+        # 内存缓存：日期 -> (版本，清单)，版本见 _version
+        self._cache: Dict[str, Tuple[Optional[Tuple], Dict]] = {}
+
+    def _txt_dir(self, date_folder: str) -> Path:
+        return self.output_dir / date_folder / "txt"
+
+    def _path(self, date_folder: str) -> Path:
+        return self.output_dir / date_folder / MANIFEST_NAME
+
+    def _version(self, date_folder: str) -> Optional[Tuple]:
+        """
+        判断缓存是否过期的版本
+
+        有清单时为清单文件的 (修改时间, 大小)，文件系统时间精度较粗时同一时刻的两次写入仍可区分；
+        没有清单时为 txt 目录的修改时间，目录中增删快照后重新扫描；两者都不存在时为 None
+        """
+        try:
+            stat = self._path(date_folder).stat()
+            return "manifest", stat.st_mtime_ns, stat.st_size
+        except OSError:
+            pass
+        try:
+            return "txt", self._txt_dir(date_folder).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read(self, date_folder: str) -> Optional[Dict]:
+        """读取持久化的清单，不存在、无法读取或版本不符时返回 None"""
+        file_path = self._path(date_folder)
+        if not file_path.exists():
+            return None
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except Exception as e:
+            print(f"读取快照清单失败: {e}")
+        return None
+
+    def _save(self, date_folder: str, manifest: Dict) -> None:
+        """持久化清单（先写临时文件再替换，避免中途退出留下半个文件）"""
+        file_path = self._path(date_folder)
+        try:
+            tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            print(f"保存快照清单失败: {e}")
+            return
+        self._cache[date_folder] = (self._version(date_folder), manifest)
+
+    def _scan(self, date_folder: str, previous: Optional[Dict] = None) -> Dict:
+        """按 txt 目录内容生成清单，previous 中写入时刻和大小未变的快照不重新解析"""
+        known_snapshots = previous["snapshots"] if previous else {}
+        snapshots = {}
+        try:
+            entries = list(os.scandir(self._txt_dir(date_folder)))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.name.endswith(".txt") or not entry.is_file():
+                continue
+            time_info = entry.name[:-4]
+            stat = entry.stat()
+            known = known_snapshots.get(time_info)
+            if known and known["stamp"] == stat.st_mtime and known["size"] == stat.st_size:
+                snapshots[time_info] = known
+                continue
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    titles_by_id, _, _ = parse_titles(f.read())
+                platforms = {
+                    source_id: len(title_data)
+                    for source_id, title_data in titles_by_id.items()
+                    if title_data
+                }
+            except Exception as e:
+                print(f"解析快照 {entry.path} 失败: {e}")
+                platforms = {}
+            snapshots[time_info] = {
+                "stamp": stat.st_mtime,
+                "size": stat.st_size,
+                "platforms": platforms,
+            }
+        return {"version": MANIFEST_VERSION, "snapshots": dict(sorted(snapshots.items()))}
+
+    def _current(self, date_folder: str) -> Dict:
+        """当前清单（调用方持有锁）：版本未变时使用缓存，没有清单时在内存中扫描 txt 目录"""
+        version = self._version(date_folder)
+        cached = self._cache.get(date_folder)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        manifest = self._read(date_folder) if version and version[0] == "manifest" else None
+        if manifest is None:
+            manifest = self._scan(date_folder)
+        self._cache[date_folder] = (version, manifest)
+        return manifest
+
+    def load(self, date_folder: str) -> Dict:
+        """读取某天的清单（只读，不写入文件）"""
+        with self._lock:
+            return self._current(date_folder)
+
+    def record(self, date_folder: str, time_info: str, titles_by_id: Dict) -> None:
+        """
+        记录刚写入的 txt 快照
+
+        只更新该快照的记录（由写入的数据统计标题数，不再解析文件），不扫描 txt 目录；
+        持有文件锁期间重新读取其他进程写入的清单后再更新
+        """
+        try:
+            stat = (self._txt_dir(date_folder) / f"{time_info}.txt").stat()
+        except OSError as e:
+            print(f"更新快照清单失败: {e}")
+            return
+        entry = {
+            "stamp": stat.st_mtime,
+            "size": stat.st_size,
+            "platforms": title_counts(titles_by_id),
+        }
+        with self._lock, file_lock(self.output_dir / date_folder / LOCK_NAME):
+            # 缓存中的清单可能正被其他线程遍历，更新时生成新的清单
+            snapshots = dict(self._current(date_folder)["snapshots"])
+            in_order = not snapshots or time_info >= next(reversed(snapshots))
+            snapshots[time_info] = entry
+            if not in_order:
+                snapshots = dict(sorted(snapshots.items()))
+            self._save(date_folder, {"version": MANIFEST_VERSION, "snapshots": snapshots})
+
+    def rebuild(self, date_folder: str) -> Dict:
+        """按 txt 目录重建并保存某天的清单（手动增删、还原或导出 txt 快照后使用），日期目录不存在时返回空清单"""
+        if not (self.output_dir / date_folder).is_dir():
+            return new_manifest()
+        with self._lock, file_lock(self.output_dir / date_folder / LOCK_NAME):
+            manifest = self._scan(date_folder, self._read(date_folder))
+            self._save(date_folder, manifest)
+            return manifest
+
+    def list_snapshots(self, date_folder: str) -> List[Tuple[str, float]]:
+        """按时间顺序列出某天的 txt 快照 [(时间, 写入时刻)]"""
+        return [
+            (time_info, entry["stamp"])
+            for time_info, entry in self.load(date_folder)["snapshots"].items()
+        ]
+
+    def total_size(self, date_folder: str) -> int:
+        """某天 txt 快照的总字节数"""
+        return sum(entry["size"] for entry in self.load(date_folder)["snapshots"].values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrendRadar 快照清单工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    repair_parser = subparsers.add_parser("repair", help="按 txt 目录重建快照清单")
+    repair_parser.add_argument("output_dir", nargs="?", default="output")
+    repair_parser.add_argument("--date", help="只重建某天，如 2025年11月12日，默认所有日期")
+    args = parser.parse_args()
+
+    manifest_store = DayManifest(args.output_dir)
+    if args.date:
+        date_folders = [args.date]
+    else:
+        date_folders = sorted(
+            path.name for path in Path(args.output_dir).iterdir()
+            if not path.name.startswith(".") and (path / "txt").is_dir()
+        )
+    for date_folder in date_folders:
+        rebuilt = manifest_store.rebuild(date_folder)
+        print(f"{date_folder}: {len(rebuilt['snapshots'])} 个快照")
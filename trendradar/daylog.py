@@ -0,0 +1,315 @@
+"""
+按天追加的快照日志
+
+每天的所有快照追加写入 output/<日期>/snapshots.log，旁边的 snapshots.idx 记录
+每个快照的时间、字节偏移、长度和爬取时刻。读取最新批次或某个时间之后的快照时
+按索引直接定位，不需要扫描目录、逐个打开小文件。
+
+日志记录格式：
+    @@ <时间> <正文字节数>\n<正文>
+正文与 txt 快照文件内容相同（见 snapshot.format_titles）。
+索引每行一条：<时间>\t<偏移>\t<长度>\t<爬取时刻>，同一时间出现多次时以最后一条为准。
+索引缺失或与日志不一致（如写入中途退出）时，读取方在内存中从日志头部重建；
+下次写入时截断末尾不完整的记录并保存重建的索引。
+
+命令行用法：
+    python -m trendradar.daylog import output            # 将已有 txt 快照转换为日志
+    python -m trendradar.daylog export 2025年11月12日     # 导出某天的 txt 快照
+"""
+
+import argparse
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .day_manifest import DayManifest
+from .snapshot import format_titles, parse_titles, write_titles_file
+
+LOG_NAME = "snapshots.log"
+INDEX_NAME = "snapshots.idx"
+RECORD_MARKER = b"@@ "
+
+# 索引项：时间 -> (偏移, 长度, 爬取时刻)，偏移指向正文起始位置
+IndexEntry = Tuple[int, int, float]
+
+# 快照内容：(时间, {平台ID: {标题: {ranks, url, mobileUrl}}}, {平台ID: 平台名称})
+DaySnapshot = Tuple[str, Dict, Dict]
+
+
+def iter_log_records(data: bytes) -> Iterator[Tuple[str, bytes]]:
+    """按顺序解析日志内容中的完整记录 (时间, 正文)，遇到不完整的记录时停止"""
+    position = 0
+    while data.startswith(RECORD_MARKER, position):
+        header_end = data.find(b"\n", position)
+        if header_end < 0:
+            return
+        try:
+            time_info, length = data[position + len(RECORD_MARKER):header_end].decode("utf-8").split()
+            length = int(length)
+        except ValueError:
+            return
+        body_end = header_end + 1 + length
+        if body_end > len(data):
+            return
+        yield time_info, data[header_end + 1:body_end]
+        position = body_end
+
+
+class DayLogStore:
+    """按天追加的快照日志存储，接口与 SQLiteNewsStore 一致"""
+
+    def __init__(self, output_dir: Union[str, Path] = "output"):
+        self.output_dir = Path(output_dir)
+        self._lock = threading.Lock()
+
+    def _paths(self, date_folder: str) -> Tuple[Path, Path]:
+        day_dir = self.output_dir / date_folder
+        return day_dir / LOG_NAME, day_dir / INDEX_NAME
+
+    def exists(self, date_folder: str) -> bool:
+        return self._paths(date_folder)[0].exists()
+
+    def save_snapshot(
+        self,
+        date_folder: str,
+        time_info: str,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        crawled_at: Optional[float] = None,
+    ) -> int:
+        """
+        追加一次爬取快照，同一时间的快照以最后写入的为准
+
+        Returns:
+            正文在日志中的偏移
+        """
+        if crawled_at is None:
+            crawled_at = time.time()
+        body = format_titles(results, id_to_name, failed_ids).encode("utf-8")
+        header = RECORD_MARKER + f"{time_info} {len(body)}\n".encode("utf-8")
+        log_path, index_path = self._paths(date_folder)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            # 先修复日志和索引，避免上次写入中途退出留下的不完整记录夹在新记录之前
+            self._load_index(date_folder, repair=True)
+            with open(log_path, "ab") as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell() + len(header)
+                f.write(header + body)
+                f.flush()
+                os.fsync(f.fileno())
+            with open(index_path, "a", encoding="utf-8") as f:
+                f.write(f"{time_info}\t{offset}\t{len(body)}\t{crawled_at:.3f}\n")
+        return offset
+
+    def _load_index(self, date_folder: str, repair: bool = False) -> Dict[str, IndexEntry]:
+        """
+        读取索引，索引与日志不一致时从日志重建
+
+        读取时只在内存中重建，不改动任何文件（日志末尾可能是其他进程正在写入的记录）；
+        repair 为 True 时（写入方持有锁）截断末尾不完整的记录并保存重建的索引
+        """
+        log_path, index_path = self._paths(date_folder)
+        if not log_path.exists():
+            return {}
+        log_size = log_path.stat().st_size
+
+        index: Dict[str, IndexEntry] = {}
+        end = 0
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    time_info, offset, length, crawled_at = line.rstrip("\n").split("\t")
+                    offset, length = int(offset), int(length)
+                    index[time_info] = (offset, length, float(crawled_at))
+                    end = max(end, offset + length)
+        except (OSError, ValueError):
+            end = -1
+
+        if end == log_size:
+            return index
+        index, valid_size = self._scan_log(date_folder, index)
+        if repair:
+            self._repair(date_folder, index, valid_size)
+        return index
+
+    def _scan_log(
+        self, date_folder: str, known: Dict[str, IndexEntry]
+    ) -> Tuple[Dict[str, IndexEntry], int]:
+        """
+        扫描日志记录头重建索引，末尾不完整的记录不计入
+
+        已有索引中偏移和长度一致的记录沿用原爬取时刻，其余取日志的修改时刻
+
+        Returns:
+            (索引, 完整记录的总字节数)
+        """
+        log_path, _ = self._paths(date_folder)
+        index: Dict[str, IndexEntry] = {}
+        valid_size = 0
+        stat = log_path.stat()
+        with open(log_path, "rb") as f:
+            while True:
+                header = f.readline()
+                if not header.startswith(RECORD_MARKER) or not header.endswith(b"\n"):
+                    break
+                try:
+                    time_info, length = header[len(RECORD_MARKER):].decode("utf-8").split()
+                    length = int(length)
+                except ValueError:
+                    break
+                offset = f.tell()
+                if offset + length > stat.st_size:
+                    break
+                f.seek(length, os.SEEK_CUR)
+                entry = known.get(time_info)
+                if entry is not None and entry[:2] == (offset, length):
+                    index[time_info] = entry
+                else:
+                    index[time_info] = (offset, length, stat.st_mtime)
+                valid_size = offset + length
+        return index, valid_size
+
+    def _repair(self, date_folder: str, index: Dict[str, IndexEntry], valid_size: int) -> None:
+        """截断日志末尾不完整的记录（如写入中途退出），并保存重建的索引"""
+        log_path, index_path = self._paths(date_folder)
+        if valid_size != log_path.stat().st_size:
+            print(f"快照日志 {log_path} 末尾存在不完整的记录，已截断")
+            with open(log_path, "r+b") as f:
+                f.truncate(valid_size)
+
+        # 按日志中的顺序写入，同一时间出现多次时最后一条为准
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for time_info, (offset, length, crawled_at) in sorted(
+                index.items(), key=lambda item: item[1][0]
+            ):
+                f.write(f"{time_info}\t{offset}\t{length}\t{crawled_at:.3f}\n")
+        os.replace(tmp_path, index_path)
+
+    def list_snapshots(self, date_folder: str) -> List[Tuple[str, float]]:
+        """按时间顺序列出某天的快照 [(时间, 爬取时刻)]"""
+        with self._lock:
+            index = self._load_index(date_folder)
+        return [(time_info, index[time_info][2]) for time_info in sorted(index)]
+
+    def has_date(self, date_folder: str) -> bool:
+        return self.exists(date_folder) and bool(self.list_snapshots(date_folder))
+
+    def load_day(
+        self,
+        date_folder: str,
+        platform_ids: Optional[List[str]] = None,
+        times: Optional[List[str]] = None,
+    ) -> List[DaySnapshot]:
+        """
+        按时间顺序读取某天的快照，结构与解析 txt 快照相同
+
+        Args:
+            date_folder: 日期（YYYY年MM月DD日）
+            platform_ids: 只读取这些平台，None 表示全部
+            times: 只读取这些时间的快照，None 表示全部
+        """
+        with self._lock:
+            index = self._load_index(date_folder)
+        selected = sorted(
+            time_info for time_info in index
+            if times is None or time_info in times
+        )
+        if not selected:
+            return []
+
+        log_path, _ = self._paths(date_folder)
+        snapshots = []
+        with open(log_path, "rb") as f:
+            for time_info in selected:
+                offset, length, _ = index[time_info]
+                f.seek(offset)
+                titles_by_id, id_to_name, _ = parse_titles(f.read(length).decode("utf-8"))
+                if platform_ids is not None:
+                    titles_by_id = {
+                        source_id: title_data
+                        for source_id, title_data in titles_by_id.items()
+                        if source_id in platform_ids
+                    }
+                    id_to_name = {
+                        source_id: name
+                        for source_id, name in id_to_name.items()
+                        if source_id in titles_by_id
+                    }
+                snapshots.append((time_info, titles_by_id, id_to_name))
+        return snapshots
+
+    def load_failed_ids(self, date_folder: str, time_info: str) -> List[str]:
+        """某次快照中请求失败的平台"""
+        with self._lock:
+            index = self._load_index(date_folder)
+        if time_info not in index:
+            return []
+        offset, length, _ = index[time_info]
+        with open(self._paths(date_folder)[0], "rb") as f:
+            f.seek(offset)
+            return parse_titles(f.read(length).decode("utf-8"))[2]
+
+    def export_txt(self, date_folder: str, output_dir: Union[str, Path] = "output") -> List[Path]:
+        """将某天的快照导出为 txt 快照文件，返回写入的文件列表"""
+        txt_dir = Path(output_dir) / date_folder / "txt"
+        txt_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for time_info, titles_by_id, id_to_name in self.load_day(date_folder):
+            file_path = txt_dir / f"{time_info}.txt"
+            write_titles_file(
+                str(file_path),
+                titles_by_id,
+                id_to_name,
+                self.load_failed_ids(date_folder, time_info),
+            )
+            written.append(file_path)
+        # 导出的 txt 快照整体替换了该天的 txt 目录内容，重建快照清单
+        DayManifest(output_dir).rebuild(date_folder)
+        return written
+
+    def import_txt(self, output_dir: Union[str, Path] = "output") -> int:
+        """将 output 目录下已有的 txt 快照转换为日志（已有日志的日期跳过），返回导入的快照数"""
+        count = 0
+        for date_dir in sorted(Path(output_dir).iterdir()):
+            txt_dir = date_dir / "txt"
+            if date_dir.name.startswith(".") or not txt_dir.is_dir():
+                continue
+            if self.exists(date_dir.name):
+                print(f"{date_dir.name} 已有快照日志，跳过")
+                continue
+            for file_path in sorted(txt_dir.glob("*.txt")):
+                with open(file_path, "r", encoding="utf-8") as f:
+                    results, id_to_name, failed_ids = parse_titles(f.read())
+                self.save_snapshot(
+                    date_dir.name,
+                    file_path.stem,
+                    results,
+                    id_to_name,
+                    failed_ids,
+                    crawled_at=file_path.stat().st_mtime,
+                )
+                count += 1
+        return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrendRadar 快照日志工具")
+    parser.add_argument("--output-dir", default="output", help="output 目录")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("import", help="将已有 txt 快照转换为日志")
+    export_parser = subparsers.add_parser("export", help="导出某天的 txt 快照")
+    export_parser.add_argument("date", help="日期，如 2025年11月12日")
+    args = parser.parse_args()
+
+    store = DayLogStore(args.output_dir)
+    if args.command == "import":
+        print(f"已导入 {store.import_txt(args.output_dir)} 个快照")
+    else:
+        files = store.export_txt(args.date, args.output_dir)
+        print(f"已导出 {len(files)} 个快照文件")
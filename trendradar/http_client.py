@@ -0,0 +1,366 @@
+"""
+HTTP 客户端
+
+进程级共享的 HTTP 客户端：按代理复用连接池，可选 HTTP/2，并提供连接复用统计
+和新建连接的 DNS 解析 / TCP 连接 / TLS 握手耗时。
+"""
+
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+_connection_timing = threading.local()
+
+
+@contextmanager
+def measure_connection() -> Iterator[Dict[str, Optional[float]]]:
+    """
+    记录当前线程内请求新建连接的耗时（毫秒）
+
+    复用已有连接或使用 HTTP/2 客户端时各项保持为 None。
+    """
+    timing = {"dns_ms": None, "connect_ms": None, "tls_ms": None}
+    _connection_timing.current = timing
+    try:
+        yield timing
+    finally:
+        _connection_timing.current = None
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class _TimedConnectionMixin:
+    """拆分新建连接的 DNS 解析和 TCP 连接耗时"""
+
+    def _new_conn(self):
+        timing = getattr(_connection_timing, "current", None)
+        if timing is None:
+            return super()._new_conn()
+
+        dns_host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(
+                dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM
+            )
+        except OSError:
+            # 交给 urllib3 按原有方式解析并抛出对应异常
+            return super()._new_conn()
+        timing["dns_ms"] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        self._dns_host = addresses[0][4][0]
+        try:
+            sock = super()._new_conn()
+        except (NewConnectionError, ConnectTimeoutError):
+            if len(addresses) == 1:
+                raise
+            # 首个地址不可用时按原有方式依次尝试全部地址
+            self._dns_host = dns_host
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+        timing["connect_ms"] = _elapsed_ms(start)
+        return sock
+
+    def connect(self):
+        timing = getattr(_connection_timing, "current", None)
+        start = time.perf_counter()
+        super().connect()
+        if timing is not None and isinstance(self, HTTPSConnection):
+            timing["tls_ms"] = round(
+                _elapsed_ms(start)
+                - (timing["dns_ms"] or 0)
+                - (timing["connect_ms"] or 0),
+                2,
+            )
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+_TIMED_POOL_CLASSES = {
+    "http": _TimedHTTPConnectionPool,
+    "https": _TimedHTTPSConnectionPool,
+}
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """使用可计时连接的适配器（SOCKS 代理沿用 urllib3 默认实现）"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _TIMED_POOL_CLASSES
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        is_new = proxy not in self.proxy_manager
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if is_new and not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = _TIMED_POOL_CLASSES
+        return manager
+
+
+def _raise_as_requests_error(error: Exception) -> None:
+    """
+    将 httpx 的异常转换为对应的 requests 异常抛出
+
+    调用方统一按 requests 的异常类型处理超时和连接错误，不必区分是否启用了 HTTP/2
+    """
+    if isinstance(error, (httpx.ConnectTimeout, httpx.PoolTimeout)):
+        raise requests.exceptions.ConnectTimeout(str(error)) from error
+    if isinstance(error, httpx.TimeoutException):
+        raise requests.exceptions.ReadTimeout(str(error)) from error
+    if isinstance(error, httpx.ProxyError):
+        raise requests.exceptions.ProxyError(str(error)) from error
+    if isinstance(error, httpx.TransportError):
+        raise requests.exceptions.ConnectionError(str(error)) from error
+    raise requests.exceptions.RequestException(str(error)) from error
+
+
+class _Http2Response:
+    """httpx 响应的包装，raise_for_status 抛出 requests.exceptions.HTTPError"""
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+
+    def __getattr__(self, name: str):
+        return getattr(self._response, name)
+
+    def raise_for_status(self) -> None:
+        try:
+            self._response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise requests.exceptions.HTTPError(str(e), response=self) from e
+
+
+class HttpClient:
+    """进程级 HTTP 客户端：按代理复用连接池，可选 HTTP/2"""
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        enable_http2: bool = False,
+        host_pool_maxsize: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            pool_connections: 连接池缓存的主机数
+            pool_maxsize: 每个主机保持的最大连接数
+            enable_http2: 是否启用 HTTP/2（需要 httpx[http2]）
+            host_pool_maxsize: 按主机单独设置的最大连接数 {主机名: 连接数}，未列出的主机使用 pool_maxsize
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_maxsize = {
+            host.lower(): int(size) for host, size in (host_pool_maxsize or {}).items()
+        }
+        self.enable_http2 = enable_http2
+        if enable_http2 and httpx is None:
+            print("未安装 httpx，HTTP/2 不可用，使用 HTTP/1.1 连接池")
+            self.enable_http2 = False
+
+        self._lock = threading.Lock()
+        self._sessions: Dict[Optional[str], requests.Session] = {}
+        # HTTP/2 客户端：(代理, 单独设置连接数的主机或 None) -> 客户端
+        self._http2_clients: Dict[Tuple[Optional[str], Optional[str]], "httpx.Client"] = {}
+        self._request_count = 0
+        self._http2_response_count = 0
+
+    def _get_session(self, proxy_url: Optional[str]) -> requests.Session:
+        """获取（或创建）指定代理对应的会话，同一代理的请求共享连接池"""
+        with self._lock:
+            session = self._sessions.get(proxy_url)
+            if session is None:
+                session = requests.Session()
+                adapter = _TimedHTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                # 单独设置连接数的主机使用独立的适配器（requests 按最长前缀匹配挂载点）
+                for host, maxsize in self.host_pool_maxsize.items():
+                    host_adapter = _TimedHTTPAdapter(pool_connections=1, pool_maxsize=maxsize)
+                    session.mount(f"http://{host}/", host_adapter)
+                    session.mount(f"https://{host}/", host_adapter)
+                if proxy_url:
+                    session.proxies = {"http": proxy_url, "https": proxy_url}
+                self._sessions[proxy_url] = session
+            return session
+
+    def _get_http2_client(
+        self, proxy_url: Optional[str], url: str
+    ) -> Optional["httpx.Client"]:
+        """获取（或创建）HTTP/2 客户端，缺少 h2 依赖时回退到 HTTP/1.1"""
+        host = (urlsplit(url).hostname or "").lower()
+        if host not in self.host_pool_maxsize:
+            host = None
+        key = (proxy_url, host)
+        with self._lock:
+            if key in self._http2_clients:
+                return self._http2_clients[key]
+            if host is None:
+                limits = httpx.Limits(
+                    max_connections=self.pool_connections * self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize,
+                )
+            else:
+                maxsize = self.host_pool_maxsize[host]
+                limits = httpx.Limits(
+                    max_connections=maxsize, max_keepalive_connections=maxsize
+                )
+            try:
+                client = httpx.Client(http2=True, proxy=proxy_url, limits=limits)
+            except ImportError:
+                print("未安装 h2，HTTP/2 不可用，使用 HTTP/1.1 连接池")
+                self.enable_http2 = False
+                return None
+            self._http2_clients[key] = client
+            return client
+
+    def request(
+        self, method: str, url: str, proxy_url: Optional[str] = None, **kwargs
+    ):
+        """
+        发送请求，参数与 requests.request 一致（代理通过 proxy_url 指定）
+
+        启用 HTTP/2 时 httpx 的异常同样以 requests.exceptions 中对应的类型抛出
+        """
+        with self._lock:
+            self._request_count += 1
+
+        if self.enable_http2:
+            client = self._get_http2_client(proxy_url, url)
+            if client is not None:
+                if isinstance(kwargs.get("data"), bytes):
+                    kwargs["content"] = kwargs.pop("data")
+                try:
+                    response = client.request(method, url, **kwargs)
+                except httpx.HTTPError as e:
+                    _raise_as_requests_error(e)
+                if response.http_version == "HTTP/2":
+                    with self._lock:
+                        self._http2_response_count += 1
+                return _Http2Response(response)
+
+        return self._get_session(proxy_url).request(method, url, **kwargs)
+
+    def get(self, url: str, proxy_url: Optional[str] = None, **kwargs):
+        return self.request("GET", url, proxy_url=proxy_url, **kwargs)
+
+    def post(self, url: str, proxy_url: Optional[str] = None, **kwargs):
+        return self.request("POST", url, proxy_url=proxy_url, **kwargs)
+
+    def get_stats(self) -> Dict:
+        """连接复用统计：新建连接数越少于请求数，说明复用越充分"""
+        new_connections = 0
+        pooled_requests = 0
+        with self._lock:
+            sessions = list(self._sessions.values())
+            request_count = self._request_count
+            http2_response_count = self._http2_response_count
+
+        for session in sessions:
+            # http:// 与 https:// 挂载的是同一个适配器，去重后统计
+            for adapter in {id(a): a for a in session.adapters.values()}.values():
+                managers = [adapter.poolmanager, *adapter.proxy_manager.values()]
+                for manager in managers:
+                    for key in manager.pools.keys():
+                        pool = manager.pools.get(key)
+                        new_connections += getattr(pool, "num_connections", 0)
+                        pooled_requests += getattr(pool, "num_requests", 0)
+
+        return {
+            "requests": request_count,
+            "new_connections": new_connections,
+            "reused_connections": max(0, pooled_requests - new_connections),
+            "http2_responses": http2_response_count,
+        }
+
+    def close(self) -> None:
+        """关闭所有会话和连接"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            for client in self._http2_clients.values():
+                client.close()
+            self._sessions.clear()
+            self._http2_clients.clear()
+
+
+_http_client: Optional[HttpClient] = None
+_http_client_lock = threading.Lock()
+
+
+def configure_http_client(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    enable_http2: bool = False,
+    host_pool_maxsize: Optional[Dict[str, int]] = None,
+) -> HttpClient:
+    """
+    按配置创建全局 HTTP 客户端，替换并关闭已有实例
+
+    Args:
+        pool_connections: 连接池缓存的主机数
+        pool_maxsize: 每个主机保持的最大连接数
+        enable_http2: 是否启用 HTTP/2（需要 httpx[http2]）
+        host_pool_maxsize: 按主机单独设置的最大连接数 {主机名: 连接数}
+
+    Returns:
+        新的全局 HTTP 客户端
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = HttpClient(
+            pool_connections, pool_maxsize, enable_http2, host_pool_maxsize
+        )
+        return _http_client
+
+
+def get_http_client() -> HttpClient:
+    """
+    获取全局 HTTP 客户端实例，未配置时使用默认参数创建
+
+    Returns:
+        全局 HTTP 客户端
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient()
+        return _http_client
@@ -0,0 +1,235 @@
+"""
+历史数据的 mmap 逐条读取
+
+MCP 的长时间范围查询（话题趋势、相关新闻历史、周报等）逐天调用 read_all_titles_for_date，
+每天的数据都被完整解析为嵌套字典并放入缓存，扫描一年的数据会让常驻内存持续增长，
+并把缓存中的其他数据挤出。
+
+这里直接以 mmap 打开月度打包文件和二进制快照，按数据块解压后只解码调用方需要的字段，
+逐条产出轻量的 TitleRecord，不构建嵌套字典，也不写入缓存。
+
+去重和取值规则与 read_all_titles_for_date 合并后的结果一致：同一天同一平台的标题只产出
+一次，排名和链接取首次出现的快照。打包文件按平台分组产出（与合并结果的字典顺序相同），
+二进制快照按快照依次产出，每个快照内按平台分组。
+
+数据块整体经过 zlib 压缩，因此“按需读取”以数据块和字段为单位，节省只限于数据块级别
+的读取：每次都要完整解压一个数据块（二进制快照为一个快照的全部平台），打包文件只解压
+所需平台的数据块，字符串表先按原始字节切分，只对用到的标题（以及请求的链接、平台名称）
+做 UTF-8 解码。
+"""
+
+import mmap
+import os
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Union
+
+from .binary_snapshot import COUNTS, FLAG_ZLIB, FORMAT_VERSION, HEADER, MAGIC, BinarySnapshotStore
+from .month_pack import MonthPackStore, month_of
+
+# 可按需读取的字段（标题和平台ID总是读取）
+TITLE_FIELDS = ("platform_name", "rank", "url", "mobile_url")
+
+
+class TitleRecord(NamedTuple):
+    """一条标题记录，未请求的字段为 None"""
+
+    platform_id: str
+    title: str
+    platform_name: Optional[str] = None
+    rank: Optional[int] = None
+    url: Optional[str] = None
+    mobile_url: Optional[str] = None
+
+
+def _u32(body: bytes, offset: int, count: int) -> array:
+    data = array("I")
+    data.frombytes(body[offset:offset + count * 4])
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+class _Block:
+    """一个二进制快照数据块：字符串表保留原始字节，按需解码"""
+
+    __slots__ = ("strings", "platforms", "titles")
+
+    def __init__(self, view: memoryview):
+        if len(view) < HEADER.size:
+            raise ValueError("二进制快照文件不完整")
+        magic, version, flags, body_length = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("不是支持的二进制快照数据块")
+        with view[HEADER.size:HEADER.size + body_length] as raw:
+            if len(raw) != body_length:
+                raise ValueError("二进制快照文件不完整")
+            body = zlib.decompress(raw) if flags & FLAG_ZLIB else raw.tobytes()
+
+        _, platform_count, title_count, _, blob_length = COUNTS.unpack_from(body)
+        offset = COUNTS.size
+        self.strings: List[bytes] = body[offset:offset + blob_length].split(b"\0")
+        offset += blob_length
+        self.platforms = _u32(body, offset, platform_count * 3)
+        self.titles = _u32(body, offset + platform_count * 12, title_count * 4)
+
+    def iter_platforms(self, platform_ids: Optional[Set[str]]) -> Iterator[tuple]:
+        """产出 (平台ID, 平台名称序号, 标题起始行, 标题结束行)"""
+        start = 0
+        platforms = self.platforms
+        for index in range(0, len(platforms), 3):
+            end = start + platforms[index + 2]
+            if end > start:
+                source_id = self.strings[platforms[index]].decode("utf-8")
+                if platform_ids is None or source_id in platform_ids:
+                    yield source_id, platforms[index + 1], start, end
+            start = end
+
+    def iter_records(
+        self,
+        source_id: str,
+        platform_name: Optional[str],
+        start: int,
+        end: int,
+        fields: Set[str],
+        seen: Set[bytes],
+    ) -> Iterator[TitleRecord]:
+        """产出某个平台中尚未出现过的标题（seen 记录已产出标题的原始字节）"""
+        strings = self.strings
+        titles = self.titles
+        want_rank = "rank" in fields
+        want_url = "url" in fields
+        want_mobile = "mobile_url" in fields
+        for row in range(start * 4, end * 4, 4):
+            raw_title = strings[titles[row + 1]]
+            if raw_title in seen:
+                continue
+            seen.add(raw_title)
+            yield TitleRecord(
+                source_id,
+                raw_title.decode("utf-8"),
+                platform_name,
+                titles[row] if want_rank else None,
+                strings[titles[row + 2]].decode("utf-8") if want_url else None,
+                strings[titles[row + 3]].decode("utf-8") if want_mobile else None,
+            )
+
+
+class _MappedFile:
+    """只读 mmap 打开的文件，退出时释放所有视图后再关闭映射"""
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+
+    def __enter__(self) -> memoryview:
+        with open(self.file_path, "rb") as f:
+            # 空文件无法映射，按空数据处理
+            if os.fstat(f.fileno()).st_size:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._mmap = None
+        self._view = memoryview(self._mmap if self._mmap is not None else b"")
+        return self._view
+
+    def __exit__(self, *exc_info) -> None:
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+
+class HistoryReader:
+    """月度打包文件和二进制快照的 mmap 逐条读取"""
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path] = "output",
+        binary_store: Optional[BinarySnapshotStore] = None,
+        pack_store: Optional[MonthPackStore] = None,
+    ):
+        """
+        初始化读取器
+
+        Args:
+            output_dir: 输出目录
+            binary_store / pack_store: 复用已有的存储实例（共享打包索引缓存）
+        """
+        self.binary_store = binary_store or BinarySnapshotStore(output_dir)
+        self.pack_store = pack_store or MonthPackStore(output_dir)
+
+    @staticmethod
+    def _fields(fields: Iterable[str]) -> Set[str]:
+        fields = set(fields)
+        unknown = fields - set(TITLE_FIELDS)
+        if unknown:
+            raise ValueError(f"不支持的字段: {', '.join(sorted(unknown))}")
+        return fields
+
+    def iter_packed_titles(
+        self,
+        date_folder: str,
+        platform_ids: Optional[Iterable[str]] = None,
+        fields: Iterable[str] = (),
+    ) -> Iterator[TitleRecord]:
+        """
+        逐条读取已按月打包的某天标题
+
+        按平台依次读取该平台在各快照中的数据块，每次只保留一个解压后的数据块
+        """
+        fields = self._fields(fields)
+        day = self.pack_store.day_index(date_folder)
+        if not day:
+            return
+        platform_ids = set(platform_ids) if platform_ids else None
+        snapshots = [day["snapshots"][time_info] for time_info in sorted(day["snapshots"])]
+
+        # 平台按首次出现的快照排列，与合并结果的字典顺序一致
+        blocks_by_platform: Dict[str, List[List[int]]] = {}
+        for snapshot in snapshots:
+            for source_id, entry in snapshot["platforms"].items():
+                if platform_ids is None or source_id in platform_ids:
+                    blocks_by_platform.setdefault(source_id, []).append(entry)
+
+        with _MappedFile(self.pack_store.pack_path(month_of(date_folder))) as view:
+            for source_id, entries in blocks_by_platform.items():
+                seen: Set[bytes] = set()
+                for offset, length, _ in entries:
+                    with view[offset:offset + length] as block_view:
+                        block = _Block(block_view)
+                    for _, name_ref, start, end in block.iter_platforms(None):
+                        name = block.strings[name_ref].decode("utf-8") if "platform_name" in fields else None
+                        yield from block.iter_records(source_id, name, start, end, fields, seen)
+
+    def iter_binary_titles(
+        self,
+        date_folder: str,
+        platform_ids: Optional[Iterable[str]] = None,
+        fields: Iterable[str] = (),
+    ) -> Iterator[TitleRecord]:
+        """
+        逐条读取某天的二进制快照标题
+
+        一个快照文件包含所有平台，按快照依次读取，每个快照解压后立即产出其中新出现的标题，
+        同时只保留一个解压后的数据块（以及已产出标题的去重集合）；产出顺序因此是按快照
+        而不是按平台分组
+        """
+        fields = self._fields(fields)
+        platform_ids = set(platform_ids) if platform_ids else None
+        seen_by_platform: Dict[str, Set[bytes]] = {}
+        names: Dict[str, str] = {}
+
+        for time_info, _ in self.binary_store.list_snapshots(date_folder):
+            with _MappedFile(self.binary_store.snapshot_path(date_folder, time_info)) as view:
+                block = _Block(view)
+            for source_id, name_ref, start, end in block.iter_platforms(platform_ids):
+                if "platform_name" in fields and source_id not in names:
+                    names[source_id] = block.strings[name_ref].decode("utf-8")
+                yield from block.iter_records(
+                    source_id,
+                    names.get(source_id),
+                    start,
+                    end,
+                    fields,
+                    seen_by_platform.setdefault(source_id, set()),
+                )
@@ -0,0 +1,70 @@
+"""
+数据模型
+
+爬取流程中使用的精简记录类型。
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class PlatformPayload(NamedTuple):
+    """单个平台的响应：原始字节用于计算指纹，解码结果只解析一次"""
+
+    raw: bytes
+    data: Dict
+
+
+class NewsItem:
+    """
+    精简的新闻条目，只保留流水线用到的字段（标题、排名、链接）
+
+    提供与 {"ranks", "url", "mobileUrl"} 字典一致的只读访问方式，
+    可以直接放入 results 中交给下游使用。
+    """
+
+    __slots__ = ("title", "ranks", "url", "mobile_url")
+
+    _KEY_TO_ATTR = {"ranks": "ranks", "url": "url", "mobileUrl": "mobile_url"}
+
+    def __init__(self, title: str, ranks: List[int], url: str = "", mobile_url: str = ""):
+        self.title = title
+        self.ranks = ranks
+        self.url = url
+        self.mobile_url = mobile_url
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, self._KEY_TO_ATTR[key])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEY_TO_ATTR
+
+    def __repr__(self) -> str:
+        return (
+            f"NewsItem(title={self.title!r}, ranks={self.ranks!r}, "
+            f"url={self.url!r}, mobile_url={self.mobile_url!r})"
+        )
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        attr = self._KEY_TO_ATTR.get(key)
+        return getattr(self, attr) if attr else default
+
+    def to_dict(self) -> Dict:
+        """转换为 {ranks, url, mobileUrl} 字典"""
+        return {"ranks": self.ranks, "url": self.url, "mobileUrl": self.mobile_url}
+
+    def to_compact(self) -> List:
+        """紧凑的列表形式，用于持久化"""
+        return [self.ranks, self.url, self.mobile_url]
+
+    @classmethod
+    def from_compact(cls, title: str, value: Any) -> "NewsItem":
+        """从 to_compact() 的结果（或旧版的字典）恢复"""
+        if isinstance(value, dict):
+            return cls(
+                title,
+                value.get("ranks", []),
+                value.get("url", ""),
+                value.get("mobileUrl", ""),
+            )
+        ranks, url, mobile_url = value
+        return cls(title, ranks, url, mobile_url)
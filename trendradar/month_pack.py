@@ -0,0 +1,452 @@
+"""
+按月打包的历史数据
+
+MCP 的长时间范围查询（last_month、周报、话题趋势）要逐天打开几十个目录、上百个小文件。
+打包工具将一个月的数据合并为 output/<YYYY年MM月>.pack，每个快照的每个平台单独编码为
+一个数据块（二进制快照格式），文件末尾的索引记录 日期 -> 快照 -> 平台 到数据块偏移的映射，
+读取任意一天、一个快照或一个平台时只读取对应的数据块。
+
+文件结构：
+    头部    magic "TRPK" | 版本 u8 | 保留 3 字节 | 索引偏移 u64 | 索引长度 u64
+    数据块  各平台快照块（binary_snapshot 编码）及 html 等其他文件（zlib 压缩）
+    索引    zlib 压缩的 JSON：
+            {"days": {日期: {"snapshots": {时间: {"crawled_at", "failed", "platforms": {平台ID: [偏移, 长度, 标题数]}}},
+                             "files": {相对路径: [偏移, 长度, 修改时间]}}}}
+
+打包来源可以是日期目录（txt / 二进制快照 / 快照日志）或冷数据压缩生成的日期归档，
+打包并校验后删除来源。
+
+命令行用法：
+    python -m trendradar.month_pack pack output 2025年11月      # 打包某月
+    python -m trendradar.month_pack unpack output 2025年11月    # 还原为日期目录
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .binary_snapshot import BinarySnapshotStore, decode_snapshot, encode_snapshot
+from .day_archive import (
+    DayArchiveStore,
+    find_day_archive,
+    is_date_folder,
+    iter_archive_files,
+    split_archive_name,
+)
+from .daylog import INDEX_NAME, LOG_NAME, DayLogStore
+from .snapshot import parse_titles, write_titles_file
+
+MAGIC = b"TRPK"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sB3xQQ")
+PACK_SUFFIX = ".pack"
+MONTH_PATTERN = re.compile(r"^(\d{4})年(\d{2})月")
+
+# 快照内容：(时间, {平台ID: {标题: {ranks, url, mobileUrl}}}, {平台ID: 平台名称})
+DaySnapshot = Tuple[str, Dict, Dict]
+# 打包来源中的一个快照：(时间, 爬取时刻, 标题, 平台名称, 失败平台)
+SourceSnapshot = Tuple[str, float, Dict, Dict, List]
+# 打包来源中的其他文件：相对路径 -> (修改时间, 内容)
+SourceFiles = Dict[str, Tuple[float, bytes]]
+
+
+def month_of(date_folder: str) -> str:
+    """YYYY年MM月DD日 -> YYYY年MM月"""
+    return date_folder[: date_folder.index("月") + 1]
+
+
+def list_day_sources(output_dir: Union[str, Path]) -> List[str]:
+    """output 目录下以日期目录或日期归档形式存在的日期"""
+    date_folders = set()
+    for path in Path(output_dir).iterdir():
+        if path.is_dir() and is_date_folder(path.name):
+            date_folders.add(path.name)
+        elif path.is_file() and split_archive_name(path.name):
+            date_folders.add(split_archive_name(path.name)[0])
+    return sorted(date_folders)
+
+
+def _is_snapshot_file(name: str) -> bool:
+    """是否为快照文件（打包时以数据块形式保存，不作为普通文件保存）"""
+    return (
+        (name.startswith("txt/") and name.endswith(".txt"))
+        or (name.startswith("bin/") and name.endswith(".bin"))
+        or name in (LOG_NAME, INDEX_NAME)
+    )
+
+
+def _read_store(store, date_folder: str) -> List[SourceSnapshot]:
+    """从快照存储读取某天的全部快照"""
+    crawled_at = dict(store.list_snapshots(date_folder))
+    return [
+        (
+            time_info,
+            crawled_at[time_info],
+            titles_by_id,
+            id_to_name,
+            store.load_failed_ids(date_folder, time_info),
+        )
+        for time_info, titles_by_id, id_to_name in store.load_day(date_folder)
+    ]
+
+
+def _read_day_source(
+    output_dir: Path, date_folder: str
+) -> Tuple[List[SourceSnapshot], SourceFiles]:
+    """读取某天的快照和其他文件，来源为日期目录或日期归档"""
+    files: SourceFiles = {}
+    day_dir = output_dir / date_folder
+
+    if not day_dir.is_dir():
+        snapshots = _read_store(DayArchiveStore(output_dir), date_folder)
+        for name, mtime, data in iter_archive_files(find_day_archive(output_dir, date_folder)):
+            if not _is_snapshot_file(name):
+                files[name] = (mtime, data)
+        return snapshots, files
+
+    snapshots: List[SourceSnapshot] = []
+    txt_files = sorted((day_dir / "txt").glob("*.txt"))
+    if txt_files:
+        for file_path in txt_files:
+            with open(file_path, "r", encoding="utf-8") as f:
+                titles_by_id, id_to_name, failed_ids = parse_titles(f.read())
+            snapshots.append(
+                (file_path.stem, file_path.stat().st_mtime, titles_by_id, id_to_name, failed_ids)
+            )
+    else:
+        store = BinarySnapshotStore(output_dir)
+        if not store.has_date(date_folder):
+            store = DayLogStore(output_dir)
+        snapshots = _read_store(store, date_folder)
+
+    for file_path in sorted(day_dir.rglob("*")):
+        name = file_path.relative_to(day_dir).as_posix()
+        if file_path.is_file() and not _is_snapshot_file(name) and ".tmp" not in file_path.suffixes:
+            with open(file_path, "rb") as f:
+                files[name] = (file_path.stat().st_mtime, f.read())
+    return snapshots, files
+
+
+class MonthPackStore:
+    """按月打包数据的只读快照存储，接口与 SQLiteNewsStore 的读取部分一致"""
+
+    def __init__(self, output_dir: Union[str, Path] = "output"):
+        self.output_dir = Path(output_dir)
+        self._lock = threading.Lock()
+        # 索引缓存：月份 -> ((文件修改时间, 大小), 索引)
+        self._indexes: Dict[str, Tuple[Tuple[float, int], Dict]] = {}
+
+    def pack_path(self, month: str) -> Path:
+        return self.output_dir / f"{month}{PACK_SUFFIX}"
+
+    def _index(self, month: str) -> Optional[Dict]:
+        """读取某月的索引，按文件修改时间缓存"""
+        pack_path = self.pack_path(month)
+        try:
+            stat = pack_path.stat()
+        except OSError:
+            return None
+        key = (stat.st_mtime, stat.st_size)
+        with self._lock:
+            cached = self._indexes.get(month)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+        with open(pack_path, "rb") as f:
+            magic, version, index_offset, index_length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{pack_path.name} 不是支持的月度打包文件")
+            f.seek(index_offset)
+            index = json.loads(zlib.decompress(f.read(index_length)))
+        with self._lock:
+            self._indexes[month] = (key, index)
+        return index
+
+    def _day(self, date_folder: str) -> Optional[Dict]:
+        index = self._index(month_of(date_folder))
+        return None if index is None else index["days"].get(date_folder)
+
+    def day_index(self, date_folder: str) -> Optional[Dict]:
+        """某天的索引项（快照 -> 平台 -> 数据块偏移），供 mmap_reader 直接定位数据块"""
+        return self._day(date_folder)
+
+    def list_months(self) -> List[str]:
+        return sorted(
+            path.name[: -len(PACK_SUFFIX)]
+            for path in self.output_dir.glob(f"*{PACK_SUFFIX}")
+            if MONTH_PATTERN.match(path.name)
+        )
+
+    def list_dates(self) -> List[str]:
+        """所有已打包的日期"""
+        dates = []
+        for month in self.list_months():
+            dates.extend(sorted(self._index(month)["days"]))
+        return dates
+
+    def has_date(self, date_folder: str) -> bool:
+        day = self._day(date_folder)
+        return bool(day and day["snapshots"])
+
+    def list_snapshots(self, date_folder: str) -> List[Tuple[str, float]]:
+        """按时间顺序列出某天的快照 [(时间, 爬取时刻)]"""
+        day = self._day(date_folder)
+        if day is None:
+            return []
+        return [
+            (time_info, day["snapshots"][time_info]["crawled_at"])
+            for time_info in sorted(day["snapshots"])
+        ]
+
+    def load_day(
+        self,
+        date_folder: str,
+        platform_ids: Optional[List[str]] = None,
+        times: Optional[List[str]] = None,
+        since: Optional[str] = None,
+    ) -> List[DaySnapshot]:
+        """按时间顺序读取某天的快照，只读取所需快照和平台的数据块"""
+        day = self._day(date_folder)
+        if day is None:
+            return []
+        snapshots = []
+        with open(self.pack_path(month_of(date_folder)), "rb") as f:
+            for time_info in sorted(day["snapshots"]):
+                if times is not None and time_info not in times:
+                    continue
+                if since is not None and time_info < since:
+                    continue
+                titles_by_id: Dict = {}
+                id_to_name: Dict = {}
+                for source_id, (offset, length, _) in day["snapshots"][time_info]["platforms"].items():
+                    if platform_ids is not None and source_id not in platform_ids:
+                        continue
+                    f.seek(offset)
+                    block_titles, block_names, _ = decode_snapshot(f.read(length))
+                    titles_by_id.update(block_titles)
+                    id_to_name.update(block_names)
+                snapshots.append((time_info, titles_by_id, id_to_name))
+        return snapshots
+
+    def load_failed_ids(self, date_folder: str, time_info: str) -> List[str]:
+        """某次快照中请求失败的平台"""
+        day = self._day(date_folder)
+        if day is None or time_info not in day["snapshots"]:
+            return []
+        return list(day["snapshots"][time_info]["failed"])
+
+    def title_counts(self, date_folder: str, time_info: str) -> Dict[str, int]:
+        """某次快照各平台的标题数（只读索引）"""
+        day = self._day(date_folder)
+        if day is None or time_info not in day["snapshots"]:
+            return {}
+        return {
+            source_id: entry[2]
+            for source_id, entry in day["snapshots"][time_info]["platforms"].items()
+        }
+
+    def read_file(self, date_folder: str, name: str) -> Optional[bytes]:
+        """读取某天打包的其他文件（如 html/当日汇总.html）"""
+        day = self._day(date_folder)
+        if day is None or name not in day["files"]:
+            return None
+        offset, length, _ = day["files"][name]
+        with open(self.pack_path(month_of(date_folder)), "rb") as f:
+            f.seek(offset)
+            return zlib.decompress(f.read(length))
+
+    def _read_packed_day(self, date_folder: str) -> Tuple[List[SourceSnapshot], SourceFiles]:
+        """以打包来源的结构读取已打包的某天，用于合并到新的打包文件"""
+        day = self._day(date_folder)
+        snapshots = [
+            (
+                time_info,
+                day["snapshots"][time_info]["crawled_at"],
+                titles_by_id,
+                id_to_name,
+                self.load_failed_ids(date_folder, time_info),
+            )
+            for time_info, titles_by_id, id_to_name in self.load_day(date_folder)
+        ]
+        files = {
+            name: (entry[2], self.read_file(date_folder, name))
+            for name, entry in day["files"].items()
+        }
+        return snapshots, files
+
+    @staticmethod
+    def _write_day(
+        write_block: Callable[[bytes], Tuple[int, int]],
+        snapshots: List[SourceSnapshot],
+        files: SourceFiles,
+    ) -> Dict:
+        """写入某天的数据块，返回该天的索引"""
+        day: Dict = {"snapshots": {}, "files": {}}
+        for time_info, stamp, titles_by_id, id_to_name, failed_ids in snapshots:
+            platforms = {}
+            for source_id, titles in titles_by_id.items():
+                if titles:
+                    block = encode_snapshot({source_id: titles}, id_to_name, [])
+                    platforms[source_id] = [*write_block(block), len(titles)]
+            day["snapshots"][time_info] = {
+                "crawled_at": stamp,
+                "failed": list(failed_ids),
+                "platforms": platforms,
+            }
+        for name, (mtime, data) in sorted(files.items()):
+            day["files"][name] = [*write_block(zlib.compress(data, 9)), mtime]
+        return day
+
+    def pack_month(self, month: str) -> Optional[Path]:
+        """
+        将某月的日期目录和日期归档打包为一个文件，校验后删除来源
+
+        已有打包文件时，新的日期合并进去（同一天以新数据为准）
+
+        Returns:
+            打包文件路径，该月没有可打包的数据时返回 None
+        """
+        date_folders = [
+            date_folder
+            for date_folder in list_day_sources(self.output_dir)
+            if month_of(date_folder) == month
+        ]
+        if not date_folders:
+            return None
+
+        sources: Dict[str, Tuple[List[SourceSnapshot], SourceFiles]] = {}
+        index = self._index(month)
+        for date_folder in sorted(index["days"] if index else []):
+            if date_folder not in date_folders:
+                sources[date_folder] = self._read_packed_day(date_folder)
+        for date_folder in date_folders:
+            sources[date_folder] = _read_day_source(self.output_dir, date_folder)
+
+        # 先写入临时目录并用独立的实例校验，通过后再替换
+        pack_path = self.pack_path(month)
+        tmp_dir = self.output_dir / f".{month}{PACK_SUFFIX}.{os.getpid()}.tmp"
+        tmp_dir.mkdir(exist_ok=True)
+        tmp_path = tmp_dir / pack_path.name
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0))
+
+                def write_block(data: bytes) -> Tuple[int, int]:
+                    offset = f.tell()
+                    f.write(data)
+                    return offset, len(data)
+
+                days = {
+                    date_folder: self._write_day(write_block, *sources[date_folder])
+                    for date_folder in sorted(sources)
+                }
+                index_data = json.dumps({"month": month, "days": days}, ensure_ascii=False)
+                index_offset, index_length = write_block(zlib.compress(index_data.encode("utf-8"), 9))
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, index_offset, index_length))
+                f.flush()
+                os.fsync(f.fileno())
+
+            MonthPackStore(tmp_dir)._verify(sources)
+            os.replace(tmp_path, pack_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        for date_folder in date_folders:
+            day_dir = self.output_dir / date_folder
+            if day_dir.is_dir():
+                shutil.rmtree(day_dir)
+            archive_path = find_day_archive(self.output_dir, date_folder)
+            if archive_path is not None:
+                archive_path.unlink()
+        return pack_path
+
+    def _verify(self, sources: Dict[str, Tuple[List[SourceSnapshot], SourceFiles]]) -> None:
+        """校验打包文件中的快照和文件与来源一致"""
+        for date_folder, (snapshots, files) in sources.items():
+            expected = []
+            for time_info, _, titles_by_id, id_to_name, _ in snapshots:
+                titles_by_id = {k: v for k, v in titles_by_id.items() if v}
+                expected.append(
+                    (time_info, titles_by_id, {k: id_to_name.get(k) or k for k in titles_by_id})
+                )
+            if self.load_day(date_folder) != expected:
+                raise ValueError(f"{date_folder} 打包结果校验失败")
+            for name, (_, data) in files.items():
+                if self.read_file(date_folder, name) != data:
+                    raise ValueError(f"{date_folder}/{name} 打包结果校验失败")
+
+    def unpack_month(self, month: str) -> List[Path]:
+        """将打包文件还原为日期目录（快照写为 txt）并删除打包文件，返回还原的日期目录"""
+        index = self._index(month)
+        if index is None:
+            raise FileNotFoundError(f"{month} 没有打包文件")
+        restored = []
+        for date_folder, day in sorted(index["days"].items()):
+            day_dir = self.output_dir / date_folder
+            for time_info, titles_by_id, id_to_name in self.load_day(date_folder):
+                file_path = day_dir / "txt" / f"{time_info}.txt"
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                write_titles_file(
+                    str(file_path), titles_by_id, id_to_name, self.load_failed_ids(date_folder, time_info)
+                )
+                stamp = day["snapshots"][time_info]["crawled_at"]
+                os.utime(file_path, (stamp, stamp))
+            for name, (_, _, mtime) in day["files"].items():
+                file_path = day_dir / name
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(file_path, "wb") as f:
+                    f.write(self.read_file(date_folder, name))
+                os.utime(file_path, (mtime, mtime))
+            restored.append(day_dir)
+        self.pack_path(month).unlink()
+        return restored
+
+
+def pack_cold_months(output_dir: Union[str, Path], cutoff_date: str) -> List[Path]:
+    """
+    打包所有日期都早于 cutoff_date（YYYY年MM月DD日）所在月份的月份
+
+    Returns:
+        新生成或更新的打包文件列表
+    """
+    output_dir = Path(output_dir)
+    if not output_dir.exists():
+        return []
+    store = MonthPackStore(output_dir)
+    packed = []
+    for month in sorted({month_of(date_folder) for date_folder in list_day_sources(output_dir)}):
+        # 只打包已经结束且不在保留期内的月份，避免同一月份被反复重写
+        if month >= month_of(cutoff_date):
+            continue
+        try:
+            pack_path = store.pack_month(month)
+            if pack_path is not None:
+                packed.append(pack_path)
+        except Exception as e:
+            print(f"打包 {month} 失败: {e}")
+    return packed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrendRadar 月度打包工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in (("pack", "打包某月的日期目录和日期归档"), ("unpack", "将打包文件还原为日期目录")):
+        command_parser = subparsers.add_parser(command, help=help_text)
+        command_parser.add_argument("output_dir")
+        command_parser.add_argument("month", help="月份，如 2025年11月")
+    args = parser.parse_args()
+
+    store = MonthPackStore(args.output_dir)
+    if args.command == "pack":
+        pack_path = store.pack_month(args.month)
+        print(f"已打包到 {pack_path}" if pack_path else f"{args.month} 没有可打包的数据")
+    else:
+        print(f"已还原 {len(store.unpack_month(args.month))} 天")
@@ -0,0 +1,196 @@
+"""
+代理池
+
+按每个代理观测到的延迟和错误率打分，请求优先分配给得分最好的健康代理；
+错误率过高的代理在冷却期内被剔除，冷却结束后重新参与分配。
+状态持久化在 output/.crawl_cache 下，跨运行生效，文件中的代理地址不含账号密码。
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+
+def redact_proxy(proxy_url: Optional[str]) -> Optional[str]:
+    """去掉代理地址中的账号密码，用于日志和遥测"""
+    if not proxy_url:
+        return proxy_url
+    parsed = urlparse(proxy_url)
+    if not parsed.hostname:
+        return proxy_url
+    netloc = parsed.hostname
+    if parsed.port:
+        netloc = f"{netloc}:{parsed.port}"
+    return f"{parsed.scheme}://{netloc}"
+
+
+class ProxyPool:
+    """带健康评分的代理池，线程安全"""
+
+    def __init__(
+        self,
+        proxies: List[str],
+        state_dir: Optional[Union[str, Path]] = Path("output") / ".crawl_cache",
+        max_error_rate: float = 0.5,
+        min_samples: int = 3,
+        eviction_cooldown: int = 300,
+        smoothing: float = 0.3,
+    ):
+        """
+        初始化代理池
+
+        Args:
+            proxies: 代理地址列表
+            state_dir: 状态文件目录，为 None 时不持久化
+            max_error_rate: 错误率（指数平滑）超过该值的代理会被剔除
+            min_samples: 至少观测多少次请求后才会剔除
+            eviction_cooldown: 剔除后的冷却时间（秒）
+            smoothing: 延迟和错误率的指数平滑系数
+        """
+        self.proxies = list(dict.fromkeys(proxies))
+        self.state_file = Path(state_dir) / "proxy_pool.json" if state_dir else None
+        self.max_error_rate = max_error_rate
+        self.min_samples = max(1, min_samples)
+        self.eviction_cooldown = max(0, eviction_cooldown)
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {proxy: 0 for proxy in self.proxies}
+
+        saved = self._load()
+        self.states: Dict[str, Dict] = {
+            proxy: saved.get(
+                redact_proxy(proxy),
+                {
+                    "latency_ms": None,
+                    "error_rate": 0.0,
+                    "requests": 0,
+                    "failures": 0,
+                    "evicted_until": 0,
+                },
+            )
+            for proxy in self.proxies
+        }
+
+    def _load(self) -> Dict[str, Dict]:
+        """读取持久化的代理状态"""
+        if self.state_file is None or not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"读取代理池状态失败: {e}")
+            return {}
+
+    def _score(self, proxy: str) -> float:
+        """得分越低越优先：延迟按错误率和当前并发放大，未观测过的代理优先试用"""
+        state = self.states[proxy]
+        if state["latency_ms"] is None:
+            return 0.0
+        health = max(0.05, 1 - state["error_rate"])
+        return state["latency_ms"] * (1 + self._in_flight[proxy]) / health
+
+    def _is_evicted(self, proxy: str, now: float) -> bool:
+        return self.states[proxy]["evicted_until"] > now
+
+    def acquire(self) -> Optional[str]:
+        """
+        选择一个代理并计入并发，请求结束后必须调用 report
+
+        所有代理都被剔除时，选择最早结束冷却的代理，避免整体爬取失败。
+        """
+        if not self.proxies:
+            return None
+        now = time.time()
+        with self._lock:
+            healthy = [p for p in self.proxies if not self._is_evicted(p, now)]
+            if healthy:
+                proxy = min(healthy, key=self._score)
+            else:
+                proxy = min(self.proxies, key=lambda p: self.states[p]["evicted_until"])
+            self._in_flight[proxy] += 1
+            return proxy
+
+    def report(self, proxy: str, success: bool, latency_ms: Optional[float]) -> None:
+        """
+        记录一次请求结果
+
+        Args:
+            proxy: acquire 返回的代理
+            success: 代理是否成功转发（收到任意 HTTP 响应即视为成功）
+            latency_ms: 请求耗时（毫秒）
+        """
+        with self._lock:
+            if proxy not in self.states:
+                return
+            self._in_flight[proxy] = max(0, self._in_flight[proxy] - 1)
+            state = self.states[proxy]
+            state["requests"] += 1
+            if not success:
+                state["failures"] += 1
+            state["error_rate"] = round(
+                self.smoothing * (0.0 if success else 1.0)
+                + (1 - self.smoothing) * state["error_rate"],
+                4,
+            )
+            if success and latency_ms is not None:
+                if state["latency_ms"] is None:
+                    state["latency_ms"] = round(latency_ms, 2)
+                else:
+                    state["latency_ms"] = round(
+                        self.smoothing * latency_ms
+                        + (1 - self.smoothing) * state["latency_ms"],
+                        2,
+                    )
+
+            if (
+                state["error_rate"] > self.max_error_rate
+                and state["requests"] >= self.min_samples
+                and state["evicted_until"] <= time.time()
+            ):
+                state["evicted_until"] = time.time() + self.eviction_cooldown
+                # 冷却结束后以中等错误率重新参与分配，再次出错会很快被剔除
+                state["error_rate"] = round(self.max_error_rate / 2, 4)
+                print(
+                    f"代理 {redact_proxy(proxy)} 错误率过高，"
+                    f"剔除 {self.eviction_cooldown} 秒"
+                )
+
+    def snapshot(self) -> List[Dict]:
+        """各代理当前状态（地址已脱敏），用于遥测"""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "proxy": redact_proxy(proxy),
+                    "latency_ms": self.states[proxy]["latency_ms"],
+                    "error_rate": self.states[proxy]["error_rate"],
+                    "requests": self.states[proxy]["requests"],
+                    "failures": self.states[proxy]["failures"],
+                    "evicted": self._is_evicted(proxy, now),
+                    "score": round(self._score(proxy), 2),
+                }
+                for proxy in self.proxies
+            ]
+
+    def save(self) -> None:
+        """持久化代理状态"""
+        if self.state_file is None:
+            return
+        try:
+            with self._lock:
+                data = json.dumps(
+                    {redact_proxy(proxy): state for proxy, state in self.states.items()},
+                    ensure_ascii=False,
+                )
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"保存代理池状态失败: {e}")
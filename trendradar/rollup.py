@@ -0,0 +1,87 @@
+"""
+当日汇总的增量维护
+
+当日汇总需要合并当天所有快照（标题首次/最后出现时间、出现次数、排名）。每次运行都重新
+解析全天快照，晚上的开销随快照数线性增长。汇总结果保存在 output/<日期>/rollup.json，
+并记录已合并的快照（时间和写入时刻），下次运行只合并新增的快照。
+
+已合并的快照与当前快照列表不一致（如同一时间的快照被覆盖、快照被删除或补写了更早的
+快照）时，丢弃汇总从头合并。
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+ROLLUP_NAME = "rollup.json"
+ROLLUP_VERSION = 1
+
+
+def new_rollup() -> Dict:
+    """空的汇总：snapshots 为已合并的 [时间, 写入时刻]，title_info 与 read_all_today_titles 返回值相同"""
+    return {"version": ROLLUP_VERSION, "snapshots": [], "id_to_name": {}, "title_info": {}}
+
+
+def results_from_title_info(title_info: Dict) -> Dict:
+    """由 title_info 还原 all_results（两者的排名和链接合并规则相同，因此只持久化 title_info）"""
+    return {
+        source_id: {
+            title: {"ranks": info["ranks"], "url": info["url"], "mobileUrl": info["mobileUrl"]}
+            for title, info in titles.items()
+        }
+        for source_id, titles in title_info.items()
+    }
+
+
+class DailyRollup:
+    """按天持久化的当日汇总"""
+
+    def __init__(self, output_dir: Union[str, Path] = "output"):
+        self.output_dir = Path(output_dir)
+
+    def _path(self, date_folder: str) -> Path:
+        return self.output_dir / date_folder / ROLLUP_NAME
+
+    def load(
+        self, date_folder: str, snapshots: List[Tuple[str, float]]
+    ) -> Tuple[Dict, List[str]]:
+        """
+        读取某天的汇总
+
+        Args:
+            date_folder: 日期（YYYY年MM月DD日）
+            snapshots: 当前按时间顺序排列的快照 [(时间, 写入时刻)]
+
+        Returns:
+            (汇总, 尚未合并的快照时间列表)，汇总不可用时返回空汇总和全部快照
+        """
+        rollup = None
+        file_path = self._path(date_folder)
+        if file_path.exists():
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    rollup = json.load(f)
+            except Exception as e:
+                print(f"读取当日汇总失败: {e}")
+
+        current = [[time_info, stamp] for time_info, stamp in snapshots]
+        if (
+            rollup is None
+            or rollup.get("version") != ROLLUP_VERSION
+            or current[: len(rollup["snapshots"])] != rollup["snapshots"]
+        ):
+            return new_rollup(), [time_info for time_info, _ in snapshots]
+        return rollup, [time_info for time_info, _ in snapshots[len(rollup["snapshots"]):]]
+
+    def save(self, date_folder: str, rollup: Dict) -> None:
+        """持久化汇总（先写临时文件再替换，避免中途退出留下半个文件）"""
+        file_path = self._path(date_folder)
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(rollup, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            print(f"保存当日汇总失败: {e}")
@@ -0,0 +1,136 @@
+"""
+自适应轮询调度
+
+根据每个平台历史上的标题变化速度，决定本次运行是否需要请求该平台：
+变化快的平台（微博、抖音等）每次都爬取，变化慢的平台（澎湃、凤凰等）拉长间隔，
+在相同的请求预算下获得更新鲜的数据。状态持久化在 output/.crawl_cache 下。
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+
+IdInfoT = TypeVar("IdInfoT")
+
+
+class AdaptivePollingScheduler:
+    """按平台标题变化速度调整轮询间隔"""
+
+    def __init__(
+        self,
+        state_dir: Union[str, Path] = Path("output") / ".crawl_cache",
+        min_interval: float = 0,
+        max_interval: float = 120,
+        target_churn: float = 0.2,
+        smoothing: float = 0.3,
+    ):
+        """
+        初始化调度器
+
+        Args:
+            state_dir: 状态文件目录
+            min_interval: 最短轮询间隔（分钟）
+            max_interval: 最长轮询间隔（分钟）
+            target_churn: 两次轮询之间期望变化的标题比例
+            smoothing: 变化速度的指数平滑系数，越大越看重最近一次观测
+        """
+        self.state_file = Path(state_dir) / "polling_schedule.json"
+        self.min_interval = max(0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.target_churn = target_churn
+        self.smoothing = smoothing
+        self.states: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """读取持久化的调度状态"""
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"读取轮询调度状态失败: {e}")
+            return {}
+
+    @staticmethod
+    def _title_key(title: str) -> str:
+        return hashlib.md5(title.encode("utf-8")).hexdigest()[:12]
+
+    def get_interval(self, id_value: str) -> float:
+        """平台当前的轮询间隔（分钟），尚无观测数据时返回最短间隔"""
+        rate = self.states.get(id_value, {}).get("churn_rate")
+        if rate is None:
+            return self.min_interval
+        if rate <= 0:
+            return self.max_interval
+        interval = self.target_churn / rate
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def is_due(self, id_value: str, now: Optional[float] = None) -> bool:
+        """距离上次轮询是否已达到该平台的轮询间隔"""
+        state = self.states.get(id_value)
+        if not state or "last_polled" not in state:
+            return True
+        now = time.time() if now is None else now
+        elapsed = (now - state["last_polled"]) / 60
+        return elapsed >= self.get_interval(id_value)
+
+    def split(self, ids_list: List[IdInfoT]) -> Tuple[List[IdInfoT], List[IdInfoT]]:
+        """
+        将平台列表分为本次需要爬取的和可以推迟的
+
+        Args:
+            ids_list: 平台ID或 (平台ID, 名称) 列表
+
+        Returns:
+            (due, deferred) 元组，保持原有顺序
+        """
+        now = time.time()
+        due, deferred = [], []
+        for id_info in ids_list:
+            id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+            (due if self.is_due(id_value, now) else deferred).append(id_info)
+        return due, deferred
+
+    def observe(self, id_value: str, titles: Iterable[str]) -> None:
+        """
+        记录一次成功轮询，更新该平台的标题变化速度
+
+        变化速度 = 新出现标题占比 / 距上次轮询的分钟数，并做指数平滑。
+        """
+        now = time.time()
+        current_keys = {self._title_key(title) for title in titles}
+        state = self.states.get(id_value, {})
+        previous_keys = set(state.get("title_keys", []))
+
+        churn_rate = state.get("churn_rate")
+        if previous_keys and current_keys and "last_polled" in state:
+            elapsed = max(1.0, (now - state["last_polled"]) / 60)
+            churn = len(current_keys - previous_keys) / len(current_keys)
+            observed_rate = churn / elapsed
+            if churn_rate is None:
+                churn_rate = observed_rate
+            else:
+                churn_rate = (
+                    self.smoothing * observed_rate + (1 - self.smoothing) * churn_rate
+                )
+
+        self.states[id_value] = {
+            "last_polled": now,
+            "churn_rate": churn_rate,
+            "title_keys": sorted(current_keys),
+        }
+
+    def save(self) -> None:
+        """持久化调度状态"""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.states, f, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"保存轮询调度状态失败: {e}")
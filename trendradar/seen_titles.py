@@ -0,0 +1,196 @@
+"""
+已出现标题索引
+
+新增标题检测需要知道最新快照中的标题此前是否出现过。逐个重新解析当天（或更长时间范围）
+的快照代价随快照数增长，这里按平台持久化标题哈希及最近两次出现的快照时刻，
+每保存一个快照更新一次，判断标题是否新增只需一次字典查找。
+
+时间范围（horizon）：
+    "today"   当天首次出现（与逐个对比当天快照的结果一致）
+    "24h"     最近 24 小时内首次出现，也可写作任意小时数，如 "12h"
+    "7d"      最近 7 天内首次出现，也可写作任意天数
+
+快照时刻由日期目录和时间文件名换算（分钟精度），同一快照重复写入不会改变结果。
+索引保存在 output/.crawl_cache/seen_titles.json。
+"""
+
+import calendar
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .snapshot import title_hash
+
+DAY_SECONDS = 86400
+INDEX_VERSION = 1
+HORIZON_PATTERN = re.compile(r"^(\d+)\s*([hd])$")
+
+
+def parse_horizon(horizon: str) -> Optional[int]:
+    """
+    解析时间范围
+
+    Returns:
+        时间范围秒数，"today" 返回 None
+
+    Raises:
+        ValueError: 无法识别的时间范围
+    """
+    value = str(horizon).strip().lower()
+    if value == "today":
+        return None
+    match = HORIZON_PATTERN.match(value)
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"无法识别的新增标题时间范围: {horizon}（可选 today / 24h / 7d）")
+    amount = int(match.group(1))
+    return amount * 3600 if match.group(2) == "h" else amount * DAY_SECONDS
+
+
+def snapshot_timestamp(date_folder: str, time_info: str) -> int:
+    """快照时刻（日期目录 + HH时MM分，按 UTC 换算，只用于比较先后和间隔）"""
+    moment = datetime.strptime(f"{date_folder}{time_info}", "%Y年%m月%d日%H时%M分")
+    return calendar.timegm(moment.timetuple())
+
+
+class SeenTitleIndex:
+    """按平台记录已出现标题的哈希"""
+
+    def __init__(
+        self,
+        state_dir: Union[str, Path] = Path("output") / ".crawl_cache",
+        horizon: str = "today",
+    ):
+        """
+        初始化索引
+
+        Args:
+            state_dir: 状态文件目录
+            horizon: 新增标题的判断范围，见模块说明
+        """
+        self.state_file = Path(state_dir) / "seen_titles.json"
+        self.horizon = horizon
+        self.horizon_seconds = parse_horizon(horizon)
+        # snapshots: {"日期/时间": 写入时刻}，platforms: {平台ID: {标题哈希: [上一次出现, 最近一次出现]}}
+        self.state: Dict = self._load()
+
+    def _load(self) -> Dict:
+        """读取持久化的索引"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get("version") == INDEX_VERSION:
+                    return state
+            except Exception as e:
+                print(f"读取标题索引失败: {e}")
+        return {"version": INDEX_VERSION, "snapshots": {}, "platforms": {}}
+
+    def _horizon_start(self, date_folder: str, timestamp: int) -> int:
+        if self.horizon_seconds is None:
+            return snapshot_timestamp(date_folder, "00时00分")
+        return timestamp - self.horizon_seconds
+
+    def horizon_dates(self, date_folder: str) -> List[str]:
+        """当前时间范围涉及的日期目录（从早到晚）"""
+        days = 0 if self.horizon_seconds is None else -(-self.horizon_seconds // DAY_SECONDS)
+        current = datetime.strptime(date_folder, "%Y年%m月%d日")
+        return [
+            (current - timedelta(days=offset)).strftime("%Y年%m月%d日")
+            for offset in range(days, -1, -1)
+        ]
+
+    def within_horizon(self, date_folder: str, earlier_time: str, time_info: str) -> bool:
+        """同一天中较早的快照是否在 time_info 快照的时间范围内"""
+        timestamp = snapshot_timestamp(date_folder, time_info)
+        return snapshot_timestamp(date_folder, earlier_time) >= self._horizon_start(date_folder, timestamp)
+
+    def is_recorded(self, date_folder: str, time_info: str, stamp: float) -> bool:
+        """快照是否已记录（写入时刻变化视为未记录，如同一时间的快照被覆盖）"""
+        return self.state["snapshots"].get(f"{date_folder}/{time_info}") == stamp
+
+    def record(
+        self, date_folder: str, time_info: str, stamp: float, titles_by_id: Dict
+    ) -> None:
+        """记录一个快照中出现的标题"""
+        timestamp = snapshot_timestamp(date_folder, time_info)
+        platforms = self.state["platforms"]
+        for source_id, title_data in titles_by_id.items():
+            seen = platforms.setdefault(source_id, {})
+            for title in title_data:
+                key = str(title_hash(title))
+                entry = seen.get(key)
+                if entry is None:
+                    seen[key] = [None, timestamp]
+                elif timestamp > entry[1]:
+                    seen[key] = [entry[1], timestamp]
+                elif timestamp < entry[1] and (entry[0] is None or timestamp > entry[0]):
+                    entry[0] = timestamp
+        self.state["snapshots"][f"{date_folder}/{time_info}"] = stamp
+
+    def new_titles(self, date_folder: str, time_info: str, titles_by_id: Dict) -> Dict:
+        """
+        找出快照中在时间范围内首次出现的标题（快照需已记录）
+
+        时间范围内没有更早的快照时（如当天首次爬取）返回空字典，避免把所有标题都当作新增
+        """
+        timestamp = snapshot_timestamp(date_folder, time_info)
+        start = self._horizon_start(date_folder, timestamp)
+        has_history = any(
+            start <= snapshot_timestamp(*key.split("/", 1)) < timestamp
+            for key in self.state["snapshots"]
+        )
+        if not has_history:
+            return {}
+
+        new_titles = {}
+        platforms = self.state["platforms"]
+        for source_id, title_data in titles_by_id.items():
+            seen = platforms.get(source_id, {})
+            source_new_titles = {}
+            for title, data in title_data.items():
+                entry = seen.get(str(title_hash(title)))
+                if entry is None:
+                    previous = None
+                else:
+                    previous = entry[0] if entry[1] >= timestamp else entry[1]
+                if previous is None or previous < start:
+                    source_new_titles[title] = data
+            if source_new_titles:
+                new_titles[source_id] = source_new_titles
+        return new_titles
+
+    def prune(self, date_folder: str, time_info: str) -> None:
+        """清理早于时间范围的快照记录和标题"""
+        timestamp = snapshot_timestamp(date_folder, time_info)
+        cutoff = min(
+            self._horizon_start(date_folder, timestamp), timestamp - DAY_SECONDS
+        )
+        self.state["snapshots"] = {
+            key: stamp
+            for key, stamp in self.state["snapshots"].items()
+            if snapshot_timestamp(*key.split("/", 1)) >= cutoff
+        }
+        for source_id in list(self.state["platforms"]):
+            seen = {
+                key: entry
+                for key, entry in self.state["platforms"][source_id].items()
+                if entry[1] >= cutoff
+            }
+            if seen:
+                self.state["platforms"][source_id] = seen
+            else:
+                del self.state["platforms"][source_id]
+
+    def save(self) -> None:
+        """持久化索引（先写临时文件再替换，避免中途退出留下半个文件）"""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, separators=(",", ":"))
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"保存标题索引失败: {e}")
@@ -0,0 +1,140 @@
+"""
+快照文件读写
+
+定义 output/<日期>/txt/<时间>.txt 快照文件的格式。
+"""
+
+import hashlib
+import os
+from typing import Dict, List, Tuple
+
+from .models import NewsItem
+from .utils import clean_title
+
+
+def title_hash(title: str) -> int:
+    """标题的 64 位哈希（有符号，适配 SQLite INTEGER，也用于已出现标题索引）"""
+    digest = hashlib.blake2b(title.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def sort_titles(title_data: Dict) -> List[Tuple[int, str, str, str]]:
+    """清理标题并按排名排序，返回 [(排名, 标题, url, mobileUrl)]，排名相同时保持原有顺序"""
+    sorted_titles = []
+    for title, info in title_data.items():
+        cleaned_title = clean_title(title)
+        if isinstance(info, (dict, NewsItem)):
+            ranks = info.get("ranks", [])
+            url = info.get("url", "")
+            mobile_url = info.get("mobileUrl", "")
+        else:
+            ranks = info if isinstance(info, list) else []
+            url = ""
+            mobile_url = ""
+
+        rank = ranks[0] if ranks else 1
+        sorted_titles.append((rank, cleaned_title, url or "", mobile_url or ""))
+
+    sorted_titles.sort(key=lambda x: x[0])
+    return sorted_titles
+
+
+def format_titles(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
+    """将爬取结果格式化为快照文本"""
+    lines = []
+    for id_value, title_data in results.items():
+        # id | name 或 id
+        name = id_to_name.get(id_value)
+        if name and name != id_value:
+            lines.append(f"{id_value} | {name}")
+        else:
+            lines.append(f"{id_value}")
+
+        # 按排名排序标题
+        for rank, cleaned_title, url, mobile_url in sort_titles(title_data):
+            line = f"{rank}. {cleaned_title}"
+
+            if url:
+                line += f" [URL:{url}]"
+            if mobile_url:
+                line += f" [MOBILE:{mobile_url}]"
+            lines.append(line)
+
+        lines.append("")
+
+    if failed_ids:
+        lines.append("==== 以下ID请求失败 ====")
+        for id_value in failed_ids:
+            lines.append(f"{id_value}")
+
+    return "".join(f"{line}\n" for line in lines)
+
+
+def parse_titles(content: str) -> Tuple[Dict, Dict, List]:
+    """
+    解析快照文本，format_titles 的逆操作
+
+    Returns:
+        (titles_by_id, id_to_name, failed_ids)，没有标题的平台不包含在内
+    """
+    titles_by_id: Dict = {}
+    id_to_name: Dict = {}
+    failed_ids: List = []
+
+    for section in content.split("\n\n"):
+        if not section.strip():
+            continue
+        lines = section.strip().split("\n")
+        if "==== 以下ID请求失败 ====" in section:
+            failed_ids.extend(
+                line.strip() for line in lines
+                if line.strip() and "==== 以下ID请求失败 ====" not in line
+            )
+            continue
+        if len(lines) < 2:
+            continue
+
+        # id | name 或 id
+        header_line = lines[0].strip()
+        if " | " in header_line:
+            source_id, name = (part.strip() for part in header_line.split(" | ", 1))
+        else:
+            source_id = name = header_line
+        id_to_name[source_id] = name
+        titles_by_id[source_id] = {}
+
+        for line in lines[1:]:
+            title_part = line.strip()
+            if not title_part:
+                continue
+            rank = None
+            if ". " in title_part and title_part.split(". ")[0].isdigit():
+                rank_str, title_part = title_part.split(". ", 1)
+                rank = int(rank_str)
+            mobile_url = ""
+            if " [MOBILE:" in title_part:
+                title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
+                if mobile_part.endswith("]"):
+                    mobile_url = mobile_part[:-1]
+            url = ""
+            if " [URL:" in title_part:
+                title_part, url_part = title_part.rsplit(" [URL:", 1)
+                if url_part.endswith("]"):
+                    url = url_part[:-1]
+            titles_by_id[source_id][clean_title(title_part)] = {
+                "ranks": [rank] if rank is not None else [1],
+                "url": url,
+                "mobileUrl": mobile_url,
+            }
+    return titles_by_id, id_to_name, failed_ids
+
+
+def write_titles_file(
+    file_path: str, results: Dict, id_to_name: Dict, failed_ids: List
+) -> str:
+    """将爬取结果写入快照文件（先写临时文件再替换，读取方不会看到写了一半的快照）"""
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(format_titles(results, id_to_name, failed_ids))
+    os.replace(tmp_path, file_path)
+    return file_path
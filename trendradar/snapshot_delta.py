@@ -0,0 +1,152 @@
+"""
+快照增量记录
+
+相邻两次爬取的快照大部分标题相同，只有少量标题新增、消失或排名变化。每保存一个快照，
+按平台将其与上一个快照的标题做一次哈希对比，得到新增、消失和排名变化的标题，
+保存在 output/<日期>/deltas.json，后续只需读取增量而不必重新解析整个快照。
+
+记录格式：
+    {"version": 1, "records": [
+        {"time": 时间, "stamp": 写入时刻,
+         "platforms": {平台ID: {"added": [[标题, 排名, url, mobileUrl]],
+                                 "removed": [标题],
+                                 "moved": [[标题, 原排名, 新排名]]}}}
+    ]}
+
+当天第一个快照的所有标题都记为新增，按顺序回放增量即可还原任一快照的标题和排名。
+快照中缺失的平台（如请求失败）记为所有标题消失，再次出现时所有标题记为新增。
+没有变化的平台、空列表均不写入。
+
+已记录的快照与当前快照列表不一致（如同一时间的快照被覆盖）时，从第一个不一致的快照起重新计算。
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+DELTAS_NAME = "deltas.json"
+DELTAS_VERSION = 1
+
+
+def new_deltas() -> Dict:
+    return {"version": DELTAS_VERSION, "records": []}
+
+
+def replay_deltas(records: List[Dict]) -> Dict[str, Dict[str, int]]:
+    """按顺序回放增量，返回最后一个快照的标题排名 {平台ID: {标题: 排名}}"""
+    state: Dict[str, Dict[str, int]] = {}
+    for record in records:
+        for source_id, delta in record["platforms"].items():
+            ranks = state.setdefault(source_id, {})
+            for title in delta.get("removed", ()):
+                ranks.pop(title, None)
+            for title, rank, _, _ in delta.get("added", ()):
+                ranks[title] = rank
+            for title, _, rank in delta.get("moved", ()):
+                ranks[title] = rank
+            if not ranks:
+                del state[source_id]
+    return state
+
+
+def diff_snapshot(
+    state: Dict[str, Dict[str, int]], time_info: str, stamp: float, titles_by_id: Dict
+) -> Dict:
+    """
+    计算一个快照相对上一个快照（state）的增量，并将 state 更新为该快照的标题排名
+
+    每个平台只遍历一次当前标题和上一次的标题（字典查找），排名取快照中的第一个排名
+    """
+    platforms = {}
+    for source_id, title_data in titles_by_id.items():
+        previous = state.get(source_id, {})
+        current: Dict[str, int] = {}
+        added = []
+        moved = []
+        for title, data in title_data.items():
+            ranks = data.get("ranks") or [0]
+            rank = ranks[0]
+            current[title] = rank
+            old_rank = previous.get(title)
+            if old_rank is None:
+                added.append([title, rank, data.get("url", ""), data.get("mobileUrl", "")])
+            elif old_rank != rank:
+                moved.append([title, old_rank, rank])
+        removed = [title for title in previous if title not in current]
+
+        delta = {}
+        if added:
+            delta["added"] = added
+        if removed:
+            delta["removed"] = removed
+        if moved:
+            delta["moved"] = moved
+        if delta:
+            platforms[source_id] = delta
+        state[source_id] = current
+
+    # 本次缺失的平台（如请求失败）记为全部消失，下次出现时全部记为新增
+    for source_id in list(state):
+        if source_id not in titles_by_id:
+            if state[source_id]:
+                platforms[source_id] = {"removed": list(state[source_id])}
+            del state[source_id]
+    return {"time": time_info, "stamp": stamp, "platforms": platforms}
+
+
+class SnapshotDeltas:
+    """按天持久化的快照增量记录"""
+
+    def __init__(self, output_dir: Union[str, Path] = "output"):
+        self.output_dir = Path(output_dir)
+
+    def _path(self, date_folder: str) -> Path:
+        return self.output_dir / date_folder / DELTAS_NAME
+
+    def read(self, date_folder: str) -> Dict:
+        """读取某天的增量记录，不存在或无法读取时返回空记录"""
+        file_path = self._path(date_folder)
+        if file_path.exists():
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    deltas = json.load(f)
+                if deltas.get("version") == DELTAS_VERSION:
+                    return deltas
+            except Exception as e:
+                print(f"读取快照增量失败: {e}")
+        return new_deltas()
+
+    def load(
+        self, date_folder: str, snapshots: List[Tuple[str, float]]
+    ) -> Tuple[Dict, List[str]]:
+        """
+        读取某天的增量记录
+
+        Args:
+            date_folder: 日期（YYYY年MM月DD日）
+            snapshots: 当前按时间顺序排列的快照 [(时间, 写入时刻)]
+
+        Returns:
+            (增量记录, 尚未计算增量的快照时间列表)，只保留与当前快照列表一致的前缀记录
+        """
+        deltas = self.read(date_folder)
+        kept = 0
+        for record, (time_info, stamp) in zip(deltas["records"], snapshots):
+            if record["time"] != time_info or record["stamp"] != stamp:
+                break
+            kept += 1
+        deltas["records"] = deltas["records"][:kept]
+        return deltas, [time_info for time_info, _ in snapshots[kept:]]
+
+    def save(self, date_folder: str, deltas: Dict) -> None:
+        """持久化增量记录（先写临时文件再替换，避免中途退出留下半个文件）"""
+        file_path = self._path(date_folder)
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(deltas, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            print(f"保存快照增量失败: {e}")
@@ -0,0 +1,332 @@
+"""
+SQLite 新闻存储
+
+以 SQLite 保存每次爬取的快照，替代逐个解析 output/<日期>/txt/<时间>.txt：
+- snapshots：每次爬取一行（日期、时间、爬取时刻）
+- platforms：平台ID与名称
+- snapshot_platforms：快照中各平台的顺序和状态（成功/失败）
+- observations：标题观测记录（排名、链接、标题哈希）
+
+读取结果与解析 txt 快照一致，txt 仍可通过 export_txt 导出。
+命令行用法：
+    python -m trendradar.sqlite_store import output            # 导入已有 txt 快照
+    python -m trendradar.sqlite_store export 2025年11月12日     # 导出某天的 txt 快照
+"""
+
+import argparse
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .day_manifest import DayManifest
+from .snapshot import parse_titles, sort_titles, title_hash, write_titles_file
+
+DEFAULT_DB_PATH = Path("output") / "news.db"
+
+# 快照内容：(时间, {平台ID: {标题: {ranks, url, mobileUrl}}}, {平台ID: 平台名称})
+DaySnapshot = Tuple[str, Dict, Dict]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    crawled_at REAL NOT NULL,
+    UNIQUE (date, time)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_date ON snapshots (date);
+
+CREATE TABLE IF NOT EXISTS platforms (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS snapshot_platforms (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    platform_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    failed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (snapshot_id, platform_id)
+);
+
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    platform_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    title_hash INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    mobile_url TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_observations_snapshot ON observations (snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_observations_platform ON observations (platform_id);
+CREATE INDEX IF NOT EXISTS idx_observations_title_hash ON observations (title_hash);
+"""
+
+
+def folder_to_date(date_folder: str) -> str:
+    """YYYY年MM月DD日 -> YYYY-MM-DD"""
+    return datetime.strptime(date_folder, "%Y年%m月%d日").strftime("%Y-%m-%d")
+
+
+def date_to_folder(date: str) -> str:
+    """YYYY-MM-DD -> YYYY年MM月DD日"""
+    return datetime.strptime(date, "%Y-%m-%d").strftime("%Y年%m月%d日")
+
+
+class SQLiteNewsStore:
+    """SQLite 快照存储，每次操作使用独立连接，可在多线程中共享"""
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.execute("PRAGMA journal_mode = WAL")
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def save_snapshot(
+        self,
+        date_folder: str,
+        time_info: str,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        crawled_at: Optional[float] = None,
+    ) -> int:
+        """
+        保存一次爬取快照，同一日期和时间的快照会被覆盖
+
+        Args:
+            date_folder: 日期（YYYY年MM月DD日）
+            time_info: 时间（HH时MM分）
+            results: {平台ID: {标题: NewsItem 或 dict}}
+            id_to_name: {平台ID: 平台名称}
+            failed_ids: 请求失败的平台ID
+            crawled_at: 爬取时刻（Unix 时间），默认为当前时间
+
+        Returns:
+            快照ID
+        """
+        if crawled_at is None:
+            crawled_at = time.time()
+        date = folder_to_date(date_folder)
+
+        platform_rows = []
+        observation_rows = []
+        position = 0
+        for id_value, title_data in results.items():
+            name = id_to_name.get(id_value) or id_value
+            platform_rows.append((id_value, name, position, 0))
+            position += 1
+            for rank, title, url, mobile_url in sort_titles(title_data):
+                observation_rows.append(
+                    (id_value, title, title_hash(title), rank, url, mobile_url)
+                )
+        for id_value in failed_ids:
+            if id_value in results:
+                continue
+            platform_rows.append((id_value, id_to_name.get(id_value) or id_value, position, 1))
+            position += 1
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM snapshots WHERE date = ? AND time = ?", (date, time_info)
+            )
+            snapshot_id = conn.execute(
+                "INSERT INTO snapshots (date, time, crawled_at) VALUES (?, ?, ?)",
+                (date, time_info, crawled_at),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO platforms (id, name) VALUES (?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET name = excluded.name",
+                [(row[0], row[1]) for row in platform_rows if not row[3]],
+            )
+            conn.executemany(
+                "INSERT INTO snapshot_platforms (snapshot_id, platform_id, name, position, failed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(snapshot_id, *row) for row in platform_rows],
+            )
+            conn.executemany(
+                "INSERT INTO observations "
+                "(snapshot_id, platform_id, title, title_hash, rank, url, mobile_url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(snapshot_id, *row) for row in observation_rows],
+            )
+        return snapshot_id
+
+    def list_dates(self) -> List[str]:
+        """按时间顺序列出有快照的日期（YYYY年MM月DD日）"""
+        if not self.exists():
+            return []
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT date FROM snapshots ORDER BY date"
+            ).fetchall()
+        return [date_to_folder(row[0]) for row in rows]
+
+    def list_snapshots(self, date_folder: str) -> List[Tuple[str, float]]:
+        """按时间顺序列出某天的快照 [(时间, 爬取时刻)]"""
+        if not self.exists():
+            return []
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT time, crawled_at FROM snapshots WHERE date = ? ORDER BY time",
+                (folder_to_date(date_folder),),
+            ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def has_date(self, date_folder: str) -> bool:
+        return bool(self.list_snapshots(date_folder))
+
+    def load_day(
+        self,
+        date_folder: str,
+        platform_ids: Optional[List[str]] = None,
+        times: Optional[List[str]] = None,
+    ) -> List[DaySnapshot]:
+        """
+        按时间顺序读取某天的快照，结构与解析 txt 快照相同
+
+        Args:
+            date_folder: 日期（YYYY年MM月DD日）
+            platform_ids: 只读取这些平台，None 表示全部
+            times: 只读取这些时间的快照，None 表示全部
+
+        Returns:
+            [(时间, titles_by_id, id_to_name)]，没有标题的平台不包含在内
+        """
+        if not self.exists():
+            return []
+        date = folder_to_date(date_folder)
+        query = (
+            "SELECT s.time, o.platform_id, sp.name, o.title, o.rank, o.url, o.mobile_url "
+            "FROM snapshots s "
+            "JOIN snapshot_platforms sp ON sp.snapshot_id = s.id "
+            "JOIN observations o ON o.snapshot_id = s.id AND o.platform_id = sp.platform_id "
+            "WHERE s.date = ?"
+        )
+        params: List = [date]
+        if platform_ids is not None:
+            query += f" AND o.platform_id IN ({','.join('?' * len(platform_ids))})"
+            params.extend(platform_ids)
+        if times is not None:
+            query += f" AND s.time IN ({','.join('?' * len(times))})"
+            params.extend(times)
+        query += " ORDER BY s.time, sp.position, o.id"
+
+        with closing(self._connect()) as conn:
+            # 没有任何标题的快照同样保留，与 txt 快照文件一一对应
+            snapshots: Dict[str, DaySnapshot] = {
+                row[0]: (row[0], {}, {})
+                for row in conn.execute(
+                    "SELECT time FROM snapshots WHERE date = ? ORDER BY time", (date,)
+                )
+                if times is None or row[0] in times
+            }
+            for time_info, platform_id, name, title, rank, url, mobile_url in conn.execute(
+                query, params
+            ):
+                _, titles_by_id, id_to_name = snapshots[time_info]
+                if platform_id not in titles_by_id:
+                    titles_by_id[platform_id] = {}
+                    id_to_name[platform_id] = name
+                titles_by_id[platform_id][title] = {
+                    "ranks": [rank],
+                    "url": url,
+                    "mobileUrl": mobile_url,
+                }
+        return list(snapshots.values())
+
+    def load_failed_ids(self, date_folder: str, time_info: str) -> List[str]:
+        """某次快照中请求失败的平台"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT sp.platform_id FROM snapshot_platforms sp "
+                "JOIN snapshots s ON s.id = sp.snapshot_id "
+                "WHERE s.date = ? AND s.time = ? AND sp.failed = 1 ORDER BY sp.position",
+                (folder_to_date(date_folder), time_info),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def export_txt(self, date_folder: str, output_dir: Union[str, Path] = "output") -> List[Path]:
+        """将某天的快照导出为 txt 快照文件，返回写入的文件列表"""
+        txt_dir = Path(output_dir) / date_folder / "txt"
+        txt_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for time_info, titles_by_id, id_to_name in self.load_day(date_folder):
+            file_path = txt_dir / f"{time_info}.txt"
+            write_titles_file(
+                str(file_path),
+                titles_by_id,
+                id_to_name,
+                self.load_failed_ids(date_folder, time_info),
+            )
+            written.append(file_path)
+        # 导出的 txt 快照整体替换了该天的 txt 目录内容，重建快照清单
+        DayManifest(output_dir).rebuild(date_folder)
+        return written
+
+    def import_txt(self, output_dir: Union[str, Path] = "output") -> int:
+        """导入 output 目录下已有的 txt 快照，返回导入的快照数"""
+        count = 0
+        for date_dir in sorted(Path(output_dir).iterdir()):
+            if not date_dir.is_dir() or date_dir.name.startswith("."):
+                continue
+            try:
+                folder_to_date(date_dir.name)
+            except ValueError:
+                continue
+            txt_dir = date_dir / "txt"
+            if not txt_dir.exists():
+                continue
+            for file_path in sorted(txt_dir.glob("*.txt")):
+                with open(file_path, "r", encoding="utf-8") as f:
+                    results, id_to_name, failed_ids = parse_titles(f.read())
+                self.save_snapshot(
+                    date_dir.name,
+                    file_path.stem,
+                    results,
+                    id_to_name,
+                    failed_ids,
+                    crawled_at=file_path.stat().st_mtime,
+                )
+                count += 1
+        return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrendRadar SQLite 新闻存储工具")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="数据库路径")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="导入已有的 txt 快照")
+    import_parser.add_argument("output_dir", nargs="?", default="output")
+    export_parser = subparsers.add_parser("export", help="导出某天的 txt 快照")
+    export_parser.add_argument("date", help="日期，如 2025年11月12日")
+    export_parser.add_argument("--output-dir", default="output")
+    args = parser.parse_args()
+
+    store = SQLiteNewsStore(args.db)
+    if args.command == "import":
+        print(f"已导入 {store.import_txt(args.output_dir)} 个快照到 {store.db_path}")
+    else:
+        files = store.export_txt(args.date, args.output_dir)
+        print(f"已导出 {len(files)} 个快照文件")
@@ -0,0 +1,217 @@
+"""
+本地 newsnow 模拟服务
+
+模拟上游的 /api/s?id=...&latest 接口，可配置响应延迟、错误率、条目数、标题长度和
+status 取值分布，用于在无网络环境下评估爬取并发、限流、熔断等改动。
+配合 crawler.api_url（或环境变量 CRAWLER_API_URL）指向本服务即可。
+
+命令行启动：
+    python -m trendradar.stub_server --port 9000 --latency 200 --jitter 100 --error-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class StubNewsServer:
+    """模拟 newsnow 接口的本地 HTTP 服务，在后台线程中运行"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        items: int = 30,
+        title_length: int = 24,
+        statuses: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        初始化模拟服务
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0 表示自动分配
+            latency_ms: 基础响应延迟（毫秒）
+            jitter_ms: 在基础延迟上随机增加的延迟上限（毫秒）
+            error_rate: 返回 HTTP 500 的概率
+            items: 每个平台返回的条目数
+            title_length: 标题长度（字符），用于调节响应大小
+            statuses: 响应 status 字段的取值及权重，默认全部为 success
+            seed: 随机种子，便于复现
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.items = items
+        self.title_length = title_length
+        self.statuses = statuses or {"success": 1.0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "bytes": 0}
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/s"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _draw(self):
+        """按配置抽取本次响应的延迟、是否出错和 status"""
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            failed = self._random.random() < self.error_rate
+            status = self._random.choices(
+                list(self.statuses), weights=list(self.statuses.values())
+            )[0]
+        return delay, failed, status
+
+    def _build_payload(self, id_value: str, status: str) -> bytes:
+        items = []
+        for index in range(1, self.items + 1):
+            prefix = f"{id_value} 热点{index} "
+            title = prefix + "闻" * max(0, self.title_length - len(prefix))
+            items.append({
+                "id": f"{id_value}-{index}",
+                "title": title,
+                "url": f"https://example.com/{id_value}/{index}",
+                "mobileUrl": f"https://m.example.com/{id_value}/{index}",
+            })
+        payload = {"status": status, "id": id_value, "updatedTime": int(time.time() * 1000), "items": items}
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        parsed = urlparse(handler.path)
+        id_value = parse_qs(parsed.query).get("id", [""])[0]
+        if parsed.path != "/api/s" or not id_value:
+            self._respond(handler, 404, b'{"error": "not found"}')
+            return
+
+        delay, failed, status = self._draw()
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if failed:
+            self._respond(handler, 500, b'{"error": "stub error"}', error=True)
+            return
+        self._respond(handler, 200, self._build_payload(id_value, status))
+
+    def _respond(
+        self, handler: BaseHTTPRequestHandler, code: int, body: bytes, error: bool = False
+    ) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(body)
+            if error:
+                self.stats["errors"] += 1
+        handler.send_response(code)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self) -> "StubNewsServer":
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stub-newsnow", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止服务"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubNewsServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def parse_statuses(text: str) -> Dict[str, float]:
+    """解析 status 分布，如 "success=0.9,cache=0.1"；省略权重时按 1 处理"""
+    statuses = {}
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, weight = part.partition("=")
+        statuses[name.strip()] = float(weight) if weight else 1.0
+    if not statuses:
+        raise ValueError("status 分布不能为空")
+    return statuses
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """模拟服务的命令行参数，压测脚本复用"""
+    parser.add_argument("--latency", type=float, default=0, help="基础响应延迟(毫秒)")
+    parser.add_argument("--jitter", type=float, default=0, help="随机附加延迟上限(毫秒)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 HTTP 500 的概率")
+    parser.add_argument("--items", type=int, default=30, help="每个平台返回的条目数")
+    parser.add_argument("--title-length", type=int, default=24, help="标题长度(字符)，用于调节响应大小")
+    parser.add_argument(
+        "--statuses", type=parse_statuses, default={"success": 1.0},
+        help='status 取值及权重，如 "success=0.9,cache=0.1"',
+    )
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+
+
+def server_from_args(args: argparse.Namespace, host: str = "127.0.0.1", port: int = 0) -> StubNewsServer:
+    return StubNewsServer(
+        host=host,
+        port=port,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        items=args.items,
+        title_length=args.title_length,
+        statuses=args.statuses,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="本地 newsnow 模拟服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=9000, help="监听端口")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.host, args.port).start()
+    print(f"模拟服务已启动: {server.api_url}")
+    print(f"设置 CRAWLER_API_URL={server.api_url} 后运行 main.py 或 MCP Server 即可使用")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"已停止，共处理请求 {server.stats['requests']} 次，错误 {server.stats['errors']} 次")
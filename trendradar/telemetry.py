@@ -0,0 +1,278 @@
+"""
+爬取遥测
+
+每次爬取按平台记录 DNS 解析、TCP 连接、TLS 握手和总耗时，响应大小、条目数、
+重试次数、数据状态（最新/缓存）、所用代理以及失败原因；配置代理池时还记录各代理的健康状态。记录以 JSON Lines 追加写入
+output/.telemetry/crawl_metrics-YYYY-MM.jsonl，并可选输出 Prometheus textfile
+（供 node_exporter 的 textfile collector 采集）。
+
+JSON Lines 按月分文件，只保留最近 retention_months 个月（0 表示不清理）。
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .utils import get_beijing_time
+
+METRICS_FILE_PATTERN = re.compile(r"^crawl_metrics-(\d{4})-(\d{2})\.jsonl$")
+
+
+def new_platform_metrics(id_value: str, name: str) -> Dict:
+    """
+    创建单个平台的空白指标记录
+
+    status 取值：pending 进行中，fresh 最新数据，cache 上游缓存数据，failed 请求失败，
+    skipped 熔断跳过，timed_out 超过截止时间放弃，cancelled 已取消。
+    """
+    return {
+        "id": id_value,
+        "name": name,
+        "status": "pending",
+        "source_status": None,
+        "unchanged": False,
+        "replayed": False,
+        "coalesced": False,
+        "dns_ms": None,
+        "connect_ms": None,
+        "tls_ms": None,
+        "request_ms": None,
+        "total_ms": None,
+        "bytes": 0,
+        "items": 0,
+        "retries": 0,
+        "proxy": None,
+        "error": None,
+    }
+
+
+class CrawlTelemetry:
+    """爬取遥测输出"""
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path] = Path("output") / ".telemetry",
+        prometheus_file: Optional[Union[str, Path]] = None,
+        retention_months: int = 0,
+    ):
+        """
+        初始化遥测输出
+
+        Args:
+            output_dir: JSON Lines 文件目录
+            prometheus_file: Prometheus textfile 路径，为空则不输出
+            retention_months: 保留最近几个月的 JSON Lines 文件（含当月），0 表示不清理
+        """
+        self.output_dir = Path(output_dir)
+        self.prometheus_file = Path(prometheus_file) if prometheus_file else None
+        self.retention_months = retention_months
+
+    def write_run(
+        self,
+        run_key: str,
+        duration_ms: float,
+        platforms: List[Dict],
+        proxies: Optional[List[Dict]] = None,
+    ) -> None:
+        """
+        写入一次运行的遥测数据
+
+        Args:
+            run_key: 运行标识（北京时间 YYYYmmdd-HHMMSS）
+            duration_ms: 整体爬取耗时（毫秒）
+            platforms: 各平台指标记录
+            proxies: 代理池各代理状态，未配置代理池时为 None
+        """
+        proxies = proxies or []
+        now = get_beijing_time()
+        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+        succeeded = [p for p in platforms if p["status"] in ("fresh", "cache")]
+        run_record = {
+            "type": "run",
+            "run": run_key,
+            "timestamp": timestamp,
+            "duration_ms": round(duration_ms, 2),
+            "platforms": len(platforms),
+            "succeeded": len(succeeded),
+            "failed": len(platforms) - len(succeeded),
+            "bytes": sum(p["bytes"] for p in platforms),
+            "items": sum(p["items"] for p in platforms),
+        }
+
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            file_name = f"crawl_metrics-{now.strftime('%Y-%m')}.jsonl"
+            file_path = self.output_dir / file_name
+            with open(file_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(run_record, ensure_ascii=False) + "\n")
+                for metrics in platforms:
+                    record = {
+                        "type": "platform",
+                        "run": run_key,
+                        "timestamp": timestamp,
+                    }
+                    record.update(metrics)
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                for proxy_state in proxies:
+                    record = {
+                        "type": "proxy",
+                        "run": run_key,
+                        "timestamp": timestamp,
+                    }
+                    record.update(proxy_state)
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"写入爬取遥测失败: {e}")
+
+        if self.retention_months > 0:
+            self._prune(now.year * 12 + now.month - 1)
+
+        if self.prometheus_file is not None:
+            self._write_prometheus(run_record, platforms, proxies, now.timestamp())
+
+    def _prune(self, current_month: int) -> None:
+        """删除超出保留月数的 JSON Lines 文件"""
+        try:
+            for file_path in self.output_dir.iterdir():
+                match = METRICS_FILE_PATTERN.match(file_path.name)
+                if not match:
+                    continue
+                month = int(match.group(1)) * 12 + int(match.group(2)) - 1
+                if current_month - month >= self.retention_months:
+                    file_path.unlink()
+        except Exception as e:
+            print(f"清理爬取遥测失败: {e}")
+
+    def _write_prometheus(
+        self,
+        run_record: Dict,
+        platforms: List[Dict],
+        proxies: List[Dict],
+        timestamp: float,
+    ) -> None:
+        """原子写入 Prometheus textfile"""
+        lines = []
+
+        def gauge(name: str, help_text: str, samples: List) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                if value is None:
+                    continue
+                label_text = ",".join(
+                    f'{key}="{_escape_label(str(val))}"' for key, val in labels.items()
+                )
+                if label_text:
+                    lines.append(f"{name}{{{label_text}}} {value}")
+                else:
+                    lines.append(f"{name} {value}")
+
+        def per_platform(key: str, scale: float = 1.0) -> List:
+            return [
+                (
+                    {"platform": p["id"]},
+                    None if p[key] is None else round(p[key] * scale, 6),
+                )
+                for p in platforms
+            ]
+
+        gauge(
+            "trendradar_crawl_last_run_timestamp_seconds",
+            "Unix time of the last crawl run.",
+            [({}, round(timestamp, 3))],
+        )
+        gauge(
+            "trendradar_crawl_run_duration_seconds",
+            "Wall-clock duration of the last crawl run.",
+            [({}, round(run_record["duration_ms"] / 1000, 6))],
+        )
+        gauge(
+            "trendradar_crawl_platform_up",
+            "Whether the platform returned data in the last run.",
+            [
+                (
+                    {"platform": p["id"], "status": p["status"]},
+                    int(p["status"] in ("fresh", "cache")),
+                )
+                for p in platforms
+            ],
+        )
+        gauge(
+            "trendradar_crawl_platform_duration_seconds",
+            "Total fetch time of the platform including retries.",
+            per_platform("total_ms", 0.001),
+        )
+        gauge(
+            "trendradar_crawl_platform_request_seconds",
+            "Duration of the final request attempt.",
+            per_platform("request_ms", 0.001),
+        )
+        gauge(
+            "trendradar_crawl_platform_dns_seconds",
+            "DNS resolution time when a new connection was opened.",
+            per_platform("dns_ms", 0.001),
+        )
+        gauge(
+            "trendradar_crawl_platform_connect_seconds",
+            "TCP connect time when a new connection was opened.",
+            per_platform("connect_ms", 0.001),
+        )
+        gauge(
+            "trendradar_crawl_platform_tls_seconds",
+            "TLS handshake time when a new connection was opened.",
+            per_platform("tls_ms", 0.001),
+        )
+        gauge(
+            "trendradar_crawl_platform_response_bytes",
+            "Response body size.",
+            per_platform("bytes"),
+        )
+        gauge(
+            "trendradar_crawl_platform_items",
+            "Number of parsed news items.",
+            per_platform("items"),
+        )
+        gauge(
+            "trendradar_crawl_platform_retries",
+            "Number of retries before the final attempt.",
+            per_platform("retries"),
+        )
+        if proxies:
+            gauge(
+                "trendradar_proxy_up",
+                "Whether the proxy is currently eligible for requests.",
+                [({"proxy": p["proxy"]}, int(not p["evicted"])) for p in proxies],
+            )
+            gauge(
+                "trendradar_proxy_latency_seconds",
+                "Smoothed request latency through the proxy.",
+                [
+                    (
+                        {"proxy": p["proxy"]},
+                        None if p["latency_ms"] is None else round(p["latency_ms"] / 1000, 6),
+                    )
+                    for p in proxies
+                ],
+            )
+            gauge(
+                "trendradar_proxy_error_rate",
+                "Smoothed share of requests the proxy failed to forward.",
+                [({"proxy": p["proxy"]}, p["error_rate"]) for p in proxies],
+            )
+
+        try:
+            self.prometheus_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.prometheus_file.with_name(
+                f"{self.prometheus_file.name}.{os.getpid()}.tmp"
+            )
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp_file, self.prometheus_file)
+        except Exception as e:
+            print(f"写入 Prometheus 指标文件失败: {e}")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
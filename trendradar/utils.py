@@ -0,0 +1,45 @@
+"""
+通用工具函数
+
+提供时间、标题清理、目录处理和 JSON 解码等基础功能。
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Union
+
+import pytz
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def get_beijing_time() -> datetime:
+    """获取北京时间"""
+    return datetime.now(pytz.timezone("Asia/Shanghai"))
+
+
+def clean_title(title: str) -> str:
+    """清理标题中的特殊字符"""
+    if not isinstance(title, str):
+        title = str(title)
+    cleaned_title = title.replace("\n", " ").replace("\r", " ")
+    cleaned_title = re.sub(r"\s+", " ", cleaned_title)
+    cleaned_title = cleaned_title.strip()
+    return cleaned_title
+
+
+def ensure_directory_exists(directory: str):
+    """确保目录存在"""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """解码 JSON，安装了 orjson 时使用更快的 orjson"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)